@@ -0,0 +1,24 @@
+"""
+Timing helper shared by the benchmark scripts and the suite.
+"""
+from __future__ import annotations
+
+import gc
+import statistics
+import time
+from typing import Callable
+
+
+def measure(fn: Callable[..., object], repeat: int, setup: Callable[[], object] | None = None) -> dict:
+    """Best and median wall time of fn(setup()) over `repeat` runs; setup is not timed."""
+    times = []
+    for _ in range(repeat):
+        arg = setup() if setup is not None else None
+        gc.collect()
+        start = time.perf_counter()
+        if setup is not None:
+            fn(arg)
+        else:
+            fn()
+        times.append(time.perf_counter() - start)
+    return {"best_s": min(times), "median_s": statistics.median(times), "runs": repeat}
@@ -0,0 +1,68 @@
+"""
+Times the word-count stores (JSON, msgpack, SQLite) on synthetic vocabularies:
+full load, top-20 query and a checkpoint update of 1000 words.
+
+Usage (from the project root):
+    python -m benchmarks.counts_store [--sizes 10000 100000 1000000] [--repeat N]
+"""
+from __future__ import annotations
+
+import argparse
+import random
+import tempfile
+from pathlib import Path
+
+from benchmarks._timing import measure
+from src.wikiscraper.counts_store import STORE_FORMATS, open_counts_store
+
+SUFFIXES = {"json": ".json", "msgpack": ".msgpack", "sqlite": ".sqlite"}
+
+
+def _vocabulary(size: int, seed: int = 0) -> dict[str, int]:
+    rng = random.Random(seed)
+    return {f"w{i:07d}": int(rng.paretovariate(1.2)) for i in range(size)}
+
+
+def main(argv: list[str] | None = None) -> int:
+    ap = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    ap.add_argument("--sizes", type=int, nargs="+", default=[10_000, 100_000, 1_000_000])
+    ap.add_argument("--repeat", type=int, default=3)
+    args = ap.parse_args(argv)
+
+    with tempfile.TemporaryDirectory() as tmp:
+        for size in args.sizes:
+            counts = _vocabulary(size)
+            pending = dict(list(counts.items())[:: max(1, size // 1000)])
+            print(f"{size} words")
+            for fmt in STORE_FORMATS:
+                path = str(Path(tmp) / f"counts-{size}{SUFFIXES[fmt]}")
+                store = open_counts_store(path)
+                store.replace(counts)
+                store.close()
+
+                def load() -> None:
+                    store = open_counts_store(path)
+                    store.load()
+                    store.close()
+
+                def top() -> None:
+                    store = open_counts_store(path)
+                    store.top_k(20)
+                    store.close()
+
+                def update() -> None:
+                    store = open_counts_store(path)
+                    store.update(pending)
+                    store.close()
+
+                size_kib = Path(path).stat().st_size / 1024
+                timings = "  ".join(
+                    f"{op}={measure(fn, args.repeat)['best_s'] * 1000:8.1f} ms"
+                    for op, fn in (("load", load), ("top20", top), ("update", update))
+                )
+                print(f"  {fmt:7s} {size_kib:9.0f} KiB  {timings}")
+    return 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
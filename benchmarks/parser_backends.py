@@ -0,0 +1,73 @@
+"""
+Compares the bs4 and lxml extraction backends: checks that both give identical
+results and reports the time per operation.
+
+Usage (from the project root):
+    python -m benchmarks.parser_backends [HTML_FILE ...] [--repeat N]
+"""
+from __future__ import annotations
+
+import argparse
+from pathlib import Path
+
+from benchmarks._timing import measure
+from src.wikiscraper.parser import BACKENDS, ArticleParser
+from src.wikiscraper.table_extractor import TableExtractor
+
+DEFAULT_FILES = ["data/pikachu.html", "data/type.html"]
+
+
+def _extract_all(html: str, backend: str) -> dict:
+    parser = ArticleParser(backend)
+    tables = TableExtractor(backend)
+    page = parser.parse(html)
+    try:
+        summary = parser.extract_first_paragraph(page)
+    except ValueError as e:
+        summary = f"error: {e}"
+    return {
+        "summary": summary,
+        "text": parser.extract_article_text(page),
+        "links": parser.extract_article_links(page),
+        "tables": [tables.extract_nth_table(page, i + 1).rows for i in range(len(page.tables))],
+    }
+
+
+def main(argv: list[str] | None = None) -> int:
+    ap = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    ap.add_argument("files", nargs="*", default=DEFAULT_FILES)
+    ap.add_argument("--repeat", type=int, default=5)
+    args = ap.parse_args(argv)
+
+    status = 0
+    for name in args.files:
+        path = Path(name)
+        if not path.exists():
+            print(f"skip (missing): {name}")
+            continue
+        html = path.read_text(encoding="utf-8", errors="replace")
+
+        results = {b: _extract_all(html, b) for b in BACKENDS}
+        reference = results[BACKENDS[0]]
+        for backend, result in results.items():
+            for key, value in result.items():
+                if value != reference[key]:
+                    print(f"MISMATCH {name}: backend={backend} field={key}")
+                    status = 1
+
+        print(f"{name} ({len(html) / 1024:.0f} KiB)")
+        for backend in BACKENDS:
+            parser = ArticleParser(backend)
+            ops = {
+                "parse": lambda: parser.parse(html),
+                "text": lambda: parser.extract_article_text(html),
+                "links": lambda: parser.extract_article_links(html),
+                "all": lambda: _extract_all(html, backend),
+            }
+            timings = "  ".join(f"{op}={measure(fn, args.repeat)['best_s'] * 1000:8.1f} ms" for op, fn in ops.items())
+            print(f"  {backend:5s} {timings}")
+    return status
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
@@ -0,0 +1,62 @@
+"""
+Times compute_relative_freq on synthetic vocabularies against the original
+implementation (full pandas sort + row-by-row DataFrame), after checking that
+both give the same table.
+
+Usage (from the project root):
+    python -m benchmarks.relative_frequency [--sizes 100000 1000000 10000000] [--k 20]
+"""
+from __future__ import annotations
+
+import argparse
+import time
+
+import numpy as np
+import pandas as pd
+
+from src.wikiscraper.relative_frequency import compute_relative_freq, sort_relative_df
+
+
+def compute_reference(article_counts: dict[str, int], lang_ref: dict[str, float], top_k: int) -> pd.DataFrame:
+    series = pd.Series(article_counts, dtype="int64").sort_values(ascending=False)
+    rows = [
+        {"word": w, "freq_article": int(article_counts[w]), "freq_language": lang_ref.get(w, float("nan"))}
+        for w in series.head(top_k).index.tolist()
+    ]
+    return pd.DataFrame(rows)
+
+
+def _vocabulary(size: int, seed: int = 0) -> dict[str, int]:
+    rng = np.random.default_rng(seed)
+    # distinct counts, so the top-k is the same whatever the tie-breaking
+    counts = rng.permutation(size) + 1
+    return dict(zip((f"w{i}" for i in range(size)), counts.tolist()))
+
+
+def main(argv: list[str] | None = None) -> int:
+    ap = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    ap.add_argument("--sizes", type=int, nargs="+", default=[100_000, 1_000_000])
+    ap.add_argument("--k", type=int, default=20)
+    args = ap.parse_args(argv)
+
+    for size in args.sizes:
+        counts = _vocabulary(size)
+        lang_ref = {f"w{i}": float(i % 7) for i in range(0, size, max(1, size // 2000))}
+
+        start = time.perf_counter()
+        before = sort_relative_df(compute_reference(counts, lang_ref, args.k), "article")
+        t_before = time.perf_counter() - start
+
+        start = time.perf_counter()
+        after = sort_relative_df(compute_relative_freq(counts, lang_ref, args.k).df, "article")
+        t_after = time.perf_counter() - start
+
+        if not before.equals(after):
+            print(f"MISMATCH at {size} words")
+            return 1
+        print(f"{size:>10} words  original={t_before * 1000:8.1f} ms  vectorized={t_after * 1000:8.1f} ms")
+    return 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
@@ -0,0 +1,92 @@
+"""
+Cold-start budget per CLI mode: runs wiki_scraper.py in a fresh interpreter with
+`-X importtime` on a local page and reports the total import time (without
+`site`), the wall time and which heavy modules were loaded. Fails (exit 1) if a
+mode goes over its import budget or loads a module it should not need.
+
+Usage (from the project root):
+    python -m benchmarks.startup [--repeat N] [--scale F]
+
+--scale multiplies every budget (slow machines / CI).
+"""
+from __future__ import annotations
+
+import argparse
+import re
+import subprocess
+import sys
+import tempfile
+import time
+from pathlib import Path
+
+ROOT = Path(__file__).resolve().parent.parent
+
+HEAVY = ("pandas", "numpy", "wordfreq", "requests", "matplotlib")
+
+PAGE = """<html><body><div id="mw-content-text"><div class="mw-parser-output">
+<p>Pikachu is an Electric-type Pokémon introduced in Generation I.</p>
+<table><tr><th>Type</th><th>Normal</th></tr><tr><td>Fire</td><td>2×</td></tr></table>
+</div></div></body></html>
+"""
+
+# mode -> (arguments, import budget in ms, heavy modules it may load)
+MODES = {
+    "summary": (["--summary"], 300, ()),
+    "count-words": (["--count-words"], 300, ()),
+    "all-tables": (["--all-tables"], 300, ()),
+    "table": (["--table", "1"], 800, ("pandas", "numpy")),
+}
+
+_line = re.compile(r"import time:\s+(\d+) \|\s+(\d+) \| ( *)(\S+)")
+
+
+def run_mode(args: list[str], workdir: Path, page: Path) -> tuple[float, float, set[str]]:
+    """(import ms, wall ms, top-level packages imported)"""
+    cmd = [sys.executable, "-X", "importtime", str(ROOT / "wiki_scraper.py"), "Pikachu", *args]
+    cmd += ["--html-file", str(page), "--no-cache", "--counts-file", str(workdir / "counts.json")]
+    start = time.perf_counter()
+    proc = subprocess.run(cmd, cwd=workdir, capture_output=True, text=True)
+    wall = (time.perf_counter() - start) * 1000
+    if proc.returncode != 0:
+        raise RuntimeError(f"{' '.join(args)} failed: {proc.stdout}{proc.stderr[-500:]}")
+
+    total_us = 0
+    modules: set[str] = set()
+    for m in _line.finditer(proc.stderr):
+        # top level: cumulative time includes everything below it; `site` is the
+        # interpreter's environment setup, not ours
+        if not m.group(3) and m.group(4) != "site":
+            total_us += int(m.group(2))
+        modules.add(m.group(4).split(".")[0])
+    return total_us / 1000, wall, modules
+
+
+def main(argv: list[str] | None = None) -> int:
+    ap = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    ap.add_argument("--repeat", type=int, default=3)
+    ap.add_argument("--scale", type=float, default=1.0)
+    args = ap.parse_args(argv)
+
+    failed = False
+    with tempfile.TemporaryDirectory() as tmp:
+        workdir = Path(tmp)
+        page = workdir / "page.html"
+        page.write_text(PAGE, encoding="utf-8")
+        for mode, (mode_args, budget, allowed) in MODES.items():
+            runs = [run_mode(mode_args, workdir, page) for _ in range(args.repeat)]
+            imports = min(r[0] for r in runs)
+            wall = min(r[1] for r in runs)
+            heavy = sorted(m for m in HEAVY if m in runs[0][2])
+            unexpected = [m for m in heavy if m not in allowed]
+            over = imports > budget * args.scale
+            failed |= over or bool(unexpected)
+            status = "FAIL" if over or unexpected else "ok"
+            print(
+                f"{mode:<12} imports={imports:7.1f} ms (budget {budget * args.scale:6.0f})  "
+                f"wall={wall:7.1f} ms  heavy={','.join(heavy) or '-'}  {status}"
+            )
+    return 1 if failed else 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
@@ -0,0 +1,236 @@
+"""
+Offline benchmark suite for every pipeline stage, with JSON results and a
+baseline comparison.
+
+Stages: page parsing and summary/text/links extraction (both backends),
+TableExtractor + process_table, tokenize, update_counts_file at several
+vocabulary sizes and compute_relative_freq. Inputs are data/pikachu.html and
+data/type.html (a synthetic wiki page stands in for a missing fixture), each
+also enlarged x--scale by repeating its content. Synthetic data is seeded, so
+runs are comparable across commits.
+
+Usage (from the project root):
+    python -m benchmarks.suite run [--out bench.json] [--repeat N] [--scale 1 8] [--quick]
+    python -m benchmarks.suite compare BASELINE.json CURRENT.json [--threshold 0.10]
+
+compare exits with 1 if any benchmark got slower than baseline * (1 + threshold)
+(and by more than --min-ms).
+"""
+from __future__ import annotations
+
+import argparse
+import json
+import platform
+import random
+import subprocess
+import tempfile
+from datetime import datetime, timezone
+from pathlib import Path
+
+from benchmarks._timing import measure
+from src.wikiscraper.parser import BACKENDS, ArticleParser
+from src.wikiscraper.relative_frequency import compute_relative_freq
+from src.wikiscraper.table_extractor import TableExtractor
+from src.wikiscraper.table_processing import process_table
+from src.wikiscraper.word_counting import save_counts, tokenize, update_counts_file
+
+FIXTURES = {"pikachu": "data/pikachu.html", "type": "data/type.html"}
+FORMAT_VERSION = 1
+
+
+def synthetic_page(paragraphs: int = 60, seed: int = 0) -> str:
+    """Bulbapedia-shaped page: prose with links, site navigation and an 18x18 multiplier chart."""
+    rng = random.Random(seed)
+    vocab = ["Pikachu", "Electric-type", "Pokémon", "it's", "evolves", "Raichu", "Thunder", "Stone", "Generation"]
+    vocab += ["".join(rng.choice("abcdefghijklmnopqrstuvwxyz") for _ in range(rng.randint(2, 10))) for _ in range(1500)]
+    types = [f"Type{i}" for i in range(18)]
+    parts = ['<html><body><div id="mw-navigation"><a href="/wiki/Main_Page">Main</a></div>']
+    parts.append('<div id="mw-content-text"><div class="mw-parser-output">')
+    for _ in range(paragraphs):
+        words = [rng.choice(vocab) for _ in range(rng.randint(40, 120))]
+        for i in rng.sample(range(len(words)), 4):
+            words[i] = f'<a href="/wiki/{words[i]}">{words[i]}</a>'
+        parts.append(f"<p>{' '.join(words)}.</p>")
+    parts.append("<table><tr><th></th>" + "".join(f"<th>{t}</th>" for t in types) + "</tr>")
+    for t in types:
+        cells = "".join(f"<td>{rng.choice(['1×', '2×', '½×', '0×'])}</td>" for _ in types)
+        parts.append(f"<tr><th>{t}</th>{cells}</tr>")
+    parts.append("</table></div></div></body></html>")
+    return "\n".join(parts)
+
+
+def enlarge(html: str, factor: int) -> str:
+    """The page with its #mw-content-text body repeated `factor` times."""
+    if factor <= 1:
+        return html
+    start = html.find(">", html.find('id="mw-content-text"')) + 1
+    end = html.rfind("</div>")
+    if start <= 0 or end <= start:
+        return html
+    return html[:start] + html[start:end] * factor + html[end:]
+
+
+def load_pages(scales: list[int]) -> dict[str, str]:
+    pages: dict[str, str] = {}
+    for name, path in FIXTURES.items():
+        p = Path(path)
+        html = p.read_text(encoding="utf-8", errors="replace") if p.exists() else synthetic_page(seed=len(name))
+        label = name if p.exists() else f"{name}-synthetic"
+        for factor in scales:
+            pages[label if factor == 1 else f"{label}-x{factor}"] = enlarge(html, factor)
+    return pages
+
+
+def _largest_table(html: str, backend: str) -> int:
+    page = ArticleParser(backend).parse(html)
+    rows = [len(page.table_rows(t)) for t in page.tables]
+    return 1 + max(range(len(rows)), key=rows.__getitem__) if rows else 0
+
+
+def bench_pages(pages: dict[str, str], repeat: int) -> dict[str, dict]:
+    results: dict[str, dict] = {}
+    for name, html in pages.items():
+        for backend in BACKENDS:
+            parser = ArticleParser(backend)
+            key = f"parser/{backend}/{name}"
+            results[f"{key}/parse"] = measure(lambda: parser.parse(html), repeat)
+            for op in ("text", "links", "first_paragraph"):
+                results[f"{key}/{op}"] = measure(lambda page: getattr(page, op), repeat, setup=lambda: parser.parse(html))
+
+            n = _largest_table(html, backend)
+            if n:
+                extractor = TableExtractor(backend)
+                rows = extractor.extract_nth_table(html, n).rows
+                results[f"table/{backend}/{name}/extract"] = measure(
+                    lambda page: extractor.extract_nth_table(page, n), repeat, setup=lambda: parser.parse(html)
+                )
+                if backend == BACKENDS[0]:
+                    results[f"table/{name}/process"] = measure(lambda: process_table(rows, first_row_is_header=True), repeat)
+
+        text = ArticleParser().extract_article_text(html)
+        results[f"tokenize/{name}"] = measure(lambda: tokenize(text), repeat)
+    return results
+
+
+def bench_counts(vocab_sizes: list[int], tokens: list[str], repeat: int) -> dict[str, dict]:
+    results: dict[str, dict] = {}
+    rng = random.Random(1)
+    with tempfile.TemporaryDirectory() as tmp:
+        for size in vocab_sizes:
+            counts = {f"w{i:07d}": rng.randint(1, 1000) for i in range(size)}
+            path = str(Path(tmp) / f"counts-{size}.json")
+            results[f"counts/update_counts_file/{size}"] = measure(
+                lambda _: update_counts_file(path, tokens), repeat, setup=lambda: save_counts(path, counts)
+            )
+    return results
+
+
+def bench_relative_freq(vocab_sizes: list[int], repeat: int) -> dict[str, dict]:
+    results: dict[str, dict] = {}
+    for size in vocab_sizes:
+        rng = random.Random(size)
+        counts = dict(zip((f"w{i}" for i in range(size)), (rng.randint(1, 10_000) for _ in range(size))))
+        lang_ref = {f"w{i}": rng.uniform(1, 8) for i in range(0, size, max(1, size // 2000))}
+        for mode in ("article", "language"):
+            results[f"relative_freq/{mode}/{size}"] = measure(
+                lambda: compute_relative_freq(counts, lang_ref, top_k=20, mode=mode), repeat
+            )
+    return results
+
+
+def _git_commit() -> str | None:
+    try:
+        out = subprocess.run(["git", "rev-parse", "--short", "HEAD"], capture_output=True, text=True, check=True)
+    except (OSError, subprocess.CalledProcessError):
+        return None
+    return out.stdout.strip() or None
+
+
+def _versions() -> dict[str, str]:
+    import bs4
+    import lxml.etree
+    import numpy
+    import pandas
+
+    return {
+        "python": platform.python_version(),
+        "bs4": bs4.__version__,
+        "lxml": ".".join(map(str, lxml.etree.LXML_VERSION)),
+        "numpy": numpy.__version__,
+        "pandas": pandas.__version__,
+    }
+
+
+def run(args: argparse.Namespace) -> int:
+    scales = [1] if args.quick else args.scale
+    vocab_sizes = [1_000, 10_000] if args.quick else args.vocab_sizes
+    pages = load_pages(scales)
+
+    results = bench_pages(pages, args.repeat)
+    tokens = tokenize(ArticleParser().extract_article_text(next(iter(pages.values()))))
+    results.update(bench_counts(vocab_sizes, tokens, args.repeat))
+    results.update(bench_relative_freq(vocab_sizes, args.repeat))
+
+    report = {
+        "format": FORMAT_VERSION,
+        "created": datetime.now(timezone.utc).isoformat(timespec="seconds"),
+        "commit": _git_commit(),
+        "machine": platform.platform(),
+        "versions": _versions(),
+        "pages": {name: len(html) for name, html in pages.items()},
+        "results": results,
+    }
+    for name, r in results.items():
+        print(f"{name:<55} {r['best_s'] * 1000:10.3f} ms")
+    if args.out:
+        Path(args.out).write_text(json.dumps(report, indent=2, sort_keys=True) + "\n", encoding="utf-8")
+        print(f"Wrote {args.out}")
+    return 0
+
+
+def compare(args: argparse.Namespace) -> int:
+    base = json.loads(Path(args.baseline).read_text(encoding="utf-8"))["results"]
+    current = json.loads(Path(args.current).read_text(encoding="utf-8"))["results"]
+
+    regressions = 0
+    for name in sorted(base.keys() | current.keys()):
+        if name not in current or name not in base:
+            print(f"{name:<55} {'only in ' + ('baseline' if name in base else 'current'):>24}")
+            continue
+        before, after = base[name]["best_s"], current[name]["best_s"]
+        ratio = after / before if before > 0 else float("inf")
+        status = ""
+        # sub-threshold absolute differences are timer noise, not regressions
+        if ratio > 1 + args.threshold and (after - before) * 1000 > args.min_ms:
+            status = "REGRESSION"
+            regressions += 1
+        elif ratio < 1 - args.threshold:
+            status = "faster"
+        print(f"{name:<55} {before * 1000:10.3f} -> {after * 1000:10.3f} ms  x{ratio:5.2f}  {status}")
+    print(f"{regressions} regression(s) above {args.threshold:.0%}")
+    return 1 if regressions else 0
+
+
+def main(argv: list[str] | None = None) -> int:
+    ap = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    sub = ap.add_subparsers(dest="command", required=True)
+
+    run_p = sub.add_parser("run", help="Run all benchmarks.")
+    run_p.add_argument("--out", type=str, default=None, help="Write results as JSON.")
+    run_p.add_argument("--repeat", type=int, default=5)
+    run_p.add_argument("--scale", type=int, nargs="+", default=[1, 8], help="Page enlargement factors.")
+    run_p.add_argument("--vocab-sizes", type=int, nargs="+", default=[1_000, 100_000, 1_000_000])
+    run_p.add_argument("--quick", action="store_true", help="Original-size pages and small vocabularies only.")
+
+    cmp_p = sub.add_parser("compare", help="Compare two result files.")
+    cmp_p.add_argument("baseline")
+    cmp_p.add_argument("current")
+    cmp_p.add_argument("--threshold", type=float, default=0.10, help="Allowed slowdown (default 0.10 = 10%%).")
+    cmp_p.add_argument("--min-ms", type=float, default=0.5, help="Ignore slowdowns smaller than this (default 0.5 ms).")
+
+    args = ap.parse_args(argv)
+    return run(args) if args.command == "run" else compare(args)
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
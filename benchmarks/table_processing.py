@@ -0,0 +1,77 @@
+"""
+Times process_table + CSV writing before (reference copy of the original
+per-cell pipeline) and after (dictionary-encoded counting, direct to_csv), after
+checking that both give the same counts_df and the same CSV file.
+
+Usage (from the project root):
+    python -m benchmarks.table_processing [--rows 1000 100000] [--cols 20] [--repeat N]
+"""
+from __future__ import annotations
+
+import argparse
+import filecmp
+import os
+import random
+import tempfile
+
+import pandas as pd
+
+from benchmarks._timing import measure
+from src.wikiscraper.table_processing import _pad_rows, dataframe_to_csv_rows, process_table, write_table_csv
+
+
+def counts_reference(df: pd.DataFrame) -> pd.DataFrame:
+    flat = pd.Series(df.to_numpy().ravel())
+    flat = flat[flat.notna()]
+    flat = flat.astype(str).str.strip()
+    flat = flat[flat != ""]
+    is_multiplier = flat.str.fullmatch(r".*×")
+    if len(flat) > 0 and (is_multiplier.mean() >= 0.5):
+        flat = flat[is_multiplier]
+    counts = flat.value_counts().reset_index()
+    counts.columns = ["value", "count"]
+    return counts
+
+
+def _synthetic_rows(rows: int, cols: int, seed: int = 0) -> list[list[str]]:
+    rng = random.Random(seed)
+    values = ["1×", "½×", "2×", "0×", " 2× ", "", "Lv. 5", "TM24"]
+    header = ["Type"] + [f"T{i}" for i in range(cols)]
+    return [header] + [[f"row{r}"] + [rng.choice(values) for _ in range(rng.randint(cols // 2, cols))] for r in range(rows)]
+
+
+def main(argv: list[str] | None = None) -> int:
+    ap = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    ap.add_argument("--rows", type=int, nargs="+", default=[1_000, 100_000])
+    ap.add_argument("--cols", type=int, default=20)
+    ap.add_argument("--repeat", type=int, default=3)
+    args = ap.parse_args(argv)
+
+    with tempfile.TemporaryDirectory() as tmp:
+        before_csv, after_csv = os.path.join(tmp, "before.csv"), os.path.join(tmp, "after.csv")
+        for n in args.rows:
+            rows = _synthetic_rows(n, args.cols)
+            processed = process_table(rows, first_row_is_header=True)
+
+            def before() -> None:
+                padded = _pad_rows(rows)
+                df = pd.DataFrame([r[1:] for r in padded[1:]], index=[r[0] for r in padded[1:]], columns=padded[0][1:])
+                counts_reference(df)
+                dataframe_to_csv_rows(df).to_csv(before_csv, index=False)
+
+            def after() -> None:
+                write_table_csv(process_table(rows, first_row_is_header=True).df, after_csv)
+
+            t_before = measure(before, args.repeat)["best_s"]
+            t_after = measure(after, args.repeat)["best_s"]
+            if not processed.counts_df.equals(counts_reference(processed.df)) or not filecmp.cmp(
+                before_csv, after_csv, shallow=False
+            ):
+                print(f"MISMATCH at {n} rows")
+                return 1
+            print(f"{n:>8} rows  original={t_before * 1000:8.1f} ms  encoded={t_after * 1000:8.1f} ms")
+    return 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
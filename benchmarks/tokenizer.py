@@ -0,0 +1,87 @@
+"""
+Tokens per second of the tokenizer before (reference copy of the original
+tokenize()) and after (tokenize, count_tokens, count_tokens_batch), after
+checking that all of them give the same tokens.
+
+Usage (from the project root):
+    python -m benchmarks.tokenizer [HTML_FILE ...] [--repeat N]
+
+Without readable HTML files, synthetic article text is used.
+"""
+from __future__ import annotations
+
+import argparse
+import random
+import re
+import unicodedata
+from collections import Counter
+from pathlib import Path
+
+from benchmarks._timing import measure
+from src.wikiscraper.parser import ArticleParser
+from src.wikiscraper.word_counting import count_tokens, count_tokens_batch, tokenize
+
+DEFAULT_FILES = ["data/pikachu.html", "data/type.html"]
+
+_word_re = re.compile(r"[^\W\d_]+(?:'[^\W\d_]+)?", re.UNICODE)
+
+
+def tokenize_reference(text: str) -> list[str]:
+    text = unicodedata.normalize("NFKC", text)
+    toks = [m.group(0).lower() for m in _word_re.finditer(text)]
+    toks = [t for t in toks if len(t) >= 2]
+    return toks
+
+
+def _synthetic_texts(count: int = 20, words: int = 20_000, seed: int = 0) -> list[str]:
+    rng = random.Random(seed)
+    vocab = ["Pikachu", "Electric-type", "Pokémon", "it's", "evolves", "Raichu", "Thunder", "Stone"]
+    vocab += ["".join(rng.choice("abcdefghijklmnopqrstuvwxyz") for _ in range(rng.randint(1, 10))) for _ in range(2000)]
+    seps = [" ", " ", " ", ", ", ". ", " (", ") ", " 25 ", "\n"]
+    return ["".join(rng.choice(vocab) + rng.choice(seps) for _ in range(words)) for _ in range(count)]
+
+
+def main(argv: list[str] | None = None) -> int:
+    ap = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    ap.add_argument("files", nargs="*", default=DEFAULT_FILES)
+    ap.add_argument("--repeat", type=int, default=5)
+    args = ap.parse_args(argv)
+
+    parser = ArticleParser("lxml")
+    texts = [
+        parser.extract_article_text(Path(name).read_text(encoding="utf-8", errors="replace"))
+        for name in args.files
+        if Path(name).exists()
+    ]
+    if not texts:
+        print("no HTML files found, using synthetic text")
+        texts = _synthetic_texts()
+
+    expected = [tokenize_reference(t) for t in texts]
+    total = Counter()
+    for text, tokens in zip(texts, expected):
+        if tokenize(text) != tokens or count_tokens(text) != Counter(tokens):
+            print("MISMATCH: tokenizer output differs from the reference")
+            return 1
+        total.update(tokens)
+    if count_tokens_batch(texts) != total:
+        print("MISMATCH: batch counts differ from the reference")
+        return 1
+
+    n_tokens = total.total()
+    print(f"{len(texts)} texts, {sum(map(len, texts)) / 1024:.0f} KiB, {n_tokens} tokens")
+    ops = {
+        "reference tokenize": lambda: [tokenize_reference(t) for t in texts],
+        "reference counts": lambda: [Counter(tokenize_reference(t)) for t in texts],
+        "tokenize": lambda: [tokenize(t) for t in texts],
+        "count_tokens": lambda: [count_tokens(t) for t in texts],
+        "count_tokens_batch": lambda: count_tokens_batch(texts),
+    }
+    for name, fn in ops.items():
+        seconds = measure(fn, args.repeat)["best_s"]
+        print(f"  {name:20s} {n_tokens / seconds / 1e6:6.2f} M tokens/s")
+    return 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
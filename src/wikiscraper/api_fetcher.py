@@ -0,0 +1,45 @@
+from __future__ import annotations
+
+import json
+import urllib.parse
+
+from .fetcher import FetchResult, PageFetcher
+
+
+class ApiFetcher(PageFetcher):
+    """
+    Fetches articles through MediaWiki's api.php instead of rendered /wiki/ pages.
+
+    Each article is one action=parse request with redirects=1: MediaWiki normalizes
+    the title, follows redirects and reports missing pages in that same round trip,
+    so the API costs exactly one request per title, like HTML mode, while the
+    response holds only the parser output (no skin, navigation or scripts). It is
+    wrapped in #mw-content-text so ArticleParser works unchanged.
+    (Batched action=query content is wikitext, which the HTML pipeline cannot use.)
+    """
+
+    def __init__(self, api_url: str, base_url: str, **kwargs) -> None:
+        super().__init__(base_url, **kwargs)
+        self.api_url = api_url
+
+    def _api_url(self, params: dict[str, str]) -> str:
+        query = urllib.parse.urlencode({**params, "format": "json", "formatversion": "2"})
+        return f"{self.api_url}?{query}"
+
+    def _check(self, data: dict, search_phrase: str) -> dict:
+        error = data.get("error")
+        if error:
+            if error.get("code") in {"missingtitle", "invalidtitle"}:
+                raise FileNotFoundError(f"Article not found for phrase: {search_phrase}")
+            raise RuntimeError(f"MediaWiki API error {error.get('code')}: {error.get('info')}")
+        return data
+
+    def fetch_article_html(self, search_phrase: str) -> FetchResult:
+        title = search_phrase.strip().replace(" ", "_")
+        url = self._api_url(
+            {"action": "parse", "page": title, "redirects": "1", "prop": "text", "disablelimitreport": "1"}
+        )
+        raw = self.fetch_url(url, search_phrase)
+        parsed = self._check(json.loads(raw.html), search_phrase)["parse"]
+        html = f'<div id="mw-content-text">{parsed["text"]}</div>'
+        return FetchResult(final_url=self.build_article_url(parsed["title"]), html=html)
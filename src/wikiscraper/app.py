@@ -1,40 +1,157 @@
 from __future__ import annotations
 
+import sys
+import threading
+from contextlib import ExitStack
 from dataclasses import dataclass
+from pathlib import Path
 
-import pandas as pd
-
+from .api_fetcher import ApiFetcher
+from .batch import read_manifest, run_batch
+from .cli import action_name, parse_args
+from .counts_store import COUNTS_SUFFIXES
 from .crawler import WikiCrawler
 from .fetcher import PageFetcher
+from .language_reference import load_language_reference
+from .page_cache import PageCache
 from .parser import ArticleParser
-from .relative_frequency import build_language_reference, compute_relative_freq, sort_relative_df
+from .profiling import phase
 from .table_extractor import TableExtractor
-from .table_processing import dataframe_to_csv_rows, process_table
+from .table_output import TABLE_FORMATS, write_table
 from .utils import sanitize_filename
-from .word_counting import load_counts, tokenize, update_counts_file
+from .word_counting import (
+    CountsAccumulator,
+    add_counts_to_file,
+    count_tokens,
+    load_counts,
+    load_counts_for,
+    load_top_counts,
+)
+
+# Heavy modules (pandas, NumPy, wordfreq, requests) are imported by the modes that
+# use them, so e.g. --summary --html-file starts without them
+# (python -m benchmarks.startup checks the per-mode budget).
 
 
 @dataclass(frozen=True)
 class Config:
     base_url: str = "https://bulbapedia.bulbagarden.net/wiki/"
+    api_url: str = "https://bulbapedia.bulbagarden.net/w/api.php"
+    pool_size: int = 10
+    max_retries: int = 3
 
 
 class WikiScraperApp:
     def __init__(self, config: Config | None = None) -> None:
         self.config = config or Config()
-        self.fetcher = PageFetcher(self.config.base_url)
+        self.fetcher = PageFetcher(
+            self.config.base_url,
+            pool_size=self.config.pool_size,
+            max_retries=self.config.max_retries,
+        )
         self.parser = ArticleParser()
         self.table_extractor = TableExtractor()
         self.crawler = WikiCrawler(self.fetcher, self.parser)
-        self._first_row_is_header = False
+        # shared by --count-words items of a --batch run (see _run_batch)
+        self._batch_counts: CountsAccumulator | None = None
+        self._batch_counts_lock = threading.Lock()
+        self.counts_path = "word-counts.json"
+        self.cache_dir: str | None = None
+
+    def configure_fetch_mode(self, mode: str, api_url: str | None = None) -> None:
+        if mode == "html":
+            return
+        if mode != "api":
+            raise ValueError(f"Unknown fetch mode: {mode}")
+        self.fetcher.close()
+        self.fetcher = ApiFetcher(
+            api_url or self.config.api_url,
+            self.config.base_url,
+            pool_size=self.config.pool_size,
+            max_retries=self.config.max_retries,
+        )
+        self.crawler.fetcher = self.fetcher
+
+    def configure_archive(self, path: str | None) -> None:
+        if path is None:
+            return
+        from .archive import open_archive
+        from .archive_fetcher import ArchiveFetcher
+
+        self.fetcher.close()
+        self.fetcher = ArchiveFetcher(open_archive(path), self.config.base_url)
+        self.crawler.fetcher = self.fetcher
+
+    def configure_cache(self, cache_dir: str | None, offline: bool = False) -> None:
+        self.cache_dir = cache_dir
+        if cache_dir is None:
+            self.fetcher.cache = None
+            return
+        self.fetcher.cache = PageCache(cache_dir)
+        self.fetcher.cache_policy = "offline" if offline else "revalidate"
 
     def run(self, args) -> int:
+        self.configure_fetch_mode(args.fetch_mode, args.api_url)
+        self.configure_cache(None if args.no_cache else args.cache_dir, offline=args.offline)
+        try:
+            self.configure_archive(args.archive)
+        except (OSError, ValueError) as e:
+            print(f"Failed to open archive: {e}")
+            return 2
+        self.parser.backend = args.parser_backend
+        self.table_extractor.backend = args.parser_backend
+        self.counts_path = args.counts_file
+
+        if not args.profile:
+            return self._run_action(args)
+
+        from .profiling import RunProfiler
+
+        profiler = RunProfiler(action_name(args), args.profile_dir)
+        profiler.start()
+        try:
+            return self._run_action(args)
+        finally:
+            try:
+                paths = profiler.stop()
+            except OSError as e:
+                print(f"Failed to write profile: {e}", file=sys.stderr)
+            else:
+                profiler.print_summary(paths, sys.stderr)
+
+    def _run_action(self, args) -> int:
+        if args.batch is not None:
+            return self._run_batch(
+                args.batch,
+                args.batch_output,
+                workers=args.workers,
+                checkpoint_pages=args.checkpoint_pages,
+                checkpoint_s=args.checkpoint_seconds,
+            )
+
+        if args.serve is not None:
+            return self._run_serve(
+                args.host,
+                args.serve,
+                max_pages=args.service_pages,
+                ttl_s=args.service_ttl,
+                checkpoint_pages=args.checkpoint_pages,
+                checkpoint_s=args.checkpoint_seconds,
+            )
+
+        return self._dispatch(args)
+
+    def _dispatch(self, args) -> int:
         if args.summary:
             return self._run_summary(args.search_phrase, args.html_file)
 
         if args.table is not None:
-            self._first_row_is_header = args.first_row_is_header
-            return self._run_table(args.search_phrase, args.table, args.html_file)
+            return self._run_table(args.search_phrase, args.table, args.html_file, args.first_row_is_header)
+
+        if args.all_tables:
+            return self._run_all_tables(
+                args.search_phrase, args.html_file, args.table_format, args.first_row_is_header
+            )
 
         if args.count_words:
             return self._run_count_words(args.search_phrase, args.html_file)
@@ -45,17 +162,40 @@ class WikiScraperApp:
                 return self._run_relative_freq_chart(args.mode, args.n, args.chart)
             return self._run_relative_freq(args.mode, args.n)
 
+        if args.detect_language is not None:
+            return self._run_detect_language(args.detect_language, args.langs, args.k_values)
+
+        if args.pack_archive is not None:
+            return self._run_pack_archive(*args.pack_archive)
+
         if args.auto_count_words is not None:
-            return self._run_auto_count_words(args.search_phrase, args.auto_count_words, args.wait, args.max_pages)
+            return self._run_auto_count_words(
+                args.search_phrase,
+                args.auto_count_words,
+                args.wait,
+                args.max_pages,
+                workers=args.workers,
+                rate=args.rate,
+                checkpoint_pages=args.checkpoint_pages,
+                checkpoint_s=args.checkpoint_seconds,
+                parse_workers=args.parse_workers,
+                state_path=args.state_file,
+                resume=args.resume,
+                bloom_capacity=args.bloom_capacity,
+                bloom_error_rate=args.bloom_error_rate,
+                metrics_path=args.metrics_file,
+                prometheus_path=args.prometheus_file,
+            )
 
         return 0
 
     def _run_summary(self, search_phrase: str, html_file: str | None = None) -> int:
         try:
-            if html_file:
-                result = self.fetcher.read_html_file(html_file)
-            else:
-                result = self.fetcher.fetch_article_html(search_phrase)
+            with phase("fetch"):
+                if html_file:
+                    result = self.fetcher.read_html_file(html_file)
+                else:
+                    result = self.fetcher.fetch_article_html(search_phrase)
         except FileNotFoundError as e:
             print(str(e))
             return 2
@@ -64,7 +204,8 @@ class WikiScraperApp:
             return 3
 
         try:
-            paragraph = self.parser.extract_first_paragraph(result.html)
+            with phase("parse"):
+                paragraph = self.parser.extract_first_paragraph(result.html)
         except Exception as e:
             print(f"Failed to parse summary: {e}")
             return 4
@@ -75,12 +216,19 @@ class WikiScraperApp:
         print(f"URL: {result.final_url}")
         return 0
 
-    def _run_table(self, search_phrase: str, table_number: int, html_file: str | None) -> int:
+    def _run_table(
+        self, search_phrase: str, table_number: int, html_file: str | None, first_row_is_header: bool = False
+    ) -> int:
+        import pandas as pd
+
+        from .table_processing import process_table, write_table_csv
+
         try:
-            if html_file:
-                result = self.fetcher.read_html_file(html_file)
-            else:
-                result = self.fetcher.fetch_article_html(search_phrase)
+            with phase("fetch"):
+                if html_file:
+                    result = self.fetcher.read_html_file(html_file)
+                else:
+                    result = self.fetcher.fetch_article_html(search_phrase)
         except FileNotFoundError as e:
             print(str(e))
             return 2
@@ -89,21 +237,23 @@ class WikiScraperApp:
             return 3
 
         try:
-            table = self.table_extractor.extract_nth_table(result.html, table_number)
+            with phase("parse"):
+                table = self.table_extractor.extract_nth_table(result.html, table_number)
         except Exception as e:
             print(f"Failed to extract table: {e}")
             return 4
 
         try:
-            processed = process_table(table.rows, first_row_is_header=self._first_row_is_header)
+            with phase("process"):
+                processed = process_table(table.rows, first_row_is_header=first_row_is_header)
         except Exception as e:
             print(f"Failed to process table: {e}")
             return 5
 
         filename = f"{sanitize_filename(search_phrase)}.csv"
         try:
-            csv_df = dataframe_to_csv_rows(processed.df)
-            csv_df.to_csv(filename, index=False)
+            with phase("write"):
+                write_table_csv(processed.df, filename)
         except Exception as e:
             print(f"Failed to write CSV: {e}")
             return 6
@@ -115,12 +265,55 @@ class WikiScraperApp:
             print(processed.counts_df)
         return 0
 
+    def _run_all_tables(
+        self, search_phrase: str, html_file: str | None, fmt: str, first_row_is_header: bool
+    ) -> int:
+        try:
+            with phase("fetch"):
+                if html_file:
+                    result = self.fetcher.read_html_file(html_file)
+                else:
+                    result = self.fetcher.fetch_article_html(search_phrase)
+        except FileNotFoundError as e:
+            print(str(e))
+            return 2
+        except Exception as e:
+            print(f"Failed to fetch page: {e}")
+            return 3
+
+        stem = sanitize_filename(search_phrase)
+        saved = 0
+        try:
+            tables = self.table_extractor.iter_tables(result.html)
+            while True:
+                # tables are extracted lazily, one per step
+                with phase("parse"):
+                    item = next(tables, None)
+                if item is None:
+                    break
+                n, table = item
+                filename = f"{stem}-table-{n}{TABLE_FORMATS[fmt]}"
+                with phase("write"):
+                    write_table(filename, table, fmt, first_row_is_header)
+                width = max(len(r) for r in table.rows)
+                print(f"Saved table {n} ({len(table.rows)}x{width}) to: {filename}")
+                saved += 1
+        except Exception as e:
+            print(f"Failed to extract tables: {e}")
+            return 4
+
+        if not saved:
+            print("No tables found.")
+            return 4
+        return 0
+
     def _run_count_words(self, search_phrase: str, html_file: str | None) -> int:
         try:
-            if html_file:
-                result = self.fetcher.read_html_file(html_file)
-            else:
-                result = self.fetcher.fetch_article_html(search_phrase)
+            with phase("fetch"):
+                if html_file:
+                    result = self.fetcher.read_html_file(html_file)
+                else:
+                    result = self.fetcher.fetch_article_html(search_phrase)
         except FileNotFoundError as e:
             print(str(e))
             return 2
@@ -129,26 +322,108 @@ class WikiScraperApp:
             return 3
 
         try:
-            text = self.parser.extract_article_text(result.html)
-            tokens = tokenize(text)
+            with phase("parse"):
+                text = self.parser.extract_article_text(result.html)
+            with phase("process"):
+                page_counts = count_tokens(text)
         except Exception as e:
             print(f"Failed to extract/tokenize text: {e}")
             return 4
 
-        counts_path = "word-counts.json"
+        counts_path = self.counts_path
         try:
-            update_counts_file(counts_path, tokens)
+            with phase("write"):
+                if self._batch_counts is not None:
+                    with self._batch_counts_lock:
+                        self._batch_counts.add_counts(page_counts)
+                        self._batch_counts.maybe_flush()
+                else:
+                    add_counts_to_file(counts_path, page_counts)
         except Exception as e:
             print(f"Failed to update {counts_path}: {e}")
             return 5
 
-        print(f"Updated {counts_path} with {len(tokens)} tokens from: {result.final_url}")
+        print(f"Updated {counts_path} with {page_counts.total()} tokens from: {result.final_url}")
+        return 0
+
+    def _run_batch(
+        self, manifest: str, output: str, workers: int = 1, checkpoint_pages: int = 50, checkpoint_s: float = 30.0
+    ) -> int:
+        """
+        Runs every manifest line (see batch.read_manifest) in this process, reusing the
+        fetcher, parsers and one counts accumulator, and writes JSON lines to `output`.
+        """
+        with ExitStack() as stack:
+            try:
+                src = sys.stdin if manifest == "-" else stack.enter_context(open(manifest, encoding="utf-8"))
+                out = sys.stdout if output == "-" else stack.enter_context(open(output, "w", encoding="utf-8"))
+            except OSError as e:
+                print(f"Failed to open batch files: {e}")
+                return 2
+
+            try:
+                self._batch_counts = stack.enter_context(
+                    CountsAccumulator(self.counts_path, flush_every_pages=checkpoint_pages, flush_every_s=checkpoint_s)
+                )
+            except Exception as e:
+                print(f"Failed to open {self.counts_path}: {e}")
+                return 2
+
+            try:
+                total, failed = run_batch(read_manifest(src), parse_args, self._dispatch, out, workers=workers)
+            except Exception as e:
+                print(f"Batch failed: {e}", file=sys.stderr)
+                return 3
+            finally:
+                self._batch_counts = None
+
+        print(f"Ran {total} items, {failed} failed.", file=sys.stderr)
+        return 0 if failed == 0 else 1
+
+    def _run_serve(
+        self,
+        host: str,
+        port: int,
+        max_pages: int = 256,
+        ttl_s: float = 300.0,
+        checkpoint_pages: int = 50,
+        checkpoint_s: float = 30.0,
+    ) -> int:
+        from .service import ScraperService, ServiceHTTPServer
+
+        try:
+            service = ScraperService(
+                self, max_pages=max_pages, ttl_s=ttl_s, checkpoint_pages=checkpoint_pages, checkpoint_s=checkpoint_s
+            )
+        except Exception as e:
+            print(f"Failed to start service: {e}")
+            return 2
+
+        try:
+            server = ServiceHTTPServer((host, port), service)
+        except OSError as e:
+            service.close()
+            print(f"Failed to listen on {host}:{port}: {e}")
+            return 2
+
+        print(f"Serving on http://{host}:{server.server_address[1]} (Ctrl-C to stop)", flush=True)
+        try:
+            server.serve_forever()
+        except KeyboardInterrupt:
+            pass
+        finally:
+            server.server_close()
+            service.close()
+        print(f"Stopped; word counts saved to {self.counts_path}")
         return 0
 
     def _run_relative_freq(self, mode: str, n: int) -> int:
-        counts_path = "word-counts.json"
+        from .relative_frequency import compute_relative_freq, sort_relative_df
+
+        counts_path = self.counts_path
         try:
-            counts = load_counts(counts_path)
+            with phase("fetch"):
+                counts = load_top_counts(counts_path, n)
         except Exception as e:
             print(f"Failed to load {counts_path}: {e}")
             return 2
@@ -158,27 +433,36 @@ class WikiScraperApp:
             return 3
 
         try:
-            lang_ref = build_language_reference(lang="en", n=2000)
+            with phase("fetch"):
+                lang_ref = load_language_reference(lang="en", n=2000, cache_dir=self.cache_dir)
         except Exception as e:
             print(f"Failed to build language reference: {e}")
             return 4
 
         try:
-            result = compute_relative_freq(counts, lang_ref, top_k=n)
-            out = sort_relative_df(result.df, mode=mode)
+            if mode == "language":
+                with phase("fetch"):
+                    counts = load_counts_for(counts_path, lang_ref)
+            with phase("process"):
+                result = compute_relative_freq(counts, lang_ref, top_k=n, mode=mode)
+                out = sort_relative_df(result.df, mode=mode)
         except Exception as e:
             print(f"Failed to compute relative frequency: {e}")
             return 5
 
-        print(out)
+        with phase("write"):
+            print(out)
         return 0
 
     def _run_relative_freq_chart(self, mode: str, n: int, out_path: str) -> int:
         import matplotlib.pyplot as plt
 
-        counts_path = "word-counts.json"
+        from .relative_frequency import compute_relative_freq, sort_relative_df
+
+        counts_path = self.counts_path
         try:
-            counts = load_counts(counts_path)
+            with phase("fetch"):
+                counts = load_top_counts(counts_path, n)
         except Exception as e:
             print(f"Failed to load {counts_path}: {e}")
             return 2
@@ -188,9 +472,13 @@ class WikiScraperApp:
             return 3
 
         try:
-            lang_ref = build_language_reference(lang="en", n=2000)
-            result = compute_relative_freq(counts, lang_ref, top_k=n)
-            df = sort_relative_df(result.df, mode=mode)
+            with phase("fetch"):
+                lang_ref = load_language_reference(lang="en", n=2000, cache_dir=self.cache_dir)
+                if mode == "language":
+                    counts = load_counts_for(counts_path, lang_ref)
+            with phase("process"):
+                result = compute_relative_freq(counts, lang_ref, top_k=n, mode=mode)
+                df = sort_relative_df(result.df, mode=mode)
         except Exception as e:
             print(f"Failed to compute relative frequency: {e}")
             return 4
@@ -233,25 +521,166 @@ class WikiScraperApp:
         plt.legend()
         plt.tight_layout()
 
-        plt.savefig(out_path, dpi=150)
+        with phase("write"):
+            plt.savefig(out_path, dpi=150)
         print(f"Saved chart to: {out_path}")
         return 0
 
-    def _run_auto_count_words(self, search_phrase: str, depth: int, wait_s: float, max_pages: int) -> int:
+    def _run_detect_language(self, paths: list[str], langs: list[str], ks: list[int]) -> int:
+        import pandas as pd
+
+        from .lang_detection import build_weights, lang_confidence_scores
+
+        files: list[Path] = []
+        for name in paths:
+            p = Path(name)
+            if p.is_dir():
+                files.extend(sorted(f for f in p.iterdir() if f.suffix.lower() in COUNTS_SUFFIXES))
+            else:
+                files.append(p)
+        if not files:
+            suffixes = ", ".join(sorted(COUNTS_SUFFIXES))
+            print(f"No word counts files ({suffixes}) found in: {', '.join(paths)}")
+            return 2
+
+        try:
+            with phase("fetch"):
+                docs = [load_counts(str(f)) for f in files]
+        except Exception as e:
+            print(f"Failed to load word counts: {e}")
+            return 2
+
+        try:
+            with phase("fetch"):
+                refs = {
+                    lang: list(load_language_reference(lang=lang, n=max(ks), cache_dir=self.cache_dir).items())
+                    for lang in langs
+                }
+            with phase("process"):
+                weights = build_weights(refs, ks)
+        except Exception as e:
+            print(f"Failed to build language reference: {e}")
+            return 3
+
+        try:
+            with phase("process"):
+                scores = lang_confidence_scores(docs, weights)
+        except Exception as e:
+            print(f"Failed to score languages: {e}")
+            return 4
+
+        rows = []
+        for f, doc_scores in zip(files, scores):
+            for ki, k in enumerate(ks):
+                row = {"file": str(f), "k": k}
+                row.update({lang: round(float(doc_scores[li, ki]), 4) for li, lang in enumerate(langs)})
+                row["best"] = langs[int(doc_scores[:, ki].argmax())]
+                rows.append(row)
+        print(pd.DataFrame(rows).to_string(index=False))
+        return 0
+
+    def _run_pack_archive(self, src: str, out: str) -> int:
+        from .archive import iter_archive_pages, iter_cache_pages, open_archive, pack_archive
+
+        archive = None
+        try:
+            if (Path(src) / "entries").is_dir():
+                pages = iter_cache_pages(PageCache(src), self.config.base_url)
+            else:
+                archive = open_archive(src)
+                pages = iter_archive_pages(archive)
+        except (OSError, ValueError) as e:
+            print(f"Failed to open {src}: {e}")
+            return 2
+
+        # pages are read while the archive is written
+        try:
+            count, size = pack_archive(pages, out)
+        except Exception as e:
+            print(f"Failed to write archive: {e}")
+            return 3
+        finally:
+            if archive is not None:
+                archive.close()
+
+        print(f"Packed {count} pages ({size / 2**20:.1f} MiB) into: {out}")
+        return 0
+
+    def _run_auto_count_words(
+        self,
+        search_phrase: str,
+        depth: int,
+        wait_s: float,
+        max_pages: int,
+        workers: int = 1,
+        rate: float | None = None,
+        checkpoint_pages: int = 50,
+        checkpoint_s: float = 30.0,
+        parse_workers: int = 0,
+        state_path: str | None = None,
+        resume: bool = False,
+        bloom_capacity: int | None = None,
+        bloom_error_rate: float = 0.001,
+        metrics_path: str | None = None,
+        prometheus_path: str | None = None,
+    ) -> int:
+        metrics = None
+        if metrics_path or prometheus_path:
+            from .metrics import CrawlMetrics
+
+            metrics = CrawlMetrics(events_path=metrics_path, prometheus_path=prometheus_path)
+        self.fetcher.metrics = self.crawler.metrics = metrics
         try:
             stats = self.crawler.auto_count_words(
                 start_title=search_phrase.strip().replace(" ", "_"),
                 max_depth=depth,
                 wait_s=wait_s,
                 max_pages=max_pages,
-                counts_path="word-counts.json",
+                counts_path=self.counts_path,
+                workers=workers,
+                rate=rate,
+                checkpoint_pages=checkpoint_pages,
+                checkpoint_s=checkpoint_s,
+                parse_workers=parse_workers,
+                state_path=state_path,
+                resume=resume,
+                bloom_capacity=bloom_capacity,
+                bloom_error_rate=bloom_error_rate,
             )
+        except KeyboardInterrupt:
+            print()
+            print("Interrupted.")
+            if state_path is not None and Path(state_path).exists():
+                print(f"Continue with --resume (state: {state_path}).")
+            return 130
         except Exception as e:
             print(f"Auto count failed: {e}")
+            if state_path is not None and Path(state_path).exists():
+                print(f"Continue with --resume (state: {state_path}).")
             return 2
+        finally:
+            self.fetcher.metrics = self.crawler.metrics = None
 
         print()
         print(
             f"Done. Visited pages: {stats.pages_visited}, unique pages: {stats.unique_pages}, tokens added: {stats.tokens_added}"
         )
+        print(
+            f"Frontier: peak {stats.frontier_peak} queued, {stats.seen_titles} titles seen, "
+            f"~{stats.frontier_bytes / 1024:.0f} KiB"
+        )
+        from .archive_fetcher import ArchiveFetcher
+
+        conn = self.fetcher.connection_stats()
+        if isinstance(self.fetcher, ArchiveFetcher):
+            print(f"Archive reads: {conn.requests}")
+        else:
+            print(
+                f"HTTP requests: {conn.requests} (retries: {conn.retries}), "
+                f"connections opened: {conn.connections_opened}, reused: {conn.connections_reused}"
+            )
+        if metrics is not None:
+            snap = metrics.final or metrics.snapshot(0)
+            stage = ", ".join(f"{k} {v / 1000:.2f} s" for k, v in snap["stage_ms"].items())
+            print(f"Throughput: {snap['pages_per_s']:.2f} pages/s, {snap['tokens_per_s']:.0f} tokens/s ({stage})")
         return 0
\ No newline at end of file
@@ -0,0 +1,182 @@
+from __future__ import annotations
+
+import hashlib
+import mmap
+import os
+import struct
+import urllib.parse
+from pathlib import Path
+from typing import Iterable, Iterator
+
+import msgpack
+
+from .page_cache import PageCache
+
+# packed archive layout:
+#   MAGIC, page bodies (utf-8, identical bodies stored once),
+#   msgpack index {"version": 1, "pages": {key: [offset, length, final_url]}},
+#   trailer: index offset (u64 little-endian) + MAGIC
+MAGIC = b"WSARCH1\n"
+_TRAILER = struct.Struct("<Q8s")
+ARCHIVE_VERSION = 1
+
+
+def archive_key(title: str) -> str:
+    """
+    Lookup key of an article title, as MediaWiki normalizes it:
+    "pikachu (Pokémon)", "Pikachu_%28Pok%C3%A9mon%29" -> "Pikachu_(Pokémon)".
+    """
+    key = urllib.parse.unquote(title).strip().replace(" ", "_").strip("_")
+    return key[:1].upper() + key[1:]
+
+
+class DirectoryArchive:
+    """
+    A directory of <title>.html files, titles as in /wiki/ URLs (percent-encoded
+    or not). Files are indexed once when the archive is opened.
+    """
+
+    def __init__(self, root: str | Path) -> None:
+        self.root = Path(root)
+        if not self.root.is_dir():
+            raise FileNotFoundError(f"Archive directory does not exist: {root}")
+        self._files: dict[str, str] = {}
+        with os.scandir(self.root) as it:
+            for e in it:
+                if e.name.endswith(".html") and e.is_file():
+                    self._files.setdefault(archive_key(e.name[: -len(".html")]), e.path)
+
+    def get(self, key: str) -> tuple[str | None, str] | None:
+        """(final_url or None, html) of the page stored under `key`, or None."""
+        path = self._files.get(key)
+        if path is None:
+            return None
+        with open(path, "rb") as f:
+            return None, f.read().decode("utf-8", errors="replace")
+
+    def keys(self) -> Iterable[str]:
+        return self._files.keys()
+
+    def __len__(self) -> int:
+        return len(self._files)
+
+    def close(self) -> None:
+        pass
+
+
+class PackedArchive:
+    """
+    Single-file archive written by pack_archive(), memory-mapped: a lookup is a
+    dict probe plus one slice of the mapping, with no per-page open/read calls.
+    """
+
+    def __init__(self, path: str | Path) -> None:
+        self.path = Path(path)
+        with open(self.path, "rb") as f:
+            try:
+                self._mm = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+            except ValueError as e:  # empty file
+                raise ValueError(f"Not a page archive: {path}") from e
+        try:
+            self._pages = self._read_index()
+        except Exception:
+            self._mm.close()
+            raise
+
+    def _read_index(self) -> dict[str, list]:
+        mm = self._mm
+        if len(mm) < len(MAGIC) + _TRAILER.size or mm[: len(MAGIC)] != MAGIC:
+            raise ValueError(f"Not a page archive: {self.path}")
+        index_offset, magic = _TRAILER.unpack(mm[len(mm) - _TRAILER.size :])
+        if magic != MAGIC or not len(MAGIC) <= index_offset <= len(mm) - _TRAILER.size:
+            raise ValueError(f"Truncated page archive: {self.path}")
+        index = msgpack.unpackb(mm[index_offset : len(mm) - _TRAILER.size], raw=False)
+        if index.get("version") != ARCHIVE_VERSION:
+            raise ValueError(f"Unsupported page archive version {index.get('version')}: {self.path}")
+        return index["pages"]
+
+    def get(self, key: str) -> tuple[str | None, str] | None:
+        """(final_url or None, html) of the page stored under `key`, or None."""
+        page = self._pages.get(key)
+        if page is None:
+            return None
+        offset, length, final_url = page
+        return final_url, self._mm[offset : offset + length].decode("utf-8", errors="replace")
+
+    def keys(self) -> Iterable[str]:
+        return self._pages.keys()
+
+    def __len__(self) -> int:
+        return len(self._pages)
+
+    def close(self) -> None:
+        self._mm.close()
+
+
+PageArchive = DirectoryArchive | PackedArchive
+
+
+def open_archive(path: str | Path) -> PageArchive:
+    """A directory of HTML files or a packed archive file."""
+    p = Path(path)
+    if p.is_dir():
+        return DirectoryArchive(p)
+    if not p.exists():
+        raise FileNotFoundError(f"Archive does not exist: {path}")
+    return PackedArchive(p)
+
+
+def pack_archive(pages: Iterable[tuple[str, str | None, str]], out: str | Path) -> tuple[int, int]:
+    """
+    Writes (title, final_url or None, html) pages to a packed archive; the first
+    page of a title wins. Returns (pages, bytes written). The file is written
+    next to `out` and renamed over it when complete.
+    """
+    out = Path(out)
+    tmp = out.with_name(f".{out.name}.tmp")
+    index: dict[str, list] = {}
+    bodies: dict[bytes, tuple[int, int]] = {}
+    try:
+        with open(tmp, "wb") as f:
+            f.write(MAGIC)
+            offset = len(MAGIC)
+            for title, final_url, html in pages:
+                key = archive_key(title)
+                if not key or key in index:
+                    continue
+                body = html.encode("utf-8")
+                digest = hashlib.sha256(body).digest()
+                span = bodies.get(digest)
+                if span is None:
+                    f.write(body)
+                    span = bodies[digest] = (offset, len(body))
+                    offset += len(body)
+                index[key] = [*span, final_url]
+            f.write(msgpack.packb({"version": ARCHIVE_VERSION, "pages": index}, use_bin_type=True))
+            f.write(_TRAILER.pack(offset, MAGIC))
+            size = f.tell()
+        os.replace(tmp, out)
+    except BaseException:
+        tmp.unlink(missing_ok=True)
+        raise
+    return len(index), size
+
+
+def iter_archive_pages(archive: PageArchive) -> Iterator[tuple[str, str | None, str]]:
+    for key in sorted(archive.keys()):
+        page = archive.get(key)
+        if page is not None:
+            yield key, page[0], page[1]
+
+
+def iter_cache_pages(cache: PageCache, base_url: str) -> Iterator[tuple[str, str | None, str]]:
+    """Article pages (/wiki/<title> under base_url) stored in a page cache, by URL."""
+    for entry in sorted(cache.entries(), key=lambda e: e.url):
+        if not entry.url.startswith(base_url):
+            continue
+        title = entry.url[len(base_url) :]
+        if not title or "?" in title:
+            continue
+        cached = cache.get(entry.url)
+        if cached is not None:
+            yield title, cached.entry.final_url, cached.html
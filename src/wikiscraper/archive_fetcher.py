@@ -0,0 +1,40 @@
+from __future__ import annotations
+
+import threading
+
+from .archive import PageArchive, archive_key
+from .fetcher import ConnectionStats, FetchResult, PageFetcher
+
+
+class ArchiveFetcher(PageFetcher):
+    """
+    Serves articles from a local PageArchive (directory of HTML files or packed
+    archive) instead of the network, so crawls over a frozen snapshot run at disk
+    speed and give the same result every time. Titles missing from the archive
+    are reported like a 404. Pages keep their archived final URL, or get the
+    /wiki/ URL they would have online.
+    """
+
+    def __init__(self, archive: PageArchive, base_url: str, **kwargs) -> None:
+        super().__init__(base_url, **kwargs)
+        self.archive = archive
+        self._reads = 0
+        self._reads_lock = threading.Lock()
+
+    def close(self) -> None:
+        self.archive.close()
+        super().close()
+
+    def fetch_article_html(self, search_phrase: str) -> FetchResult:
+        page = self.archive.get(archive_key(search_phrase))
+        with self._reads_lock:
+            self._reads += 1
+        if page is None:
+            raise FileNotFoundError(f"Article not in archive for phrase: {search_phrase}")
+        final_url, html = page
+        return FetchResult(final_url=final_url or self.build_article_url(search_phrase), html=html)
+
+    def connection_stats(self) -> ConnectionStats:
+        # no HTTP: archive reads, no connections (and no requests session is built)
+        with self._reads_lock:
+            return ConnectionStats(requests=self._reads, retries=0, connections_opened=0, connections_reused=0)
@@ -0,0 +1,158 @@
+from __future__ import annotations
+
+import io
+import json
+import shlex
+import sys
+import threading
+import time
+from collections import deque
+from concurrent.futures import Future, ThreadPoolExecutor
+from contextlib import contextmanager, redirect_stderr
+from dataclasses import dataclass
+from typing import Callable, Iterable, Iterator, TextIO
+
+from .cli import explicit_options
+from .profiling import phase
+
+# per-item actions; everything else (fetch mode, cache, counts file, ...) is set once
+# on the batch command line
+BATCH_ACTIONS = ("summary", "table", "all_tables", "count_words")
+# options an item may set besides its action
+BATCH_ITEM_OPTIONS = ("--html-file", "--first-row-is-header", "--table-format")
+
+
+@dataclass(frozen=True)
+class BatchItem:
+    line: int
+    argv: list[str]
+
+
+def read_manifest(lines: Iterable[str]) -> Iterator[BatchItem]:
+    """
+    One command per line, written like the CLI arguments (`"Pikachu" --summary`,
+    `Type --table 2 --first-row-is-header`). Blank lines and # comments are skipped.
+    """
+    for n, line in enumerate(lines, start=1):
+        argv = shlex.split(line, comments=True)
+        if argv:
+            yield BatchItem(line=n, argv=argv)
+
+
+class ThreadStdout(io.TextIOBase):
+    """
+    sys.stdout replacement that sends each thread's prints to its own buffer while
+    capture() is active in that thread, and to `target` otherwise.
+    """
+
+    def __init__(self, target: TextIO) -> None:
+        self.target = target
+        self._local = threading.local()
+
+    @contextmanager
+    def capture(self) -> Iterator[io.StringIO]:
+        buf = io.StringIO()
+        self._local.buf = buf
+        try:
+            yield buf
+        finally:
+            self._local.buf = None
+
+    def writable(self) -> bool:
+        return True
+
+    def write(self, s: str) -> int:
+        buf = getattr(self._local, "buf", None)
+        return (buf if buf is not None else self.target).write(s)
+
+    def flush(self) -> None:
+        self.target.flush()
+
+
+def parse_item(parse: Callable[[list[str]], object], item: BatchItem) -> tuple[object | None, str]:
+    """
+    (args, "") or (None, error message); argparse errors do not end the batch.
+    Items setting process-wide options are rejected rather than run without them.
+    """
+    err = io.StringIO()
+    try:
+        with redirect_stderr(err):
+            args = parse(item.argv)
+    except SystemExit:
+        lines = err.getvalue().strip().splitlines()
+        return None, lines[-1] if lines else "invalid arguments"
+    if args.search_phrase is None or not any(getattr(args, a) not in (None, False) for a in BATCH_ACTIONS):
+        actions = ", ".join("--" + a.replace("_", "-") for a in BATCH_ACTIONS)
+        return None, f"batch items need a search phrase and one of: {actions}"
+    allowed = {"--" + a.replace("_", "-") for a in BATCH_ACTIONS} | set(BATCH_ITEM_OPTIONS)
+    ignored = [o for o in explicit_options(args) if o not in allowed]
+    if ignored:
+        return None, f"not allowed in batch items (set them on the batch command line): {', '.join(ignored)}"
+    return args, ""
+
+
+def _failed(item: BatchItem, error: str) -> Future:
+    done: Future = Future()
+    done.set_result({"line": item.line, "args": item.argv, "exit_code": 2, "output": error + "\n", "seconds": 0.0})
+    return done
+
+
+def run_batch(
+    items: Iterable[BatchItem],
+    parse: Callable[[list[str]], object],
+    run_item: Callable[[object], int],
+    out: TextIO,
+    workers: int = 1,
+) -> tuple[int, int]:
+    """
+    Runs items on `workers` threads and writes one JSON object per item to `out`,
+    in manifest order (the items' own profiling phases are recorded per worker thread): {"line", "args", "exit_code", "output", "seconds"}.
+    Returns (items, failed).
+    """
+    if workers < 1:
+        raise ValueError("workers must be >= 1")
+
+    stdout = ThreadStdout(sys.stdout)
+
+    def run_one(item: BatchItem, args) -> dict:
+        start = time.perf_counter()
+        with stdout.capture() as buf:
+            try:
+                code = run_item(args)
+            except Exception as e:
+                print(f"Unexpected error: {e}")
+                code = 1
+        return {
+            "line": item.line,
+            "args": item.argv,
+            "exit_code": code,
+            "output": buf.getvalue(),
+            "seconds": round(time.perf_counter() - start, 6),
+        }
+
+    total = failed = 0
+
+    def write_next() -> None:
+        nonlocal total, failed
+        record = window.popleft().result()
+        total += 1
+        failed += record["exit_code"] != 0
+        with phase("write"):
+            out.write(json.dumps(record, ensure_ascii=False) + "\n")
+            out.flush()
+
+    window: deque[Future] = deque()
+    old_stdout, sys.stdout = sys.stdout, stdout
+    try:
+        with ThreadPoolExecutor(max_workers=workers) as pool:
+            for item in items:
+                args, error = parse_item(parse, item)
+                window.append(pool.submit(run_one, item, args) if args is not None else _failed(item, error))
+                # bounded read-ahead; results are written in manifest order
+                while len(window) > 2 * workers or (window and window[0].done()):
+                    write_next()
+            while window:
+                write_next()
+    finally:
+        sys.stdout = old_stdout
+    return total, failed
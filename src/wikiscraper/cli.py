@@ -11,19 +11,49 @@ def build_parser() -> argparse.ArgumentParser:
 
     parser.add_argument(
         "search_phrase",
-        help="Search phrase used to find the wiki article (quotes recommended).",
+        nargs="?",
+        help="Search phrase used to find the wiki article (quotes recommended). Not used by --batch.",
     )
 
     # Exactly ONE main action must be chosen.
     action = parser.add_mutually_exclusive_group(required=True)
     action.add_argument("--summary", action="store_true", help="Print first paragraph summary.")
     action.add_argument("--table", type=int, help="Extract N-th table and save as CSV.")
-    action.add_argument("--count-words", action="store_true", help="Update word-counts.json for article.")
+    action.add_argument(
+        "--all-tables",
+        action="store_true",
+        help="Extract every table of the article in one pass (rowspan/colspan expanded), one file per table.",
+    )
+    action.add_argument("--count-words", action="store_true", help="Update word counts (--counts-file) for article.")
     action.add_argument(
         "--analyze-relative-word-frequency",
         action="store_true",
         help="Compare article word frequency with language frequency.",
     )
+    action.add_argument(
+        "--detect-language",
+        nargs="+",
+        metavar="COUNTS",
+        help="Score word-count files (or directories of them) against --langs for every --k-values.",
+    )
+    action.add_argument(
+        "--batch",
+        metavar="MANIFEST",
+        help="Run one command per line of MANIFEST ('-' = stdin), e.g. '\"Pikachu\" --summary', in one process.",
+    )
+    action.add_argument(
+        "--serve",
+        type=int,
+        metavar="PORT",
+        help="Run a local HTTP/JSON service (summary, table, count-words, relative-frequency) on PORT.",
+    )
+    action.add_argument(
+        "--pack-archive",
+        nargs=2,
+        metavar=("SRC", "OUT"),
+        help="Pack the articles of SRC (a directory of HTML files or a --cache-dir page cache) into one "
+        "indexed archive file OUT for --archive.",
+    )
     action.add_argument(
         "--auto-count-words",
         type=int,
@@ -37,6 +67,13 @@ def build_parser() -> argparse.ArgumentParser:
         help="Treat first row of extracted table as header row.",
     )
 
+    parser.add_argument(
+        "--table-format",
+        choices=["csv", "parquet", "arrow"],
+        default="csv",
+        help="Output format for --all-tables (parquet/arrow need pyarrow).",
+    )
+
     parser.add_argument(
         "--mode",
         choices=["article", "language"],
@@ -65,8 +102,104 @@ def build_parser() -> argparse.ArgumentParser:
         help="Optional: save bar chart to PNG (default: relative_frequency.png). Works with --analyze-relative-word-frequency.",
     )
 
+    parser.add_argument(
+        "--counts-file",
+        type=str,
+        default="word-counts.json",
+        help="Word-count store; format by extension: .json, .msgpack or .sqlite (default: word-counts.json).",
+    )
+
+    parser.add_argument(
+        "--langs",
+        nargs="+",
+        default=["en", "pl", "de"],
+        help="Languages tested by --detect-language (default: en pl de).",
+    )
+
+    parser.add_argument(
+        "--k-values",
+        type=int,
+        nargs="+",
+        default=[3, 10, 100, 1000],
+        help="Top-k language word list sizes for --detect-language (default: 3 10 100 1000).",
+    )
+
+    parser.add_argument(
+        "--batch-output",
+        type=str,
+        default="-",
+        metavar="PATH",
+        help="JSON-lines results of --batch, one object per manifest line ('-' = stdout).",
+    )
+
+    parser.add_argument("--host", type=str, default="127.0.0.1", help="Address --serve listens on (default: 127.0.0.1).")
+
+    parser.add_argument(
+        "--service-pages",
+        type=int,
+        default=256,
+        help="Parsed pages kept in memory by --serve (LRU, default 256).",
+    )
+
+    parser.add_argument(
+        "--service-ttl",
+        type=float,
+        default=300.0,
+        help="Seconds --serve reuses a parsed page before fetching it again (default 300).",
+    )
+
     parser.add_argument("--wait", type=float, default=0.0, help="Delay between requests in auto mode (seconds).")
 
+    parser.add_argument(
+        "--workers",
+        type=int,
+        default=1,
+        help="Number of concurrent requests in --auto-count-words, or of parallel items in --batch.",
+    )
+
+    parser.add_argument(
+        "--parse-workers",
+        type=int,
+        default=0,
+        help="Worker processes for parsing/tokenizing in --auto-count-words (0 = in the main process).",
+    )
+
+    parser.add_argument(
+        "--rate",
+        type=float,
+        default=None,
+        help="Max requests per second in --auto-count-words (token bucket; overrides --wait).",
+    )
+
+    parser.add_argument(
+        "--parser-backend",
+        choices=["bs4", "lxml"],
+        default="bs4",
+        help="HTML extraction backend (lxml is faster, same results).",
+    )
+
+    parser.add_argument(
+        "--fetch-mode",
+        choices=["html", "api"],
+        default="html",
+        help="Download rendered /wiki/ pages (html) or parser output from MediaWiki api.php (api).",
+    )
+
+    parser.add_argument(
+        "--api-url",
+        type=str,
+        default=None,
+        help="MediaWiki api.php endpoint for --fetch-mode api (default: Bulbapedia's).",
+    )
+
+    parser.add_argument(
+        "--archive",
+        type=str,
+        default=None,
+        help="Read articles from a local archive (directory of <title>.html files or a --pack-archive file) "
+        "instead of the network; --auto-count-words then crawls offline.",
+    )
+
     parser.add_argument(
         "--html-file",
         type=str,
@@ -74,6 +207,92 @@ def build_parser() -> argparse.ArgumentParser:
         help="Optional path to a local HTML file (offline mode for testing).",
     )
 
+    parser.add_argument(
+        "--checkpoint-pages",
+        type=int,
+        default=50,
+        help="Write word counts every K crawled pages in --auto-count-words.",
+    )
+
+    parser.add_argument(
+        "--checkpoint-seconds",
+        type=float,
+        default=30.0,
+        help="Write word counts at least every T seconds in --auto-count-words.",
+    )
+
+    parser.add_argument(
+        "--bloom-capacity",
+        type=int,
+        default=None,
+        metavar="N",
+        help="Track seen titles in a Bloom filter sized for N titles (fixed memory, for whole-wiki crawls).",
+    )
+
+    parser.add_argument(
+        "--bloom-error-rate",
+        type=float,
+        default=0.001,
+        help="False-positive rate of the --bloom-capacity filter (default 0.001).",
+    )
+
+    parser.add_argument(
+        "--state-file",
+        type=str,
+        default=None,
+        help="Journal --auto-count-words checkpoints (queued titles, stats, counts delta) to this file so "
+        "the crawl can be resumed (off by default).",
+    )
+
+    parser.add_argument(
+        "--resume",
+        action="store_true",
+        help="Continue an interrupted --auto-count-words crawl from --state-file (required).",
+    )
+
+    parser.add_argument(
+        "--metrics-file",
+        type=str,
+        default=None,
+        help="Append --auto-count-words per-page timings and progress snapshots to this file (JSON lines).",
+    )
+
+    parser.add_argument(
+        "--prometheus-file",
+        type=str,
+        default=None,
+        help="Rewrite crawl metrics to this file in the Prometheus text format at every checkpoint.",
+    )
+
+    parser.add_argument(
+        "--profile",
+        action="store_true",
+        help="Profile the action (cProfile + tracemalloc, per phase: fetch, parse, process, write) "
+        "and print a summary at the end (timings are inflated by tracing).",
+    )
+
+    parser.add_argument(
+        "--profile-dir",
+        type=str,
+        default="profile",
+        help="Directory for --profile output: <action>.prof, <action>-<phase>.prof, <action>-memory.txt.",
+    )
+
+    parser.add_argument(
+        "--cache-dir",
+        type=str,
+        default=None,
+        help="Enable the on-disk page cache in this directory (off unless given), e.g. .wikiscraper-cache.",
+    )
+
+    cache = parser.add_mutually_exclusive_group()
+    cache.add_argument("--no-cache", action="store_true", help="Do not use the on-disk page cache (ignores --cache-dir).")
+    cache.add_argument(
+        "--offline",
+        action="store_true",
+        help="Serve pages only from the --cache-dir page cache, never touch the network.",
+    )
+
     parser.add_argument(
         "--max-pages",
         type=int,
@@ -81,4 +300,49 @@ def build_parser() -> argparse.ArgumentParser:
         help="Maximum number of pages to visit in --auto-count-words.",
     )
 
-    return parser
\ No newline at end of file
+    return parser
+
+
+ACTIONS = (
+    "summary",
+    "table",
+    "all_tables",
+    "count_words",
+    "analyze_relative_word_frequency",
+    "detect_language",
+    "batch",
+    "serve",
+    "pack_archive",
+    "auto_count_words",
+)
+
+
+def action_name(args: argparse.Namespace) -> str:
+    """The chosen main action as its option name without dashes, e.g. "all-tables"."""
+    return next(a for a in ACTIONS if getattr(args, a) not in (None, False)).replace("_", "-")
+
+
+def explicit_options(args: argparse.Namespace) -> list[str]:
+    """Options set to something other than their default, as option names, e.g. ["--workers"]."""
+    parser = build_parser()
+    return [
+        "--" + dest.replace("_", "-")
+        for dest, value in vars(args).items()
+        if dest != "search_phrase" and value != parser.get_default(dest)
+    ]
+
+
+# actions that do not work on a single article
+_NO_PHRASE_ACTIONS = ("batch", "serve", "pack_archive", "detect_language", "analyze_relative_word_frequency")
+
+
+def parse_args(argv: list[str] | None = None) -> argparse.Namespace:
+    parser = build_parser()
+    args = parser.parse_args(argv)
+    if args.search_phrase is None and not any(getattr(args, a) not in (None, False) for a in _NO_PHRASE_ACTIONS):
+        parser.error("the following arguments are required: search_phrase")
+    if args.resume and args.state_file is None:
+        parser.error("--resume requires --state-file")
+    if args.offline and args.cache_dir is None:
+        parser.error("--offline requires --cache-dir")
+    return args
@@ -0,0 +1,266 @@
+from __future__ import annotations
+
+import hashlib
+import heapq
+import json
+import sqlite3
+import threading
+import uuid
+from abc import ABC, abstractmethod
+from pathlib import Path
+from typing import Callable, Dict, Iterable, Mapping, Union
+
+import msgpack
+
+from .utils import atomic_write_bytes
+
+# journal(digest_before, digest_after, pending_counts)
+Journal = Callable[[str, str, Dict[str, int]], None]
+
+# digest of a counts store that does not exist yet
+MISSING_DIGEST = "missing"
+
+STORE_FORMATS = ("json", "msgpack", "sqlite")
+_SUFFIXES = {
+    ".json": "json",
+    ".msgpack": "msgpack",
+    ".mpk": "msgpack",
+    ".sqlite": "sqlite",
+    ".sqlite3": "sqlite",
+    ".db": "sqlite",
+}
+COUNTS_SUFFIXES = tuple(_SUFFIXES)
+
+
+def store_format(path: str) -> str:
+    """Counts format picked from the file extension (unknown extensions are JSON)."""
+    return _SUFFIXES.get(Path(path).suffix.lower(), "json")
+
+
+def _top_k(counts: Mapping[str, int], k: int) -> list[tuple[str, int]]:
+    # count desc, word asc
+    return heapq.nsmallest(k, counts.items(), key=lambda item: (-item[1], item[0]))
+
+
+class FileCountsStore(ABC):
+    """
+    Whole-file store: the full vocabulary is (de)serialized on load and on every update.
+    The digest is the SHA-256 of the file content.
+    """
+
+    def __init__(self, path: str) -> None:
+        self.path = path
+        self._counts: Dict[str, int] | None = None
+        p = Path(path)
+        self.digest = hashlib.sha256(p.read_bytes()).hexdigest() if p.exists() else MISSING_DIGEST
+
+    @abstractmethod
+    def _encode(self, counts: Dict[str, int]) -> bytes:
+        """File content of `counts`."""
+
+    @abstractmethod
+    def _decode(self, data: bytes) -> Dict[str, int]:
+        """Counts stored in file content `data`."""
+
+    def load(self) -> Dict[str, int]:
+        if self._counts is None:
+            p = Path(self.path)
+            self._counts = self._decode(p.read_bytes()) if p.exists() else {}
+        return self._counts
+
+    def top_k(self, k: int) -> list[tuple[str, int]]:
+        return _top_k(self.load(), k)
+
+    def get_many(self, words: Iterable[str]) -> Dict[str, int]:
+        counts = self.load()
+        return {w: counts[w] for w in words if w in counts}
+
+    def replace(self, counts: Mapping[str, int]) -> None:
+        self._counts = dict(counts)
+        data = self._encode(self._counts)
+        atomic_write_bytes(self.path, data)
+        self.digest = hashlib.sha256(data).hexdigest()
+
+    def update(self, pending: Mapping[str, int], journal: Journal | None = None, after: str | None = None) -> None:
+        """
+        Adds `pending` and rewrites the file atomically. If given,
+        journal(digest_before, digest_after, pending) is called before the file is replaced.
+        `after` is ignored: the digest follows from the content.
+        """
+        counts = self.load()
+        for tok, n in pending.items():
+            counts[tok] = counts.get(tok, 0) + n
+        try:
+            data = self._encode(counts)
+            after = hashlib.sha256(data).hexdigest()
+            if journal is not None:
+                journal(self.digest, after, dict(pending))
+            atomic_write_bytes(self.path, data)
+        except BaseException:
+            # keep memory in line with the file so a retried update is not applied twice
+            for tok, n in pending.items():
+                left = counts[tok] - n
+                if left:
+                    counts[tok] = left
+                else:
+                    del counts[tok]
+            raise
+        self.digest = after
+
+    def close(self) -> None:
+        pass
+
+
+class JsonCountsStore(FileCountsStore):
+    """word-counts.json: pretty-printed, key-sorted JSON (the original format)."""
+
+    def _encode(self, counts: Dict[str, int]) -> bytes:
+        return json.dumps(counts, ensure_ascii=False, indent=2, sort_keys=True).encode("utf-8")
+
+    def _decode(self, data: bytes) -> Dict[str, int]:
+        out: Dict[str, int] = {}
+        for k, v in json.loads(data.decode("utf-8")).items():
+            if isinstance(k, str) and isinstance(v, int):
+                out[k] = v
+        return out
+
+
+class MsgpackCountsStore(FileCountsStore):
+    """Compact binary map {word: count}; several times faster to load and save than JSON."""
+
+    def _encode(self, counts: Dict[str, int]) -> bytes:
+        return msgpack.packb(counts, use_bin_type=True)
+
+    def _decode(self, data: bytes) -> Dict[str, int]:
+        counts = msgpack.unpackb(data, raw=False)
+        if not isinstance(counts, dict):
+            raise ValueError(f"Not a word-count map: {self.path}")
+        return counts
+
+
+class SqliteCountsStore:
+    """
+    SQLite table with an index on count: updates upsert only the changed words and
+    top_k() reads k rows from the index, so neither depends on the vocabulary size.
+    The digest is a generation token rewritten in the same transaction as every update.
+    The connection may be used from any thread (e.g. a CountsAccumulator flushed by
+    --batch or --serve workers); every use is serialized under the store's lock.
+    """
+
+    def __init__(self, path: str) -> None:
+        self.path = path
+        self._conn: sqlite3.Connection | None = None
+        self._lock = threading.RLock()
+        self.digest = MISSING_DIGEST
+        if Path(path).exists():
+            with self._lock:
+                row = self._connect().execute("SELECT value FROM meta WHERE key = 'generation'").fetchone()
+            if row is not None:
+                self.digest = row[0]
+
+    def _connect(self) -> sqlite3.Connection:
+        if self._conn is None:
+            Path(self.path).parent.mkdir(parents=True, exist_ok=True)
+            conn = sqlite3.connect(self.path, check_same_thread=False)
+            conn.execute("PRAGMA journal_mode=WAL")
+            conn.execute("PRAGMA synchronous=NORMAL")
+            with conn:
+                conn.execute(
+                    "CREATE TABLE IF NOT EXISTS counts (word TEXT PRIMARY KEY, count INTEGER NOT NULL) WITHOUT ROWID"
+                )
+                conn.execute("CREATE INDEX IF NOT EXISTS counts_by_count ON counts (count DESC, word)")
+                conn.execute("CREATE TABLE IF NOT EXISTS meta (key TEXT PRIMARY KEY, value TEXT NOT NULL)")
+            self._conn = conn
+        return self._conn
+
+    def load(self) -> Dict[str, int]:
+        if self.digest == MISSING_DIGEST and not Path(self.path).exists():
+            return {}
+        with self._lock:
+            return dict(self._connect().execute("SELECT word, count FROM counts"))
+
+    def top_k(self, k: int) -> list[tuple[str, int]]:
+        if self.digest == MISSING_DIGEST and not Path(self.path).exists():
+            return []
+        with self._lock:
+            rows = self._connect().execute("SELECT word, count FROM counts ORDER BY count DESC, word LIMIT ?", (k,))
+            return list(rows)
+
+    def get_many(self, words: Iterable[str]) -> Dict[str, int]:
+        if self.digest == MISSING_DIGEST and not Path(self.path).exists():
+            return {}
+        words = list(dict.fromkeys(words))
+        out: Dict[str, int] = {}
+        with self._lock:
+            conn = self._connect()
+            for start in range(0, len(words), 500):
+                chunk = words[start : start + 500]
+                marks = ",".join("?" * len(chunk))
+                out.update(conn.execute(f"SELECT word, count FROM counts WHERE word IN ({marks})", chunk))
+        return out
+
+    def _commit(self, after: str, upsert: bool, counts: Mapping[str, int]) -> None:
+        with self._lock, self._connect() as conn:
+            if upsert:
+                conn.executemany(
+                    "INSERT INTO counts (word, count) VALUES (?, ?)"
+                    " ON CONFLICT (word) DO UPDATE SET count = count + excluded.count",
+                    counts.items(),
+                )
+            else:
+                conn.execute("DELETE FROM counts")
+                conn.executemany("INSERT INTO counts (word, count) VALUES (?, ?)", counts.items())
+            conn.execute("INSERT OR REPLACE INTO meta (key, value) VALUES ('generation', ?)", (after,))
+            self.digest = after
+
+    def replace(self, counts: Mapping[str, int]) -> None:
+        self._commit(uuid.uuid4().hex, upsert=False, counts=counts)
+
+    def update(self, pending: Mapping[str, int], journal: Journal | None = None, after: str | None = None) -> None:
+        """
+        Upserts `pending` in one transaction. If given, journal(digest_before,
+        digest_after, pending) is called before the transaction starts.
+        `after` sets the new generation token (used to replay a journaled update).
+        """
+        after = after or uuid.uuid4().hex
+        if journal is not None:
+            journal(self.digest, after, dict(pending))
+        self._commit(after, upsert=True, counts=pending)
+
+    def close(self) -> None:
+        with self._lock:
+            if self._conn is not None:
+                self._conn.close()
+                self._conn = None
+
+
+CountsStore = Union[FileCountsStore, SqliteCountsStore]
+
+_STORES = {"json": JsonCountsStore, "msgpack": MsgpackCountsStore, "sqlite": SqliteCountsStore}
+
+
+def open_counts_store(path: str) -> CountsStore:
+    return _STORES[store_format(path)](path)
+
+
+def convert_counts(src: str, dst: str) -> int:
+    """Copies counts between formats (e.g. word-counts.json -> word-counts.sqlite). Returns the word count."""
+    source = open_counts_store(src)
+    target = open_counts_store(dst)
+    try:
+        counts = source.load()
+        target.replace(counts)
+        return len(counts)
+    finally:
+        source.close()
+        target.close()
+
+
+if __name__ == "__main__":
+    import argparse
+
+    parser = argparse.ArgumentParser(description="Convert a word-counts file between JSON, msgpack and SQLite.")
+    parser.add_argument("src")
+    parser.add_argument("dst")
+    args = parser.parse_args()
+    print(f"Copied {convert_counts(args.src, args.dst)} words from {args.src} to {args.dst}")
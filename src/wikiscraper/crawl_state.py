@@ -0,0 +1,152 @@
+from __future__ import annotations
+
+import json
+import os
+from dataclasses import dataclass, field
+from pathlib import Path
+from typing import TextIO
+
+from .frontier import Frontier
+from .word_counting import CountsAccumulator
+
+STATE_VERSION = 3
+
+
+@dataclass(frozen=True)
+class Checkpoint:
+    """
+    One journal record, written at a counts checkpoint *before* the counts file is replaced.
+
+    counts_before / counts_after are digests of the counts file around that commit and
+    `pending` is the delta between them, so on resume we can tell whether the commit
+    happened (file == counts_after) or must be replayed (file == counts_before).
+    """
+
+    consumed: int  # titles taken from the frontier and finished (visited or missing)
+    pages_visited: int
+    tokens_added: int
+    counts_before: str
+    counts_after: str
+    pending: dict[str, int] = field(default_factory=dict)
+
+
+@dataclass
+class CrawlState:
+    """
+    A crawl rebuilt from its journal. The frontier is FIFO in push order, so the queue
+    is every title pushed so far minus the first `consumed` ones, and the seen-set is
+    all pushed titles (a Bloom filter fed the same titles gets the same bits).
+    """
+
+    start_title: str
+    max_depth: int
+    bloom_capacity: int | None
+    bloom_error_rate: float
+    counts_digest: str  # counts file when the crawl started
+    pushes: list[tuple[str, int]] = field(default_factory=list)
+    checkpoint: Checkpoint | None = None
+
+    @property
+    def consumed(self) -> int:
+        return self.checkpoint.consumed if self.checkpoint is not None else 0
+
+    def frontier(self) -> Frontier:
+        # no checkpoint yet: the crawl starts over
+        pushes = self.pushes or [(self.start_title, 0)]
+        return Frontier.restore(pushes, self.consumed, self.bloom_capacity, self.bloom_error_rate)
+
+    def reconcile(self, counts: CountsAccumulator) -> None:
+        """
+        Brings the counts file in line with this state (replays an interrupted commit).
+        """
+        if self.checkpoint is None:
+            if counts.digest != self.counts_digest:
+                raise ValueError("Counts file changed since the crawl started; cannot resume safely.")
+            return
+        if counts.digest == self.checkpoint.counts_after:
+            return
+        if counts.digest == self.checkpoint.counts_before:
+            counts.store.update(self.checkpoint.pending, after=self.checkpoint.counts_after)
+            return
+        raise ValueError("Counts file changed since the last crawl checkpoint; cannot resume safely.")
+
+
+class CrawlJournal:
+    """
+    Append-only crawl journal (JSON lines): a header with the crawl parameters, then one
+    record per checkpoint holding only what changed since the previous one (titles
+    pushed to the frontier, the counts delta) plus the running totals, so a checkpoint
+    costs O(pages since the last checkpoint), not O(pages crawled). Records are fsynced;
+    a torn last line (crash while appending) is dropped on resume.
+    """
+
+    def __init__(self, path: str, f: TextIO) -> None:
+        self.path = path
+        self._f = f
+
+    @classmethod
+    def create(
+        cls,
+        path: str,
+        start_title: str,
+        max_depth: int,
+        counts_digest: str,
+        bloom_capacity: int | None = None,
+        bloom_error_rate: float = 0.001,
+    ) -> CrawlJournal:
+        journal = cls(path, open(path, "w", encoding="utf-8"))
+        journal._write(
+            {
+                "version": STATE_VERSION,
+                "start_title": start_title,
+                "max_depth": max_depth,
+                "bloom_capacity": bloom_capacity,
+                "bloom_error_rate": bloom_error_rate,
+                "counts_digest": counts_digest,
+            }
+        )
+        return journal
+
+    @classmethod
+    def resume(cls, path: str) -> tuple[CrawlJournal, CrawlState]:
+        """Loads the journal and reopens it for appending after its last complete record."""
+        p = Path(path)
+        if not p.exists():
+            raise FileNotFoundError(f"No crawl state to resume: {path}")
+        state: CrawlState | None = None
+        good_end = 0
+        with open(p, "rb") as f:
+            for raw in f:
+                try:
+                    record = json.loads(raw) if raw.endswith(b"\n") else None
+                except ValueError:
+                    record = None
+                if record is None:
+                    if f.read(1):
+                        raise ValueError(f"Corrupt crawl state in {path}")
+                    break  # torn last record: that checkpoint never committed
+                good_end += len(raw)
+                if state is None:
+                    if record.pop("version", None) != STATE_VERSION:
+                        raise ValueError(f"Unsupported crawl state version in {path}")
+                    state = CrawlState(**record)
+                    continue
+                state.pushes.extend((str(title), int(depth)) for title, depth in record.pop("pushed"))
+                state.checkpoint = Checkpoint(**record)
+        if state is None:
+            raise ValueError(f"Empty crawl state in {path}")
+        f = open(p, "r+", encoding="utf-8")
+        f.truncate(good_end)
+        f.seek(good_end)
+        return cls(path, f), state
+
+    def _write(self, record: dict) -> None:
+        self._f.write(json.dumps(record, ensure_ascii=False) + "\n")
+        self._f.flush()
+        os.fsync(self._f.fileno())
+
+    def append(self, pushed: list[tuple[str, int]], checkpoint: Checkpoint) -> None:
+        self._write({"pushed": pushed, **checkpoint.__dict__})
+
+    def close(self) -> None:
+        self._f.close()
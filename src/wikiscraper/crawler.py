@@ -2,11 +2,21 @@ from __future__ import annotations
 
 import time
 from collections import deque
+from concurrent.futures import Executor, Future, ProcessPoolExecutor, ThreadPoolExecutor, wait
 from dataclasses import dataclass
+from pathlib import Path
+from typing import TYPE_CHECKING
 
-from .fetcher import PageFetcher
-from .parser import ArticleParser
-from .word_counting import tokenize, update_counts_file
+from .crawl_state import Checkpoint, CrawlJournal
+from .fetcher import FetchResult, PageFetcher
+from .frontier import Frontier
+from .parser import ArticleParser, parse_page
+from .profiling import phase
+from .rate_limit import TokenBucket
+from .word_counting import CountsAccumulator, count_tokens
+
+if TYPE_CHECKING:
+    from .metrics import CrawlMetrics
 
 
 @dataclass(frozen=True)
@@ -14,61 +24,300 @@ class CrawlStats:
     pages_visited: int
     tokens_added: int
     unique_pages: int
+    # frontier: longest queue, titles ever queued, approx. memory of queue + seen structure
+    frontier_peak: int = 0
+    seen_titles: int = 0
+    frontier_bytes: int = 0
+
+
+@dataclass(frozen=True)
+class PageAnalysis:
+    counts: dict[str, int]
+    tokens: int
+    links: list[str]
+    parse_s: float = 0.0
+    tokenize_s: float = 0.0
+
+
+def analyze_page(html: str, backend: str = "bs4", with_links: bool = True) -> PageAnalysis:
+    """
+    Parse + tokenize + count one page. Top-level so it can run in a worker process.
+    """
+    start = time.perf_counter()
+    with phase("parse"):
+        page = parse_page(html, backend)
+        text = page.text
+        links = list(page.links) if with_links else []
+    parsed = time.perf_counter()
+    with phase("process"):
+        counts = count_tokens(text)
+    return PageAnalysis(
+        counts=dict(counts),
+        tokens=counts.total(),
+        links=links,
+        parse_s=parsed - start,
+        tokenize_s=time.perf_counter() - parsed,
+    )
+
+
+def _start_process_pool(workers: int) -> ProcessPoolExecutor:
+    """
+    A process pool whose workers are already running. ProcessPoolExecutor forks
+    them on the first submit; left to itself that happens in a fetch thread's
+    done-callback, i.e. while other fetch threads (and the locks they hold in
+    requests/urllib3 and the rate limiter) are live. Forking here, on the calling
+    thread before the fetch pool exists, avoids inheriting those locks.
+    """
+    pool = ProcessPoolExecutor(max_workers=workers)
+    wait([pool.submit(int) for _ in range(workers)])
+    return pool
 
 
 class WikiCrawler:
-    def __init__(self, fetcher: PageFetcher, parser: ArticleParser) -> None:
+    def __init__(self, fetcher: PageFetcher, parser: ArticleParser, metrics: CrawlMetrics | None = None) -> None:
         self.fetcher = fetcher
         self.parser = parser
+        self.metrics = metrics
+
+    def _fetch(self, title: str) -> FetchResult:
+        # includes rate-limit waits: the fetcher paces each request it sends
+        start = time.perf_counter()
+        try:
+            with phase("fetch"):
+                return self.fetcher.fetch_article_html(title)
+        finally:
+            if self.metrics is not None:
+                self.metrics.observe_fetch(time.perf_counter() - start)
+
+    def _submit(
+        self,
+        title: str,
+        with_links: bool,
+        fetch_pool: Executor,
+        parse_pool: Executor | None,
+    ) -> Future[tuple[FetchResult, PageAnalysis | None]]:
+        """
+        Fetch one title in a thread task, then (if parse_pool is given) analyze the page
+        in a worker process as soon as its HTML arrives, independent of the order
+        results are consumed in. A missing article fails with FileNotFoundError.
+        """
+        out: Future[tuple[FetchResult, PageAnalysis | None]] = Future()
 
-    def auto_count_words(self, start_title: str, max_depth: int, wait_s: float, max_pages: int, counts_path: str = "word-counts.json") -> CrawlStats:
+        def on_fetched(f: Future[FetchResult]) -> None:
+            try:
+                result = f.result()
+            except BaseException as e:
+                out.set_exception(e)
+                return
+            if parse_pool is None:
+                out.set_result((result, None))
+            else:
+                self._parse_into(out, result, with_links, parse_pool)
+
+        fetch_pool.submit(self._fetch, title).add_done_callback(on_fetched)
+        return out
+
+    def _parse_into(
+        self,
+        out: Future[tuple[FetchResult, PageAnalysis | None]],
+        result: FetchResult,
+        with_links: bool,
+        parse_pool: Executor,
+    ) -> None:
+        def on_parsed(p: Future[PageAnalysis]) -> None:
+            try:
+                out.set_result((result, p.result()))
+            except BaseException as e:
+                out.set_exception(e)
+
+        try:
+            parse_pool.submit(analyze_page, result.html, self.parser.backend, with_links).add_done_callback(on_parsed)
+        except RuntimeError as e:  # pool already shut down
+            out.set_exception(e)
+
+    def auto_count_words(
+        self,
+        start_title: str,
+        max_depth: int,
+        wait_s: float,
+        max_pages: int,
+        counts_path: str = "word-counts.json",
+        workers: int = 1,
+        rate: float | None = None,
+        burst: int = 1,
+        checkpoint_pages: int = 50,
+        checkpoint_s: float = 30.0,
+        parse_workers: int = 0,
+        state_path: str | None = None,
+        resume: bool = False,
+        bloom_capacity: int | None = None,
+        bloom_error_rate: float = 0.001,
+    ) -> CrawlStats:
         """
         Breadth-first traversal from start_title up to max_depth.
         Depth 0 => only start page.
-        Uses visited set to avoid duplicates.
+        Titles are deduplicated when queued (see Frontier); with bloom_capacity the
+        seen-set is a Bloom filter with bloom_error_rate false positives.
+
+        Up to `workers` fetches run concurrently, but results are consumed in queue
+        order, so visiting order, counts and stats match a serial crawl.
+        Every request the fetcher sends (retries included) is paced by a token bucket
+        (`rate` req/s, or 1 / wait_s).
+        With parse_workers > 0, parsing and tokenizing run in a process pool fed
+        directly by the fetchers; this thread only owns the frontier and counts.
+        Counts are kept in memory and written every `checkpoint_pages` pages,
+        every `checkpoint_s` seconds and when the crawl ends (also on error).
+        With `state_path`, every checkpoint also appends the titles queued since the last
+        one and the stats to a crawl journal (see CrawlJournal), so an interrupted crawl
+        continues exactly where it stopped with resume=True.
+        With self.metrics set, per-page timings are recorded and a progress snapshot
+        is written at every checkpoint and when the crawl ends.
         """
         if max_pages < 1:
             raise ValueError("--max-pages must be >= 1")
         if max_depth < 0:
             raise ValueError("DEPTH must be >= 0")
+        if workers < 1:
+            raise ValueError("--workers must be >= 1")
+        if parse_workers < 0:
+            raise ValueError("--parse-workers must be >= 0")
+        if resume and state_path is None:
+            raise ValueError("--resume needs a crawl state file")
 
-        q = deque([(start_title, 0)])
-        visited: set[str] = set()
-        pages_visited = 0
-        tokens_added = 0
+        limiter = TokenBucket(rate, burst=burst) if rate else TokenBucket.from_wait(wait_s, burst=burst)
+        # pages fetched but not consumed yet are bounded by the window (backpressure on HTML held in memory)
+        window = workers + 2 * parse_workers
 
-        while q:
-            if pages_visited >= max_pages:
-                break
-            title, depth = q.popleft()
-            if title in visited:
-                continue
-            visited.add(title)
+        metrics = self.metrics
+        counts = CountsAccumulator(counts_path, flush_every_pages=checkpoint_pages, flush_every_s=checkpoint_s)
+        journal_file: CrawlJournal | None = None
+        if resume:
+            journal_file, state = CrawlJournal.resume(state_path)
+            try:
+                if state.max_depth != max_depth:
+                    raise ValueError(f"Crawl state was saved with DEPTH={state.max_depth}, got {max_depth}")
+                state.reconcile(counts)
+            except BaseException:
+                journal_file.close()
+                raise
+            start_title = state.start_title
+            frontier = state.frontier()
+            if state.checkpoint is not None:
+                pages_visited = state.checkpoint.pages_visited
+                tokens_added = state.checkpoint.tokens_added
+            else:
+                pages_visited = tokens_added = 0
+            unique_pages = state.consumed
+            frontier.log = []
+            print(f"[resume] pages={pages_visited} frontier={len(frontier)} seen={len(frontier.seen)}")
+        else:
+            frontier = Frontier(bloom_capacity=bloom_capacity, bloom_error_rate=bloom_error_rate)
+            if state_path is not None:
+                journal_file = CrawlJournal.create(
+                    state_path, start_title, max_depth, counts.digest, bloom_capacity, bloom_error_rate
+                )
+                frontier.log = []
+            frontier.push(start_title, 0)
+            pages_visited = 0
+            tokens_added = 0
+            unique_pages = 0
 
-            # polite waiting (skip before the very first request)
-            if pages_visited > 0 and wait_s > 0:
-                time.sleep(wait_s)
+        # fetched (or in flight) pages, in the order they were taken from the frontier
+        in_flight: deque[tuple[str, int, Future[tuple[FetchResult, PageAnalysis | None]]]] = deque()
 
-            try:
-                result = self.fetcher.fetch_article_html(title)
-            except FileNotFoundError:
-                print(f"[skip] 404 title={title}")
-                continue
-            pages_visited += 1
+        def journal(before: str, after: str, pending: dict[str, int]) -> None:
+            if journal_file is None or frontier.log is None:
+                return
+            checkpoint = Checkpoint(
+                # pages in flight are taken again on resume
+                consumed=unique_pages - len(in_flight),
+                pages_visited=pages_visited,
+                tokens_added=tokens_added,
+                counts_before=before,
+                counts_after=after,
+                pending=pending,
+            )
+            journal_file.append(frontier.log, checkpoint)
+            frontier.log = []
+
+        parse_pool = _start_process_pool(parse_workers) if parse_workers else None
+        fetch_pool = ThreadPoolExecutor(max_workers=workers, thread_name_prefix="crawl")
+        # the fetcher charges the limiter per request it actually sends
+        self.fetcher.limiter = limiter
+        try:
+            while True:
+                # never have more requests in flight than pages we are still allowed to visit
+                while frontier and len(in_flight) < window and pages_visited + len(in_flight) < max_pages:
+                    title, depth = frontier.pop()
+                    unique_pages += 1
+                    in_flight.append((title, depth, self._submit(title, depth < max_depth, fetch_pool, parse_pool)))
+
+                if not in_flight:
+                    break
+
+                title, depth, future = in_flight[0]
+                try:
+                    # on this thread "fetch" is the wait for the fetch threads (and parse workers)
+                    with phase("fetch"):
+                        result, analysis = future.result()
+                except FileNotFoundError:
+                    in_flight.popleft()
+                    print(f"[skip] 404 title={title}")
+                    continue
 
-            text = self.parser.extract_article_text(result.html)
-            tokens = tokenize(text)
-            tokens_added += len(tokens)
-            update_counts_file(counts_path, tokens)
+                if analysis is None:
+                    analysis = analyze_page(result.html, self.parser.backend, with_links=depth < max_depth)
 
-            print(f"[{pages_visited}] depth={depth} title={title} tokens={len(tokens)}")
+                in_flight.popleft()
+                pages_visited += 1
+                tokens_added += analysis.tokens
+                with phase("process"):
+                    counts.add_counts(analysis.counts)
+                    if depth < max_depth:
+                        for nxt in analysis.links:
+                            frontier.push(nxt, depth + 1)
 
-            if depth >= max_depth:
-                continue
+                print(f"[{pages_visited}] depth={depth} title={title} tokens={analysis.tokens}")
+                if metrics is None:
+                    with phase("write"):
+                        counts.maybe_flush(journal)
+                    continue
 
-            links = self.parser.extract_article_links(result.html)
-            for nxt in links:
-                if nxt not in visited:
-                    q.append((nxt, depth + 1))
+                metrics.observe_page(title, depth, len(result.html), analysis.tokens, analysis.parse_s, analysis.tokenize_s)
+                start = time.perf_counter()
+                with phase("write"):
+                    flushed = counts.maybe_flush(journal)
+                if flushed:
+                    metrics.observe_flush(time.perf_counter() - start)
+                    metrics.progress(len(frontier))
+        finally:
+            fetch_pool.shutdown(wait=True, cancel_futures=True)
+            self.fetcher.limiter = None
+            if parse_pool is not None:
+                parse_pool.shutdown(wait=True, cancel_futures=True)
+            if metrics is None:
+                with phase("write"):
+                    counts.close(journal)
+            else:
+                start = time.perf_counter()
+                flushed = counts.pending_pages > 0
+                try:
+                    with phase("write"):
+                        counts.close(journal)
+                    if flushed:
+                        metrics.observe_flush(time.perf_counter() - start)
+                finally:
+                    metrics.close(len(frontier))
+            if journal_file is not None:
+                journal_file.close()
 
-        return CrawlStats(pages_visited=pages_visited, tokens_added=tokens_added, unique_pages=len(visited))
\ No newline at end of file
+        if state_path is not None:
+            Path(state_path).unlink(missing_ok=True)
+        return CrawlStats(
+            pages_visited=pages_visited,
+            tokens_added=tokens_added,
+            unique_pages=unique_pages,
+            frontier_peak=frontier.peak_size,
+            seen_titles=len(frontier.seen),
+            frontier_bytes=frontier.memory_bytes(),
+        )
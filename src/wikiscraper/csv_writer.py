@@ -2,10 +2,12 @@ from __future__ import annotations
 
 import csv
 from pathlib import Path
+from typing import Iterable, Sequence
 
 
-def write_csv(path: str, rows: list[list[str]]) -> None:
+def write_csv(path: str, rows: Iterable[Sequence[str]]) -> None:
+    """Streams rows to path; rows may be any iterable, nothing is buffered."""
     p = Path(path)
     with p.open("w", newline="", encoding="utf-8") as f:
         writer = csv.writer(f)
-        writer.writerows(rows)
\ No newline at end of file
+        writer.writerows(rows)
@@ -1,10 +1,25 @@
 from __future__ import annotations
 
+import email.utils
+import threading
+import time
 import urllib.parse
 from dataclasses import dataclass
 from pathlib import Path
+from typing import TYPE_CHECKING, Callable
 
-import requests
+from .page_cache import CACHE_POLICIES, PageCache
+
+if TYPE_CHECKING:
+    import requests
+
+    from .metrics import CrawlMetrics
+    from .rate_limit import TokenBucket
+
+USER_AGENT = "WikiScraper/1.0 (Educational project)"
+
+# transient responses worth retrying (rate limit + gateway/server hiccups)
+RETRY_STATUSES = frozenset({429, 500, 502, 503, 504})
 
 
 @dataclass(frozen=True)
@@ -13,32 +28,213 @@ class FetchResult:
     html: str
 
 
+@dataclass(frozen=True)
+class ConnectionStats:
+    requests: int
+    retries: int
+    connections_opened: int
+    connections_reused: int
+
+
+def parse_retry_after(value: str | None, now: float | None = None) -> float | None:
+    """
+    Parses a Retry-After header (delta-seconds or HTTP-date) into seconds to wait.
+    """
+    if not value:
+        return None
+    value = value.strip()
+    if value.isdigit():
+        return float(value)
+    try:
+        dt = email.utils.parsedate_to_datetime(value)
+    except (TypeError, ValueError):
+        return None
+    now = time.time() if now is None else now
+    return max(0.0, dt.timestamp() - now)
+
+
 class PageFetcher:
-    def __init__(self, base_url: str, timeout: float = 15.0) -> None:
+    def __init__(
+        self,
+        base_url: str,
+        timeout: float = 15.0,
+        pool_size: int = 10,
+        max_retries: int = 3,
+        backoff_factor: float = 0.5,
+        max_backoff: float = 60.0,
+        sleep: Callable[[float], None] = time.sleep,
+        cache: PageCache | None = None,
+        cache_policy: str = "revalidate",
+    ) -> None:
+        if cache_policy not in CACHE_POLICIES:
+            raise ValueError(f"Unknown cache policy: {cache_policy}")
         self.base_url = base_url
+        self.cache = cache
+        self.cache_policy = cache_policy
         self.timeout = timeout
+        self.pool_size = pool_size
+        self.max_retries = max_retries
+        self.backoff_factor = backoff_factor
+        self.max_backoff = max_backoff
+        self._sleep = sleep
+        self._lock = threading.Lock()
+        self._requests = 0
+        self._retries = 0
+        self._session: requests.Session | None = None
+        # optional CrawlMetrics: request latency and body bytes
+        self.metrics: CrawlMetrics | None = None
+        # optional limiter charged one token per request sent (retries included, cache hits not)
+        self.limiter: TokenBucket | None = None
+
+    @property
+    def session(self) -> requests.Session:
+        # built on first request: requests is not imported for offline (--html-file) runs
+        if self._session is None:
+            with self._lock:
+                if self._session is None:
+                    self._session = self._build_session()
+        return self._session
+
+    @session.setter
+    def session(self, session: requests.Session) -> None:
+        self._session = session
+
+    def _build_session(self) -> requests.Session:
+        import requests
+        from requests.adapters import HTTPAdapter
+
+        session = requests.Session()
+        # one keep-alive pool per host; retries are handled in _get so they can honor Retry-After
+        adapter = HTTPAdapter(pool_connections=4, pool_maxsize=self.pool_size, max_retries=0)
+        session.mount("https://", adapter)
+        session.mount("http://", adapter)
+        session.headers.update(
+            {
+                "User-Agent": USER_AGENT,
+                "Accept-Encoding": "gzip, deflate",
+                "Connection": "keep-alive",
+            }
+        )
+        return session
+
+    def close(self) -> None:
+        if self._session is not None:
+            self._session.close()
 
     def build_article_url(self, search_phrase: str) -> str:
         title = search_phrase.strip().replace(" ", "_")
         title = urllib.parse.quote(title, safe=":/_()'-,")
         return self.base_url + title
 
+    def _backoff_delay(self, attempt: int, resp: requests.Response | None) -> float:
+        if resp is not None:
+            retry_after = parse_retry_after(resp.headers.get("Retry-After"))
+            if retry_after is not None:
+                return min(retry_after, self.max_backoff)
+        return min(self.max_backoff, self.backoff_factor * (2**attempt))
+
+    def _get(self, url: str, headers: dict[str, str] | None = None) -> requests.Response:
+        """
+        GET through the pooled session with exponential backoff on
+        connection errors, timeouts and RETRY_STATUSES responses.
+        """
+        import requests
+
+        attempt = 0
+        while True:
+            if self.limiter is not None:
+                self.limiter.acquire()
+            with self._lock:
+                self._requests += 1
+            resp: requests.Response | None = None
+            start = time.perf_counter()
+            try:
+                resp = self.session.get(url, timeout=self.timeout, headers=headers)
+            except (requests.ConnectionError, requests.Timeout):
+                if attempt >= self.max_retries:
+                    raise
+            else:
+                if self.metrics is not None:
+                    self.metrics.observe_request(time.perf_counter() - start, len(resp.content))
+                if resp.status_code not in RETRY_STATUSES or attempt >= self.max_retries:
+                    return resp
+                resp.close()
+
+            self._sleep(self._backoff_delay(attempt, resp))
+            attempt += 1
+            with self._lock:
+                self._retries += 1
+
+    def connection_stats(self) -> ConnectionStats:
+        opened = 0
+        sent = 0
+        for adapter in set(self.session.adapters.values()):
+            pools = getattr(adapter, "poolmanager", None)
+            if pools is None:
+                continue
+            for key in pools.pools.keys():
+                pool = pools.pools.get(key)
+                if pool is None:
+                    continue
+                opened += pool.num_connections
+                sent += pool.num_requests
+        with self._lock:
+            return ConnectionStats(
+                requests=self._requests,
+                retries=self._retries,
+                connections_opened=opened,
+                connections_reused=max(0, sent - opened),
+            )
+
     def fetch_article_html(self, search_phrase: str) -> FetchResult:
-        url = self.build_article_url(search_phrase)
-        resp = requests.get(
-            url,
-            timeout=self.timeout,
-            headers={"User-Agent": "WikiScraper/1.0 (Educational project)"},
-        )
+        return self.fetch_url(self.build_article_url(search_phrase), search_phrase)
+
+    def fetch_url(self, url: str, search_phrase: str) -> FetchResult:
+        """GET through the page cache (if configured); 404 -> FileNotFoundError."""
+        if self.cache is not None:
+            return self._fetch_cached(url, search_phrase, self.cache)
+        resp = self._get(url)
         if resp.status_code == 404:
             raise FileNotFoundError(f"Article not found for phrase: {search_phrase}")
         resp.raise_for_status()
         return FetchResult(final_url=str(resp.url), html=resp.text)
 
+    def _fetch_cached(self, url: str, search_phrase: str, cache: PageCache) -> FetchResult:
+        cached = None if self.cache_policy == "refresh" else cache.get(url)
+
+        if self.cache_policy == "offline":
+            if cached is None:
+                raise FileNotFoundError(f"Article not in cache (offline mode) for phrase: {search_phrase}")
+            return FetchResult(final_url=cached.entry.final_url, html=cached.html)
+
+        headers: dict[str, str] = {}
+        if cached is not None:
+            if cached.entry.etag:
+                headers["If-None-Match"] = cached.entry.etag
+            if cached.entry.last_modified:
+                headers["If-Modified-Since"] = cached.entry.last_modified
+
+        resp = self._get(url, headers=headers or None)
+        if resp.status_code == 304 and cached is not None:
+            return FetchResult(final_url=cached.entry.final_url, html=cached.html)
+        if resp.status_code == 404:
+            raise FileNotFoundError(f"Article not found for phrase: {search_phrase}")
+        resp.raise_for_status()
+
+        result = FetchResult(final_url=str(resp.url), html=resp.text)
+        cache.put(
+            url,
+            final_url=result.final_url,
+            html=result.html,
+            etag=resp.headers.get("ETag"),
+            last_modified=resp.headers.get("Last-Modified"),
+        )
+        return result
+
     def read_html_file(self, html_file: str) -> FetchResult:
         path = Path(html_file)
         if not path.exists():
             raise FileNotFoundError(f"HTML file does not exist: {html_file}")
         html = path.read_text(encoding="utf-8", errors="replace")
         # final_url is unknown in offline mode; keep file path for debugging
-        return FetchResult(final_url=str(path.resolve()), html=html)
\ No newline at end of file
+        return FetchResult(final_url=str(path.resolve()), html=html)
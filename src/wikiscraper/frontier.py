@@ -0,0 +1,131 @@
+from __future__ import annotations
+
+import hashlib
+import math
+import sys
+from collections import deque
+from typing import Iterable
+
+
+class BloomFilter:
+    """
+    Fixed-size probabilistic set: no false negatives, about `error_rate` false
+    positives once `capacity` items were added. Memory does not grow with items.
+    """
+
+    def __init__(self, capacity: int, error_rate: float = 0.001) -> None:
+        if capacity < 1:
+            raise ValueError("capacity must be >= 1")
+        if not 0 < error_rate < 1:
+            raise ValueError("error_rate must be in (0, 1)")
+        self.capacity = capacity
+        self.error_rate = error_rate
+        self.num_bits = max(8, int(math.ceil(-capacity * math.log(error_rate) / (math.log(2) ** 2))))
+        self.num_hashes = max(1, round(self.num_bits / capacity * math.log(2)))
+        self.bits = bytearray((self.num_bits + 7) // 8)
+        self.count = 0
+
+    def _positions(self, item: str) -> Iterable[int]:
+        digest = hashlib.blake2b(item.encode("utf-8"), digest_size=16).digest()
+        h1 = int.from_bytes(digest[:8], "little")
+        h2 = int.from_bytes(digest[8:], "little") | 1
+        m = self.num_bits
+        return ((h1 + i * h2) % m for i in range(self.num_hashes))
+
+    def __contains__(self, item: str) -> bool:
+        bits = self.bits
+        return all(bits[p >> 3] & (1 << (p & 7)) for p in self._positions(item))
+
+    def add(self, item: str) -> None:
+        bits = self.bits
+        for p in self._positions(item):
+            bits[p >> 3] |= 1 << (p & 7)
+        self.count += 1
+
+    def __len__(self) -> int:
+        return self.count
+
+    @property
+    def nbytes(self) -> int:
+        return len(self.bits)
+
+
+class Frontier:
+    """
+    BFS frontier that deduplicates at enqueue time: a title is queued at most once
+    per crawl, at its first (= smallest) depth, which gives the same visiting order
+    as dedup-at-pop while keeping the queue no longer than the number of unique titles.
+
+    Titles are kept per depth level (no (title, depth) tuple per entry).
+    `seen` is an exact set of titles, or a BloomFilter for whole-wiki crawls
+    (then a false positive skips a page that was never queued).
+    """
+
+    def __init__(self, bloom_capacity: int | None = None, bloom_error_rate: float = 0.001) -> None:
+        self.seen: set[str] | BloomFilter = (
+            BloomFilter(bloom_capacity, bloom_error_rate) if bloom_capacity else set()
+        )
+        self._levels: deque[tuple[int, deque[str]]] = deque()
+        self._size = 0
+        self.peak_size = 0
+        # (title, depth) of every push while not None; the crawl journal drains it at checkpoints
+        self.log: list[tuple[str, int]] | None = None
+
+    def __len__(self) -> int:
+        return self._size
+
+    def push(self, title: str, depth: int) -> bool:
+        """Queues title unless it was ever queued before. Returns True if queued."""
+        if title in self.seen:
+            return False
+        self.seen.add(title)
+        self._append(title, depth)
+        if self.log is not None:
+            self.log.append((title, depth))
+        return True
+
+    def _append(self, title: str, depth: int) -> None:
+        if not self._levels or self._levels[-1][0] != depth:
+            self._levels.append((depth, deque()))
+        self._levels[-1][1].append(title)
+        self._size += 1
+        if self._size > self.peak_size:
+            self.peak_size = self._size
+
+    def pop(self) -> tuple[str, int]:
+        depth, titles = self._levels[0]
+        title = titles.popleft()
+        if not titles:
+            self._levels.popleft()
+        self._size -= 1
+        return title, depth
+
+    def items(self) -> list[tuple[str, int]]:
+        return [(title, depth) for depth, titles in self._levels for title in titles]
+
+    def memory_bytes(self) -> int:
+        """Approximate memory held by the queue and the seen structure."""
+        queued = sum(sys.getsizeof(titles) for _, titles in self._levels)
+        if isinstance(self.seen, BloomFilter):
+            return queued + self.seen.nbytes
+        # title strings are shared between the queue and the seen set
+        return queued + sys.getsizeof(self.seen) + sum(sys.getsizeof(t) for t in self.seen)
+
+    @classmethod
+    def restore(
+        cls,
+        pushes: Iterable[tuple[str, int]],
+        consumed: int,
+        bloom_capacity: int | None = None,
+        bloom_error_rate: float = 0.001,
+    ) -> Frontier:
+        """
+        Rebuilds a frontier from every (title, depth) it ever queued, in push order, of
+        which the first `consumed` were popped already (the queue is FIFO in push order).
+        """
+        frontier = cls(bloom_capacity, bloom_error_rate)
+        for i, (title, depth) in enumerate(pushes):
+            frontier.seen.add(title)
+            if i >= consumed:
+                frontier._append(title, depth)
+        return frontier
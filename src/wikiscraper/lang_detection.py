@@ -0,0 +1,100 @@
+from __future__ import annotations
+
+from dataclasses import dataclass
+from typing import Mapping, Sequence
+
+import numpy as np
+
+# (word, zipf frequency), most frequent first
+LanguageWords = Sequence[tuple[str, float]]
+
+
+@dataclass(frozen=True)
+class LanguageWeights:
+    """
+    Vocabulary-by-(language, k) weight matrix: column (l, k) holds the weight of each
+    word in the top-k list of language l (0 for words outside it).
+    """
+
+    langs: tuple[str, ...]
+    ks: tuple[int, ...]
+    index: dict[str, int]  # word -> row
+    matrix: np.ndarray  # shape (len(index), len(langs) * len(ks))
+
+
+def build_weights(references: Mapping[str, LanguageWords], ks: Sequence[int]) -> LanguageWeights:
+    """
+    weight(word) = 0.5 * (k - rank) / k + 0.5 * freq / max_freq over the top-k list,
+    as in lang_confidence_score.
+    """
+    if any(k <= 0 for k in ks):
+        raise ValueError("k must be > 0")
+    langs = tuple(references)
+    index: dict[str, int] = {}
+    for words in references.values():
+        for w, _ in words[: max(ks)]:
+            index.setdefault(w, len(index))
+
+    matrix = np.zeros((len(index), len(langs) * len(ks)), dtype=np.float64)
+    for li, lang in enumerate(langs):
+        for ki, k in enumerate(ks):
+            topk = references[lang][:k]
+            if not topk:
+                continue
+            rank = {w: i for i, (w, _) in enumerate(topk)}
+            freq = dict(topk)
+            max_freq = max(freq.values())
+            rows = np.fromiter(map(index.__getitem__, rank), dtype=np.intp, count=len(rank))
+            r = np.fromiter(rank.values(), dtype=np.float64, count=len(rank))
+            f = np.fromiter(map(freq.__getitem__, rank), dtype=np.float64, count=len(rank))
+            freq_weight = f / max_freq if max_freq > 0 else np.zeros_like(f)
+            matrix[rows, li * len(ks) + ki] = 0.5 * (k - r) / k + 0.5 * freq_weight
+    return LanguageWeights(langs=langs, ks=tuple(ks), index=index, matrix=matrix)
+
+
+def _sparse_counts(docs: Sequence[Mapping[str, int]], index: dict[str, int]) -> tuple[np.ndarray, np.ndarray, np.ndarray]:
+    """
+    Document-by-vocabulary counts in CSR form (indptr, columns, values), keeping
+    only words of the weight vocabulary; the key intersection runs in C.
+    """
+    indptr = np.zeros(len(docs) + 1, dtype=np.intp)
+    cols: list[int] = []
+    vals: list[int] = []
+    for i, doc in enumerate(docs):
+        common = list(doc.keys() & index.keys())
+        cols.extend(map(index.__getitem__, common))
+        vals.extend(map(doc.__getitem__, common))
+        indptr[i + 1] = len(cols)
+    return indptr, np.asarray(cols, dtype=np.intp), np.asarray(vals, dtype=np.float64)
+
+
+def lang_confidence_scores(
+    docs: Sequence[Mapping[str, int]], weights: LanguageWeights, chunk_docs: int = 1024
+) -> np.ndarray:
+    """
+    Scores of every document for every (language, k) at once: shape (docs, langs, ks).
+    score = sum(count(w) * weight(w)) / total tokens of the document (0 for empty documents).
+    """
+    out = np.zeros((len(docs), len(weights.langs) * len(weights.ks)), dtype=np.float64)
+    for start in range(0, len(docs), chunk_docs):
+        chunk = docs[start : start + chunk_docs]
+        indptr, cols, vals = _sparse_counts(chunk, weights.index)
+        totals = np.fromiter((sum(doc.values()) for doc in chunk), dtype=np.float64, count=len(chunk))
+        # sparse x dense product: weighted rows summed per document
+        weighted = vals[:, None] * weights.matrix[cols]
+        sums = np.zeros((len(chunk), weighted.shape[1]), dtype=np.float64)
+        nonempty = indptr[1:] > indptr[:-1]
+        if weighted.size:
+            sums[nonempty] = np.add.reduceat(weighted, indptr[:-1][nonempty], axis=0)
+        np.divide(sums, totals[:, None], out=sums, where=totals[:, None] > 0)
+        out[start : start + len(chunk)] = sums
+    return out.reshape(len(docs), len(weights.langs), len(weights.ks))
+
+
+def lang_confidence_score(word_counts: Mapping[str, int], language_words_with_frequency: LanguageWords, k: int) -> float:
+    """
+    Share of the document's tokens found in the language's top-k words, weighted by
+    rank and frequency (0..1). Single-document form of lang_confidence_scores().
+    """
+    weights = build_weights({"lang": language_words_with_frequency}, [k])
+    return float(lang_confidence_scores([word_counts], weights)[0, 0, 0])
@@ -0,0 +1,107 @@
+from __future__ import annotations
+
+import importlib.metadata
+import math
+from pathlib import Path
+from typing import Iterable, Iterator, Mapping
+
+import msgpack
+
+from .utils import atomic_write_bytes
+
+FORMAT_VERSION = 1
+
+
+def wordfreq_version() -> str:
+    return importlib.metadata.version("wordfreq")
+
+
+class LanguageReference(Mapping[str, float]):
+    """
+    {word: zipf_frequency(word, lang)} for the top-n words of a language, plus
+    score_many() for any other word (memoized wordfreq lookups, NaN if unknown).
+
+    Tables are cached on disk keyed by (lang, n, wordfreq version), so only the
+    first run per key pays for top_n_list + n zipf_frequency calls.
+    """
+
+    def __init__(self, lang: str, table: dict[str, float]) -> None:
+        self.lang = lang
+        self.table = table
+        self._extra: dict[str, float] = {}
+
+    def __getitem__(self, word: str) -> float:
+        return self.table[word]
+
+    def __iter__(self) -> Iterator[str]:
+        return iter(self.table)
+
+    def __len__(self) -> int:
+        return len(self.table)
+
+    @classmethod
+    def build(cls, lang: str, n: int) -> LanguageReference:
+        from wordfreq import top_n_list, zipf_frequency
+
+        words = top_n_list(lang, n)
+        return cls(lang, {w: float(zipf_frequency(w, lang)) for w in words})
+
+    def score_many(self, words: Iterable[str]) -> list[float]:
+        """
+        Zipf frequency of every word (top-n or not); NaN for words wordfreq does not know.
+        """
+        words = list(words)
+        table = self.table
+        extra = self._extra
+        missing = [w for w in dict.fromkeys(words) if w not in table and w not in extra]
+        if missing:
+            from wordfreq import zipf_frequency
+
+            for w in missing:
+                z = float(zipf_frequency(w, self.lang))
+                extra[w] = z if z > 0 else math.nan
+        return [table[w] if w in table else extra[w] for w in words]
+
+    def to_bytes(self, n: int) -> bytes:
+        return msgpack.packb(
+            {
+                "format": FORMAT_VERSION,
+                "lang": self.lang,
+                "n": n,
+                "wordfreq": wordfreq_version(),
+                "words": list(self.table),
+                "zipf": list(self.table.values()),
+            },
+            use_bin_type=True,
+        )
+
+    @classmethod
+    def from_bytes(cls, data: bytes, lang: str, n: int) -> LanguageReference:
+        state = msgpack.unpackb(data, raw=False)
+        key = (state.get("format"), state.get("lang"), state.get("n"), state.get("wordfreq"))
+        if key != (FORMAT_VERSION, lang, n, wordfreq_version()):
+            raise ValueError("Language reference cache does not match")
+        return cls(lang, dict(zip(state["words"], state["zipf"])))
+
+
+def reference_cache_path(cache_dir: str, lang: str, n: int) -> Path:
+    return Path(cache_dir) / "langref" / f"{lang}-{n}-wordfreq-{wordfreq_version()}.msgpack"
+
+
+def load_language_reference(lang: str = "en", n: int = 2000, cache_dir: str | None = None) -> LanguageReference:
+    """
+    Language reference from the on-disk cache, built (and cached) on first use.
+    Without cache_dir it is always built from wordfreq.
+    """
+    if cache_dir is None:
+        return LanguageReference.build(lang, n)
+    path = reference_cache_path(cache_dir, lang, n)
+    if path.exists():
+        try:
+            return LanguageReference.from_bytes(path.read_bytes(), lang, n)
+        except (ValueError, KeyError, TypeError, msgpack.UnpackException):
+            pass  # stale or corrupt: rebuild below
+    ref = LanguageReference.build(lang, n)
+    path.parent.mkdir(parents=True, exist_ok=True)
+    atomic_write_bytes(path, ref.to_bytes(n))
+    return ref
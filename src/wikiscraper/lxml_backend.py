@@ -0,0 +1,154 @@
+from __future__ import annotations
+
+from functools import cached_property
+from typing import Iterator
+from urllib.parse import unquote
+
+from lxml import etree
+
+# bs4 stores strings inside these tags as special string types that get_text() skips
+_STRING_CONTAINERS = frozenset({"script", "style", "template", "rt", "rp"})
+_SKIP_FOR_TEXT = _STRING_CONTAINERS | {"table"}
+
+_content_xpath = etree.XPath("//*[@id='mw-content-text']")
+_tables_xpath = etree.XPath("//*[@id='mw-content-text']//table")
+# rows of a table's own sections (document order), not of tables nested in its cells
+_own_rows_xpath = etree.XPath("tr | thead/tr | tbody/tr | tfoot/tr")
+_wiki_hrefs_xpath = etree.XPath(".//a[starts-with(@href, '/wiki/')]/@href")
+
+
+def _iter_strings(root: etree._Element, skip: frozenset[str]) -> Iterator[str]:
+    """
+    Text nodes under root in document order, like bs4's Tag.strings:
+    no comments/processing instructions, nothing inside `skip` tags.
+    """
+    if root.tag in skip:
+        return
+    if root.text:
+        yield root.text
+    stack = [(root, iter(root))]
+    while stack:
+        parent, children = stack[-1]
+        for child in children:
+            tag = child.tag
+            if isinstance(tag, str) and tag not in skip:
+                if child.text:
+                    yield child.text
+                stack.append((child, iter(child)))
+                break
+            # comments, processing instructions and skipped subtrees: only the tail is content
+            if child.tail:
+                yield child.tail
+        else:
+            stack.pop()
+            if stack and parent.tail:
+                yield parent.tail
+
+
+def get_text(el: etree._Element, skip: frozenset[str] = _STRING_CONTAINERS) -> str:
+    """Equivalent of bs4 `tag.get_text(" ", strip=True)`."""
+    parts = []
+    for s in _iter_strings(el, skip):
+        s = s.strip()
+        if s:
+            parts.append(s)
+    return " ".join(parts)
+
+
+def _parse(html: str) -> etree._Element | None:
+    try:
+        return etree.HTML(html)
+    except ValueError:
+        # unicode input with an XML encoding declaration
+        return etree.HTML(html.encode("utf-8"), etree.HTMLParser(encoding="utf-8"))
+
+
+class LxmlPage:
+    """
+    ParsedPage built directly on the lxml C tree (XPath + manual walk instead of
+    BeautifulSoup objects). Gives the same text, links, first paragraph and tables.
+    """
+
+    def __init__(self, html: str) -> None:
+        self.root = _parse(html)
+
+    @cached_property
+    def content(self) -> etree._Element | None:
+        if self.root is None:
+            return None
+        found = _content_xpath(self.root)
+        return found[0] if found else None
+
+    def _require_content(self) -> etree._Element:
+        if self.content is None:
+            raise ValueError("Could not find main content container (#mw-content-text).")
+        return self.content
+
+    @cached_property
+    def first_paragraph(self) -> str:
+        content = self._require_content()
+        for p in content.iterdescendants("p"):
+            text = get_text(p)
+            if not text:
+                continue
+            if len(text) < 40:
+                continue
+            return text
+
+        raise ValueError("Could not find a suitable first paragraph in the article.")
+
+    @cached_property
+    def text(self) -> str:
+        return get_text(self._require_content(), skip=_SKIP_FOR_TEXT)
+
+    @cached_property
+    def links(self) -> list[str]:
+        content = self.content
+        if content is None:
+            return []
+
+        titles: list[str] = []
+        seen: set[str] = set()
+
+        for href in _wiki_hrefs_xpath(content):
+            href = str(href).split("#", 1)[0]
+            if href == "/wiki/":
+                continue
+
+            title = unquote(href[len("/wiki/") :])
+            if ":" in title:
+                continue
+
+            title = title.strip()
+            if not title:
+                continue
+
+            if title.lower().startswith("list_of_"):
+                continue
+
+            if title not in seen:
+                seen.add(title)
+                titles.append(title)
+
+        return titles
+
+    @cached_property
+    def tables(self) -> list[etree._Element]:
+        if self.root is None:
+            return []
+        return _tables_xpath(self.root)
+
+    def table_rows(self, table: etree._Element) -> list[list[str]]:
+        rows: list[list[str]] = []
+        for tr in table.iterdescendants("tr"):
+            cells = [get_text(c) for c in tr.iterdescendants("th", "td")]
+            if cells:
+                rows.append(cells)
+        return rows
+
+    def table_cells(self, table: etree._Element) -> list[list[tuple[str, str | None, str | None]]]:
+        rows: list[list[tuple[str, str | None, str | None]]] = []
+        for tr in _own_rows_xpath(table):
+            cells = tr.iterchildren("th", "td")
+            rows.append([(get_text(c), c.get("rowspan"), c.get("colspan")) for c in cells])
+        return rows
@@ -0,0 +1,202 @@
+from __future__ import annotations
+
+import bisect
+import json
+import math
+import os
+import threading
+import time
+from pathlib import Path
+from typing import Callable, TextIO
+
+from .utils import atomic_write_bytes
+
+# upper bounds (seconds) of the request latency histogram; +Inf is implicit
+LATENCY_BUCKETS = (0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0)
+
+STAGES = ("fetch", "parse", "tokenize", "flush")
+
+
+def rss_bytes() -> int:
+    """Current resident set size (peak RSS where /proc is not available)."""
+    try:
+        with open("/proc/self/statm", "rb") as f:
+            return int(f.read().split()[1]) * os.sysconf("SC_PAGE_SIZE")
+    except (OSError, ValueError, IndexError):
+        pass
+    try:
+        import resource
+    except ImportError:
+        return 0
+    peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    # bytes on macOS, KiB elsewhere
+    return peak if os.uname().sysname == "Darwin" else peak * 1024
+
+
+def _finite(value: float) -> float | None:
+    return None if math.isinf(value) else value
+
+
+class Histogram:
+    def __init__(self, buckets: tuple[float, ...] = LATENCY_BUCKETS) -> None:
+        self.buckets = buckets
+        self.counts = [0] * (len(buckets) + 1)
+        self.count = 0
+        self.sum = 0.0
+
+    def observe(self, value: float) -> None:
+        self.counts[bisect.bisect_left(self.buckets, value)] += 1
+        self.count += 1
+        self.sum += value
+
+    def quantile(self, q: float) -> float:
+        """Upper bound of the bucket holding the q-quantile (inf past the last bucket)."""
+        if not self.count:
+            return 0.0
+        rank = q * self.count
+        seen = 0
+        for bound, n in zip(self.buckets + (float("inf"),), self.counts):
+            seen += n
+            if seen >= rank:
+                return bound
+        return float("inf")
+
+
+class CrawlMetrics:
+    """
+    Per-stage timings of a crawl, filled by WikiCrawler (fetch/parse/tokenize/flush
+    seconds, pages, tokens) and PageFetcher (HTTP request latency and bytes).
+
+    Events go to `events_path` as JSON lines ({"event": "page" | "progress" | "done", ...});
+    progress() also rewrites `prometheus_path` in the Prometheus text format.
+    Thread-safe: fetcher threads and the crawl loop report concurrently.
+    """
+
+    def __init__(
+        self,
+        events_path: str | None = None,
+        prometheus_path: str | None = None,
+        clock: Callable[[], float] = time.perf_counter,
+    ) -> None:
+        self.prometheus_path = prometheus_path
+        self._clock = clock
+        self._start = clock()
+        self._lock = threading.Lock()
+        self._events: TextIO | None = open(events_path, "a", encoding="utf-8") if events_path else None
+        self.latency = Histogram()
+        self.stage_seconds = dict.fromkeys(STAGES, 0.0)
+        self.requests = 0
+        self.bytes = 0
+        self.pages = 0
+        self.tokens = 0
+        self.flushes = 0
+        # last snapshot, set by close()
+        self.final: dict | None = None
+
+    def _emit(self, event: dict) -> None:
+        if self._events is not None:
+            self._events.write(json.dumps(event, ensure_ascii=False) + "\n")
+
+    def elapsed(self) -> float:
+        return self._clock() - self._start
+
+    def observe_request(self, seconds: float, nbytes: int) -> None:
+        with self._lock:
+            self.latency.observe(seconds)
+            self.requests += 1
+            self.bytes += nbytes
+
+    def observe_fetch(self, seconds: float) -> None:
+        with self._lock:
+            self.stage_seconds["fetch"] += seconds
+
+    def observe_page(self, title: str, depth: int, html_chars: int, tokens: int, parse_s: float, tokenize_s: float) -> None:
+        with self._lock:
+            self.pages += 1
+            self.tokens += tokens
+            self.stage_seconds["parse"] += parse_s
+            self.stage_seconds["tokenize"] += tokenize_s
+            self._emit(
+                {
+                    "event": "page",
+                    "t": round(self.elapsed(), 6),
+                    "title": title,
+                    "depth": depth,
+                    "html_chars": html_chars,
+                    "tokens": tokens,
+                    "parse_ms": round(parse_s * 1000, 3),
+                    "tokenize_ms": round(tokenize_s * 1000, 3),
+                }
+            )
+
+    def observe_flush(self, seconds: float) -> None:
+        with self._lock:
+            self.flushes += 1
+            self.stage_seconds["flush"] += seconds
+
+    def snapshot(self, frontier_size: int) -> dict:
+        with self._lock:
+            elapsed = self.elapsed()
+            return {
+                "t": round(elapsed, 6),
+                "pages": self.pages,
+                "tokens": self.tokens,
+                "pages_per_s": self.pages / elapsed if elapsed > 0 else 0.0,
+                "tokens_per_s": self.tokens / elapsed if elapsed > 0 else 0.0,
+                "requests": self.requests,
+                "bytes": self.bytes,
+                # None past the last bucket (JSON has no infinity)
+                "latency_p50_s": _finite(self.latency.quantile(0.5)),
+                "latency_p99_s": _finite(self.latency.quantile(0.99)),
+                "stage_ms": {k: round(v * 1000, 3) for k, v in self.stage_seconds.items()},
+                "flushes": self.flushes,
+                "frontier": frontier_size,
+                "rss_bytes": rss_bytes(),
+            }
+
+    def progress(self, frontier_size: int, event: str = "progress") -> dict:
+        snap = self.snapshot(frontier_size)
+        with self._lock:
+            self._emit({"event": event, **snap})
+            if self._events is not None:
+                self._events.flush()
+        if self.prometheus_path:
+            atomic_write_bytes(Path(self.prometheus_path), self.prometheus_text(snap).encode("utf-8"))
+        return snap
+
+    def prometheus_text(self, snap: dict) -> str:
+        lines = [
+            "# HELP wikiscraper_http_request_seconds HTTP request latency.",
+            "# TYPE wikiscraper_http_request_seconds histogram",
+        ]
+        with self._lock:
+            cumulative = 0
+            for bound, n in zip(self.latency.buckets + (float("inf"),), self.latency.counts):
+                cumulative += n
+                le = "+Inf" if bound == float("inf") else repr(bound)
+                lines.append(f'wikiscraper_http_request_seconds_bucket{{le="{le}"}} {cumulative}')
+            lines.append(f"wikiscraper_http_request_seconds_sum {self.latency.sum}")
+            lines.append(f"wikiscraper_http_request_seconds_count {self.latency.count}")
+            stages = dict(self.stage_seconds)
+
+        lines += ["# HELP wikiscraper_stage_seconds_total Time spent per crawl stage.", "# TYPE wikiscraper_stage_seconds_total counter"]
+        lines += [f'wikiscraper_stage_seconds_total{{stage="{k}"}} {v}' for k, v in stages.items()]
+        for name, kind, value, help_text in (
+            ("fetched_bytes_total", "counter", snap["bytes"], "Bytes of HTTP response bodies."),
+            ("pages_total", "counter", snap["pages"], "Pages counted."),
+            ("tokens_total", "counter", snap["tokens"], "Tokens counted."),
+            ("counts_flushes_total", "counter", snap["flushes"], "Word-count checkpoints written."),
+            ("pages_per_second", "gauge", snap["pages_per_s"], "Pages per second since the crawl started."),
+            ("tokens_per_second", "gauge", snap["tokens_per_s"], "Tokens per second since the crawl started."),
+            ("frontier_size", "gauge", snap["frontier"], "Titles waiting in the frontier."),
+            ("rss_bytes", "gauge", snap["rss_bytes"], "Resident set size of the crawler process."),
+        ):
+            lines += [f"# HELP wikiscraper_{name} {help_text}", f"# TYPE wikiscraper_{name} {kind}", f"wikiscraper_{name} {value}"]
+        return "\n".join(lines) + "\n"
+
+    def close(self, frontier_size: int = 0) -> dict:
+        self.final = self.progress(frontier_size, event="done")
+        if self._events is not None:
+            self._events.close()
+            self._events = None
+        return self.final
@@ -0,0 +1,189 @@
+from __future__ import annotations
+
+import hashlib
+import json
+import os
+import threading
+import time
+from dataclasses import asdict, dataclass
+from pathlib import Path
+from typing import Iterator
+
+from .utils import atomic_write_bytes
+
+# revalidate: serve cached pages after a conditional request (If-None-Match / If-Modified-Since)
+# offline:    serve only from cache, never touch the network
+# refresh:    always download, overwrite cache
+CACHE_POLICIES = ("revalidate", "offline", "refresh")
+
+# a full evict() pass (age + size) runs on the first write of a process and then at most this often
+EVICT_INTERVAL_S = 3600.0
+
+
+@dataclass(frozen=True)
+class CacheEntry:
+    url: str
+    final_url: str
+    body_sha256: str
+    size: int
+    etag: str | None
+    last_modified: str | None
+    stored_at: float
+
+
+@dataclass(frozen=True)
+class CachedPage:
+    entry: CacheEntry
+    html: str
+
+
+def _sha256(data: bytes) -> str:
+    return hashlib.sha256(data).hexdigest()
+
+
+def _atomic_write(path: Path, data: bytes) -> None:
+    path.parent.mkdir(parents=True, exist_ok=True)
+    atomic_write_bytes(path, data)
+
+
+class PageCache:
+    """
+    Content-addressed on-disk cache of fetched pages.
+
+    Layout:
+      objects/<sha[:2]>/<sha>   page bodies (utf-8), shared by identical pages
+      entries/<sha(url)>.json   url -> body hash, final URL, ETag, Last-Modified
+
+    The entry file mtime is the last access time, used for LRU and age eviction.
+    put() runs evict() when the cache outgrows max_bytes, and also on its first call
+    and then every EVICT_INTERVAL_S, so stale pages expire even in a cache that
+    never fills up.
+    """
+
+    def __init__(
+        self,
+        directory: str,
+        max_bytes: int = 512 * 1024 * 1024,
+        max_age_s: float = 30 * 24 * 3600,
+    ) -> None:
+        self.root = Path(directory)
+        self.max_bytes = max_bytes
+        self.max_age_s = max_age_s
+        self._objects = self.root / "objects"
+        self._entries = self.root / "entries"
+        self._lock = threading.RLock()
+        # body bytes on disk, set by evict() (which the first put() runs)
+        self._approx_bytes = 0
+        self._last_evict: float | None = None
+
+    def _entry_path(self, url: str) -> Path:
+        return self._entries / f"{_sha256(url.encode('utf-8'))}.json"
+
+    def _object_path(self, sha: str) -> Path:
+        return self._objects / sha[:2] / sha
+
+    def get(self, url: str) -> CachedPage | None:
+        entry_path = self._entry_path(url)
+        try:
+            entry = CacheEntry(**json.loads(entry_path.read_text(encoding="utf-8")))
+            body = self._object_path(entry.body_sha256).read_bytes()
+        except (FileNotFoundError, ValueError, TypeError):
+            return None
+        if _sha256(body) != entry.body_sha256:
+            # corrupted object; treat as a miss
+            return None
+        try:
+            os.utime(entry_path)
+        except FileNotFoundError:
+            pass
+        return CachedPage(entry=entry, html=body.decode("utf-8"))
+
+    def entries(self) -> Iterator[CacheEntry]:
+        """Every readable cache entry (in no particular order); does not touch access times."""
+        if not self._entries.exists():
+            return
+        for path in self._entries.glob("*.json"):
+            try:
+                yield CacheEntry(**json.loads(path.read_text(encoding="utf-8")))
+            except (FileNotFoundError, ValueError, TypeError):
+                continue
+
+    def put(
+        self,
+        url: str,
+        final_url: str,
+        html: str,
+        etag: str | None = None,
+        last_modified: str | None = None,
+    ) -> CacheEntry:
+        body = html.encode("utf-8")
+        sha = _sha256(body)
+        entry = CacheEntry(
+            url=url,
+            final_url=final_url,
+            body_sha256=sha,
+            size=len(body),
+            etag=etag,
+            last_modified=last_modified,
+            stored_at=time.time(),
+        )
+
+        # writes hold the lock so evict() never drops a body whose entry is not written yet
+        with self._lock:
+            if self._last_evict is None or entry.stored_at - self._last_evict > EVICT_INTERVAL_S:
+                self.evict(entry.stored_at)
+            obj = self._object_path(sha)
+            if not obj.exists():
+                _atomic_write(obj, body)
+                self._approx_bytes += len(body)
+            _atomic_write(self._entry_path(url), json.dumps(asdict(entry)).encode("utf-8"))
+            if self._approx_bytes > self.max_bytes:
+                self.evict()
+        return entry
+
+    def evict(self, now: float | None = None) -> int:
+        """
+        Drops entries not accessed for max_age_s, then least recently used entries
+        until the referenced bodies fit in max_bytes. Unreferenced bodies are removed.
+        Returns number of removed entries.
+        """
+        now = time.time() if now is None else now
+        with self._lock:
+            entries: list[tuple[float, Path, CacheEntry]] = []
+            removed = 0
+            if self._entries.exists():
+                for path in self._entries.glob("*.json"):
+                    try:
+                        atime = path.stat().st_mtime
+                        entry = CacheEntry(**json.loads(path.read_text(encoding="utf-8")))
+                    except (FileNotFoundError, ValueError, TypeError):
+                        path.unlink(missing_ok=True)
+                        continue
+                    if now - atime > self.max_age_s:
+                        path.unlink(missing_ok=True)
+                        removed += 1
+                        continue
+                    entries.append((atime, path, entry))
+
+            # newest first; keep entries while their (deduplicated) bodies fit
+            entries.sort(key=lambda e: e[0], reverse=True)
+            kept: set[str] = set()
+            total = 0
+            for _, path, entry in entries:
+                if entry.body_sha256 in kept:
+                    continue
+                if total + entry.size > self.max_bytes:
+                    path.unlink(missing_ok=True)
+                    removed += 1
+                    continue
+                kept.add(entry.body_sha256)
+                total += entry.size
+
+            if self._objects.exists():
+                for obj in self._objects.glob("*/*"):
+                    if obj.name not in kept and not obj.name.endswith(".tmp"):
+                        obj.unlink(missing_ok=True)
+
+            self._approx_bytes = total
+            self._last_evict = now
+            return removed
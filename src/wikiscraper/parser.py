@@ -1,15 +1,37 @@
 from __future__ import annotations
 
-from bs4 import BeautifulSoup
+from functools import cached_property
+from typing import TYPE_CHECKING, Union
+from urllib.parse import unquote
 
+from bs4 import BeautifulSoup, NavigableString, Tag
 
-class ArticleParser:
-    def extract_first_paragraph(self, html: str) -> str:
-        soup = BeautifulSoup(html, "lxml")
-        content = soup.select_one("#mw-content-text")
-        if content is None:
+if TYPE_CHECKING:
+    from .lxml_backend import LxmlPage
+
+
+class ParsedPage:
+    """
+    A page parsed once. Text, links, first paragraph and tables are derived
+    lazily from the same tree, which is never mutated, so one ParsedPage can
+    serve every ArticleParser/TableExtractor operation.
+    """
+
+    def __init__(self, html: str) -> None:
+        self.soup = BeautifulSoup(html, "lxml")
+
+    @cached_property
+    def content(self) -> Tag | None:
+        return self.soup.select_one("#mw-content-text")
+
+    def _require_content(self) -> Tag:
+        if self.content is None:
             raise ValueError("Could not find main content container (#mw-content-text).")
+        return self.content
 
+    @cached_property
+    def first_paragraph(self) -> str:
+        content = self._require_content()
         for p in content.find_all("p", recursive=True):
             text = p.get_text(" ", strip=True)
             if not text:
@@ -20,31 +42,31 @@ class ArticleParser:
 
         raise ValueError("Could not find a suitable first paragraph in the article.")
 
-    def extract_article_text(self, html: str) -> str:
+    @cached_property
+    def text(self) -> str:
         """
-        Extracts main article text from #mw-content-text.
-        We remove tables (often infoboxes/charts) to focus on prose.
+        Main article text from #mw-content-text without tables
+        (same result as get_text(" ", strip=True) after removing every table).
         """
-        soup = BeautifulSoup(html, "lxml")
-        content = soup.select_one("#mw-content-text")
-        if content is None:
-            raise ValueError("Could not find main content container (#mw-content-text).")
-
-        # remove tables (navigation, infobox, charts) from text counting
-        for t in content.find_all("table"):
-            t.decompose()
-
-        text = content.get_text(" ", strip=True)
-        return text
-    
-    def extract_article_links(self, html: str) -> list[str]:
-        """
-        Returns list of internal /wiki/... links (titles) from main content.
-        We filter out namespaces like File:, Category:, Special:, etc.
-        Output is page titles like 'Pikachu' or 'Type' (without '/wiki/').
-        """
-        soup = BeautifulSoup(html, "lxml")
-        content = soup.select_one("#mw-content-text")
+        content = self._require_content()
+        in_tables = {
+            id(node)
+            for table in content.find_all("table")
+            for node in table.descendants
+            if isinstance(node, NavigableString)
+        }
+        parts: list[str] = []
+        for s in content.strings:
+            if id(s) in in_tables:
+                continue
+            s = s.strip()
+            if s:
+                parts.append(s)
+        return " ".join(parts)
+
+    @cached_property
+    def links(self) -> list[str]:
+        content = self.content
         if content is None:
             return []
 
@@ -63,7 +85,6 @@ class ArticleParser:
 
             title = href[len("/wiki/") :]
             # decode percent-encoding (e.g. Pok%C3%A9mon)
-            from urllib.parse import unquote
             title = unquote(title)
 
             # filter namespaces like File:, Category:, Special:, etc.
@@ -82,4 +103,82 @@ class ArticleParser:
                 seen.add(title)
                 titles.append(title)
 
-        return titles
\ No newline at end of file
+        return titles
+
+    @cached_property
+    def tables(self) -> list[Tag]:
+        return self.soup.select("#mw-content-text table")
+
+    def table_rows(self, table: Tag) -> list[list[str]]:
+        rows: list[list[str]] = []
+        for tr in table.find_all("tr"):
+            cells = tr.find_all(["th", "td"])
+            if not cells:
+                continue
+            row = [c.get_text(" ", strip=True) for c in cells]
+            rows.append(row)
+        return rows
+
+    def table_cells(self, table: Tag) -> list[list[tuple[str, str | None, str | None]]]:
+        """
+        (text, rowspan, colspan) of the table's own cells, row by row. Only the rows
+        of the table's own sections are read, so rows of nested tables are left to
+        (and visited only by) those tables.
+        """
+        rows: list[list[tuple[str, str | None, str | None]]] = []
+        for section in table.find_all(["tr", "thead", "tbody", "tfoot"], recursive=False):
+            for tr in [section] if section.name == "tr" else section.find_all("tr", recursive=False):
+                cells = tr.find_all(["th", "td"], recursive=False)
+                rows.append([(c.get_text(" ", strip=True), c.get("rowspan"), c.get("colspan")) for c in cells])
+        return rows
+
+
+# "bs4": BeautifulSoup object tree (reference implementation)
+# "lxml": lxml C tree via XPath (see lxml_backend.py), same results, faster
+BACKENDS = ("bs4", "lxml")
+
+Page = Union[ParsedPage, "LxmlPage"]
+
+
+def parse_page(html: str, backend: str = "bs4") -> Page:
+    if backend == "bs4":
+        return ParsedPage(html)
+    if backend == "lxml":
+        from .lxml_backend import LxmlPage
+
+        return LxmlPage(html)
+    raise ValueError(f"Unknown parser backend: {backend}")
+
+
+def as_page(html: str | Page, backend: str = "bs4") -> Page:
+    if isinstance(html, str):
+        return parse_page(html, backend)
+    return html
+
+
+class ArticleParser:
+    def __init__(self, backend: str = "bs4") -> None:
+        if backend not in BACKENDS:
+            raise ValueError(f"Unknown parser backend: {backend}")
+        self.backend = backend
+
+    def parse(self, html: str) -> Page:
+        return parse_page(html, self.backend)
+
+    def extract_first_paragraph(self, html: str | Page) -> str:
+        return as_page(html, self.backend).first_paragraph
+
+    def extract_article_text(self, html: str | Page) -> str:
+        """
+        Extracts main article text from #mw-content-text.
+        We remove tables (often infoboxes/charts) to focus on prose.
+        """
+        return as_page(html, self.backend).text
+
+    def extract_article_links(self, html: str | Page) -> list[str]:
+        """
+        Returns list of internal /wiki/... links (titles) from main content.
+        We filter out namespaces like File:, Category:, Special:, etc.
+        Output is page titles like 'Pikachu' or 'Type' (without '/wiki/').
+        """
+        return list(as_page(html, self.backend).links)
@@ -0,0 +1,287 @@
+from __future__ import annotations
+
+import threading
+import time
+from contextlib import contextmanager, nullcontext
+from dataclasses import dataclass, field
+from pathlib import Path
+from typing import TYPE_CHECKING, ContextManager, Iterator, TextIO
+
+if TYPE_CHECKING:
+    import cProfile
+    import tracemalloc
+
+PHASES = ("fetch", "parse", "process", "write")
+
+# time outside every phase (argument handling, imports, printing results)
+OTHER = "other"
+
+# tracemalloc snapshots (O(live blocks) each) are taken for a phase's first runs only
+SNAPSHOT_RUNS = 3
+
+_active: RunProfiler | None = None
+
+
+def phase(name: str) -> ContextManager[object]:
+    """
+    Attributes the enclosed block to pipeline phase `name` while a RunProfiler is
+    running; a no-op otherwise. Blocks on other threads than the one that started
+    the profiler (crawl fetchers, --batch workers) are profiled per thread.
+    """
+    profiler = _active
+    if profiler is None:
+        return nullcontext()
+    if threading.get_ident() != profiler.thread_id:
+        return profiler.thread_phase(name)
+    return profiler.phase(name)
+
+
+@dataclass
+class PhaseStats:
+    calls: int = 0
+    wall_s: float = 0.0
+    cpu_s: float = 0.0
+    # highest traced memory while the phase ran
+    peak_bytes: int = 0
+    # traced memory at entry / exit of the snapshotted run with the highest peak (see RunProfiler.top_allocations)
+    snapshots: tuple[tracemalloc.Snapshot, tracemalloc.Snapshot] | None = field(default=None, repr=False)
+
+
+class RunProfiler:
+    """
+    cProfile + tracemalloc for one CLI action. Each phase gets its own cProfile
+    profile (swapped in on entry), so out_dir/<action>-<phase>.prof holds only that
+    phase and out_dir/<action>.prof all of them; tracemalloc gives per-phase peaks
+    and top allocation sites (out_dir/<action>-memory.txt).
+
+    Phases entered on other threads get a cProfile profile per (thread, phase),
+    merged into the .prof dumps, and wall / thread CPU time in `thread_stats`
+    (summed over threads, so it can exceed the run's wall time). tracemalloc is
+    process-wide, so their memory is not broken down. Since Python 3.12 only one
+    cProfile profile can be enabled per interpreter; there, thread phases are timed
+    but not profiled. --parse-workers processes are not profiled.
+    """
+
+    def __init__(self, action: str, out_dir: str = "profile", top: int = 10, frames: int = 1) -> None:
+        self.action = action
+        self.out_dir = Path(out_dir)
+        self.top = top
+        self.frames = frames
+        self.thread_id = threading.get_ident()
+        self.stats: dict[str, PhaseStats] = {}
+        self.thread_stats: dict[str, PhaseStats] = {}
+        self._profiles: dict[str, cProfile.Profile] = {}
+        self._thread_profiles: dict[tuple[int, str], cProfile.Profile] = {}
+        self._lock = threading.Lock()
+        self._local = threading.local()
+        self._stack: list[str] = []
+        self._wall = 0.0
+        self._cpu = 0.0
+        self.peak_bytes = 0
+
+    def _profile(self, name: str) -> cProfile.Profile:
+        import cProfile
+
+        profile = self._profiles.get(name)
+        if profile is None:
+            profile = self._profiles[name] = cProfile.Profile()
+        return profile
+
+    def start(self) -> None:
+        global _active
+        import tracemalloc
+
+        if _active is not None:
+            raise RuntimeError("a profiler is already running")
+        tracemalloc.start(self.frames)
+        _active = self
+        self._stack = [OTHER]
+        self._wall = time.perf_counter()
+        self._cpu = time.process_time()
+        _enable(self._profile(OTHER))
+
+    @contextmanager
+    def phase(self, name: str) -> Iterator[None]:
+        import tracemalloc
+
+        outer = self._stack[-1]
+        self._profiles[outer].disable()
+        # an inner phase resets the peak: keep what the outer phase reached so far
+        if outer != OTHER:
+            self._note_peak(outer, tracemalloc.get_traced_memory()[1])
+        stats = self.stats.setdefault(name, PhaseStats())
+        before = tracemalloc.take_snapshot() if stats.calls < SNAPSHOT_RUNS else None
+        tracemalloc.reset_peak()
+        self._stack.append(name)
+        wall, cpu = time.perf_counter(), time.process_time()
+        _enable(self._profile(name))
+        try:
+            yield
+        finally:
+            self._profiles[name].disable()
+            stats.calls += 1
+            stats.wall_s += time.perf_counter() - wall
+            stats.cpu_s += time.process_time() - cpu
+            peak = tracemalloc.get_traced_memory()[1]
+            if before is not None and (stats.snapshots is None or peak >= stats.peak_bytes):
+                stats.snapshots = (before, tracemalloc.take_snapshot())
+            self._note_peak(name, peak)
+            if outer != OTHER:
+                self._note_peak(outer, peak)
+            self._stack.pop()
+            _enable(self._profiles[outer])
+
+    @contextmanager
+    def thread_phase(self, name: str) -> Iterator[None]:
+        import cProfile
+
+        ident = threading.get_ident()
+        stack: list[cProfile.Profile | None] = self._local.__dict__.setdefault("stack", [])
+        if stack and stack[-1] is not None:
+            stack[-1].disable()
+        with self._lock:
+            profile = self._thread_profiles.get((ident, name))
+            if profile is None:
+                profile = self._thread_profiles[ident, name] = cProfile.Profile()
+        stack.append(profile if _enable(profile) else None)
+        wall, cpu = time.perf_counter(), time.thread_time()
+        try:
+            yield
+        finally:
+            wall, cpu = time.perf_counter() - wall, time.thread_time() - cpu
+            if stack.pop() is not None:
+                profile.disable()
+            if stack and stack[-1] is not None:
+                _enable(stack[-1])
+            with self._lock:
+                stats = self.thread_stats.setdefault(name, PhaseStats())
+                stats.calls += 1
+                stats.wall_s += wall
+                stats.cpu_s += cpu
+
+    def _phase_profiles(self, name: str) -> list[cProfile.Profile]:
+        profiles = [p for (_, phase_name), p in self._thread_profiles.items() if phase_name == name]
+        if name in self._profiles:
+            profiles.append(self._profiles[name])
+        return [p for p in profiles if p.getstats()]
+
+    def _note_peak(self, name: str, peak: int) -> None:
+        stats = self.stats[name]
+        stats.peak_bytes = max(stats.peak_bytes, peak)
+        self.peak_bytes = max(self.peak_bytes, peak)
+
+    def stop(self) -> dict[str, Path]:
+        """Stops profiling and writes the .prof dumps and the memory report; returns their paths."""
+        global _active
+        import pstats
+        import tracemalloc
+
+        self._profiles[OTHER].disable()
+        self._wall = time.perf_counter() - self._wall
+        self._cpu = time.process_time() - self._cpu
+        self.peak_bytes = max(self.peak_bytes, tracemalloc.get_traced_memory()[1])
+        tracemalloc.stop()
+        _active = None
+
+        self.out_dir.mkdir(parents=True, exist_ok=True)
+        paths = {"all": self.out_dir / f"{self.action}.prof"}
+        profiles = [p for p in (*self._profiles.values(), *self._thread_profiles.values()) if p.getstats()]
+        if profiles:
+            pstats.Stats(*profiles).dump_stats(paths["all"])
+        for name in {**self.stats, **self.thread_stats}:
+            profiles = self._phase_profiles(name)
+            if profiles:
+                paths[name] = self.out_dir / f"{self.action}-{name}.prof"
+                pstats.Stats(*profiles).dump_stats(paths[name])
+        paths["memory"] = self.out_dir / f"{self.action}-memory.txt"
+        paths["memory"].write_text(self.memory_report(), encoding="utf-8")
+        return paths
+
+    def memory_report(self) -> str:
+        lines = [f"action: {self.action}", f"peak traced memory: {_mib(self.peak_bytes)}"]
+        for name in self.stats:
+            lines.append("")
+            peak = _mib(self.stats[name].peak_bytes)
+            lines.append(f"[{name}] peak {peak}, allocated by the phase and still live at its end:")
+            lines += [f"  {_size(size):>10}  {count:>+8} blocks  {site}" for site, size, count in self.top_allocations(name)]
+        return "\n".join(lines) + "\n"
+
+    def top_allocations(self, name: str) -> list[tuple[str, int, int]]:
+        """(file:line, bytes, blocks) that grew most during the phase's highest-peak run."""
+        snapshots = self.stats[name].snapshots
+        if snapshots is None:
+            return []
+        import tracemalloc
+
+        before, after = snapshots
+        # the profiler's own bookkeeping is not the phase's
+        own = {tracemalloc.__file__, __file__}
+        diff = [d for d in after.compare_to(before, "lineno") if d.size_diff > 0 and d.traceback[0].filename not in own]
+        diff.sort(key=lambda d: d.size_diff, reverse=True)
+        return [
+            (f"{d.traceback[0].filename}:{d.traceback[0].lineno}", d.size_diff, d.count_diff) for d in diff[: self.top]
+        ]
+
+    def hotspots(self, n: int = 10) -> list[tuple[str, int, float, float]]:
+        """(function, calls, own seconds, cumulative seconds) by own time, inside the phases."""
+        import pstats
+
+        names = {**self.stats, **self.thread_stats}
+        profiles = [p for name in names for p in self._phase_profiles(name)]
+        if not profiles:
+            return []
+        raw = pstats.Stats(*profiles).stats  # type: ignore[attr-defined]
+        rows = [
+            (f"{Path(file).name}:{line}({func})", nc, tt, ct) for (file, line, func), (_, nc, tt, ct, _) in raw.items()
+        ]
+        rows.sort(key=lambda r: r[2], reverse=True)
+        return rows[:n]
+
+    def print_summary(self, paths: dict[str, Path], file: TextIO) -> None:
+        print(
+            f"Profile of {self.action}: {self._wall:.3f} s wall, {self._cpu:.3f} s CPU, peak {_mib(self.peak_bytes)}",
+            file=file,
+        )
+        for name in [*PHASES, *(n for n in self.stats if n not in PHASES)]:
+            stats = self.stats.get(name)
+            if stats is None:
+                continue
+            print(
+                f"  {name:<8} {stats.wall_s * 1000:10.1f} ms wall {stats.cpu_s * 1000:10.1f} ms CPU"
+                f"  peak {_mib(stats.peak_bytes):>10}  ({stats.calls}x)",
+                file=file,
+            )
+        # phases are not nested on the main thread, so the rest is startup, imports and printing
+        other = self._wall - sum(stats.wall_s for stats in self.stats.values())
+        print(f"  {OTHER:<8} {other * 1000:10.1f} ms wall", file=file)
+        if self.thread_stats:
+            print("  worker threads (summed over threads):", file=file)
+        for name in [*PHASES, *(n for n in self.thread_stats if n not in PHASES)]:
+            stats = self.thread_stats.get(name)
+            if stats is not None:
+                print(
+                    f"  {name:<8} {stats.wall_s * 1000:10.1f} ms wall {stats.cpu_s * 1000:10.1f} ms CPU  ({stats.calls}x)",
+                    file=file,
+                )
+        hotspots = self.hotspots()
+        if hotspots:
+            print("  top functions in phases (own time):", file=file)
+        for func, calls, own, cum in hotspots:
+            print(f"    {own * 1000:9.1f} ms own {cum * 1000:9.1f} ms cum {calls:>8}x  {func}", file=file)
+        print(f"  written: {', '.join(str(p) for p in paths.values())}", file=file)
+
+
+def _enable(profile: cProfile.Profile) -> bool:
+    try:
+        profile.enable()
+    except ValueError:  # Python 3.12+: another profile is enabled in some thread
+        return False
+    return True
+
+
+def _mib(nbytes: int) -> str:
+    return f"{nbytes / 2**20:.2f} MiB"
+
+
+def _size(nbytes: int) -> str:
+    return _mib(nbytes) if nbytes >= 2**20 else f"{nbytes / 1024:.1f} KiB"
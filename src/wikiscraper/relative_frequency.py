@@ -1,9 +1,13 @@
 from __future__ import annotations
 
 from dataclasses import dataclass
+from itertools import repeat
+from typing import Mapping
 
+import numpy as np
 import pandas as pd
-from wordfreq import top_n_list, zipf_frequency
+
+from .language_reference import LanguageReference
 
 
 @dataclass(frozen=True)
@@ -11,36 +15,74 @@ class RelativeFreqResult:
     df: pd.DataFrame
 
 
-def build_language_reference(lang: str, n: int = 2000) -> dict[str, float]:
+def top_k_indices(values: np.ndarray, words: np.ndarray, k: int) -> np.ndarray:
     """
-    Returns {word: zipf_frequency(word, lang)} for top-n words.
-    zipf_frequency is a stable scale; higher = more common in language.
+    Indices of the k largest values, ordered by value desc, word asc.
+    argpartition finds the k-th largest value in O(n); only candidates >= that
+    value are sorted, and ties at the boundary are broken by word.
     """
-    words = top_n_list(lang, n)
-    return {w: float(zipf_frequency(w, lang)) for w in words}
+    n = len(values)
+    if k <= 0 or n == 0:
+        return np.empty(0, dtype=np.intp)
+    if k < n:
+        kth = values[np.argpartition(values, n - k)[n - k]]
+        candidates = np.flatnonzero(values >= kth)
+    else:
+        candidates = np.arange(n)
+    order = np.lexsort((words[candidates], -values[candidates]))
+    return candidates[order[:k]]
+
+
+def _language_scores(lang_ref: Mapping[str, float], words: list[str]) -> np.ndarray:
+    if isinstance(lang_ref, LanguageReference):
+        return np.asarray(lang_ref.score_many(words), dtype=np.float64)
+    # one C-level pass of hash lookups (the reference is already a hash table)
+    return np.fromiter(map(lang_ref.get, words, repeat(np.nan)), dtype=np.float64, count=len(words))
+
 
+def _as_arrays(mapping: Mapping[str, float], dtype) -> tuple[np.ndarray, np.ndarray]:
+    words = np.fromiter(mapping.keys(), dtype=object, count=len(mapping))
+    values = np.fromiter(mapping.values(), dtype=dtype, count=len(mapping))
+    return words, values
 
-def compute_relative_freq(article_counts: dict[str, int], lang_ref: dict[str, float], top_k: int) -> RelativeFreqResult:
+
+def compute_relative_freq(
+    article_counts: Mapping[str, int], lang_ref: Mapping[str, float], top_k: int, mode: str = "article"
+) -> RelativeFreqResult:
     """
     article_counts: {word: count}
-    lang_ref: {word: language_freq_score}
-    """
-    article_series = pd.Series(article_counts, dtype="int64")
-    article_series = article_series.sort_values(ascending=False)
-
-    top_words = article_series.head(top_k).index.tolist()
+    lang_ref: {word: language_freq_score}; a LanguageReference also scores words outside its table
 
-    rows = []
-    for w in top_words:
-        rows.append(
+    mode="article": the top_k article words (count desc, word asc) with their language score.
+    mode="language": the top_k language words (score desc, word asc) with their article
+    count (0 if the word was never counted); freq_article is int64 in both modes.
+    """
+    if mode == "article":
+        words, counts = _as_arrays(article_counts, np.int64)
+        top = top_k_indices(counts, words, top_k)
+        top_words = words[top].tolist()
+        df = pd.DataFrame(
             {
-                "word": w,
-                "freq_article": int(article_counts[w]),
-                "freq_language": lang_ref.get(w, float("nan")),
+                "word": top_words,
+                "freq_article": counts[top],
+                "freq_language": _language_scores(lang_ref, top_words),
             }
         )
-
-    df = pd.DataFrame(rows)
+    elif mode == "language":
+        words, scores = _as_arrays(lang_ref, np.float64)
+        top = top_k_indices(scores, words, top_k)
+        top_words = words[top].tolist()
+        df = pd.DataFrame(
+            {
+                "word": top_words,
+                "freq_article": np.fromiter(
+                    map(article_counts.get, top_words, repeat(0)), dtype=np.int64, count=len(top_words)
+                ),
+                "freq_language": scores[top],
+            }
+        )
+    else:
+        raise ValueError(f"Unknown mode: {mode}")
     return RelativeFreqResult(df=df)
 
 
@@ -0,0 +1,286 @@
+from __future__ import annotations
+
+import json
+import math
+import threading
+import time
+from collections import OrderedDict
+from dataclasses import dataclass
+from http import HTTPStatus
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from typing import TYPE_CHECKING, Callable
+from urllib.parse import parse_qs, urlsplit
+
+from .fetcher import FetchResult
+from .parser import Page
+from .word_counting import CountsAccumulator, count_tokens, load_counts_for, load_top_counts
+
+if TYPE_CHECKING:
+    from .app import WikiScraperApp
+    from .language_reference import LanguageReference
+
+
+@dataclass(frozen=True)
+class CachedParse:
+    result: FetchResult
+    page: Page
+    stored_at: float
+
+
+class _KeyLoad:
+    """Per-key load lock, kept while any thread is loading or waiting for that key."""
+
+    def __init__(self) -> None:
+        self.lock = threading.Lock()
+        self.users = 0
+
+
+class ParsedPageLRU:
+    """
+    In-process LRU of parsed pages keyed by article URL. Entries older than ttl_s
+    are fetched again (through the fetcher and its disk cache); concurrent misses
+    for the same URL share one fetch + parse.
+    """
+
+    def __init__(self, max_pages: int = 256, ttl_s: float = 300.0, clock: Callable[[], float] = time.monotonic) -> None:
+        if max_pages < 1:
+            raise ValueError("max_pages must be >= 1")
+        self.max_pages = max_pages
+        self.ttl_s = ttl_s
+        self._clock = clock
+        self._entries: OrderedDict[str, CachedParse] = OrderedDict()
+        self._loading: dict[str, _KeyLoad] = {}
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+
+    def _fresh(self, key: str) -> CachedParse | None:
+        entry = self._entries.get(key)
+        if entry is None or self._clock() - entry.stored_at > self.ttl_s:
+            return None
+        self._entries.move_to_end(key)
+        return entry
+
+    def get(self, key: str, load: Callable[[], tuple[FetchResult, Page]]) -> CachedParse:
+        with self._lock:
+            entry = self._fresh(key)
+            if entry is not None:
+                self.hits += 1
+                return entry
+            key_load = self._loading.get(key)
+            if key_load is None:
+                key_load = self._loading[key] = _KeyLoad()
+            key_load.users += 1
+
+        # the key's lock is dropped only when no thread holds or waits for it, so every
+        # miss for a key (also after a failed load or an eviction) goes through one lock
+        try:
+            with key_load.lock:
+                with self._lock:
+                    entry = self._fresh(key)
+                    if entry is not None:
+                        self.hits += 1
+                        return entry
+                    self.misses += 1
+                result, page = load()
+                entry = CachedParse(result=result, page=page, stored_at=self._clock())
+                with self._lock:
+                    self._entries[key] = entry
+                    self._entries.move_to_end(key)
+                    while len(self._entries) > self.max_pages:
+                        self._entries.popitem(last=False)
+                return entry
+        finally:
+            with self._lock:
+                key_load.users -= 1
+                if key_load.users == 0:
+                    del self._loading[key]
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+
+def _json_safe(value):
+    if isinstance(value, float) and math.isnan(value):
+        return None
+    return value
+
+
+class ScraperService:
+    """
+    summary / table / count-words / relative-frequency on one warm WikiScraperApp:
+    pages stay parsed in a ParsedPageLRU, language references stay loaded, and
+    count-words requests share one CountsAccumulator (flushed before every
+    relative-frequency read and on close()).
+    """
+
+    def __init__(
+        self,
+        app: WikiScraperApp,
+        max_pages: int = 256,
+        ttl_s: float = 300.0,
+        checkpoint_pages: int = 50,
+        checkpoint_s: float = 30.0,
+    ) -> None:
+        self.app = app
+        self.pages = ParsedPageLRU(max_pages, ttl_s)
+        self.counts = CountsAccumulator(app.counts_path, flush_every_pages=checkpoint_pages, flush_every_s=checkpoint_s)
+        self._counts_lock = threading.Lock()
+        self._refs: dict[tuple[str, int], LanguageReference] = {}
+        self._refs_lock = threading.Lock()
+        self.requests = 0
+
+    def close(self) -> None:
+        with self._counts_lock:
+            self.counts.close()
+
+    def page(self, phrase: str) -> CachedParse:
+        fetcher = self.app.fetcher
+
+        def load() -> tuple[FetchResult, Page]:
+            result = fetcher.fetch_article_html(phrase)
+            return result, self.app.parser.parse(result.html)
+
+        return self.pages.get(fetcher.build_article_url(phrase), load)
+
+    def language_reference(self, lang: str = "en", n: int = 2000) -> LanguageReference:
+        from .language_reference import load_language_reference
+
+        with self._refs_lock:
+            ref = self._refs.get((lang, n))
+            if ref is None:
+                ref = self._refs[(lang, n)] = load_language_reference(lang=lang, n=n, cache_dir=self.app.cache_dir)
+        return ref
+
+    def summary(self, phrase: str) -> dict:
+        cached = self.page(phrase)
+        return {"phrase": phrase, "url": cached.result.final_url, "summary": cached.page.first_paragraph}
+
+    def table(self, phrase: str, n: int, first_row_is_header: bool = False) -> dict:
+        from .table_processing import process_table
+
+        cached = self.page(phrase)
+        table = self.app.table_extractor.extract_nth_table(cached.page, n)
+        processed = process_table(table.rows, first_row_is_header=first_row_is_header)
+        df = processed.df
+        return {
+            "phrase": phrase,
+            "url": cached.result.final_url,
+            "table": n,
+            "columns": ["row", *map(str, df.columns)],
+            "rows": [[header, *values] for header, values in zip(df.index.tolist(), df.to_numpy().tolist())],
+            "counts": [[value, int(count)] for value, count in zip(processed.counts_df["value"], processed.counts_df["count"])],
+        }
+
+    def count_words(self, phrase: str) -> dict:
+        cached = self.page(phrase)
+        page_counts = count_tokens(cached.page.text)
+        with self._counts_lock:
+            self.counts.add_counts(page_counts)
+            self.counts.maybe_flush()
+        return {"phrase": phrase, "url": cached.result.final_url, "tokens": page_counts.total()}
+
+    def relative_frequency(self, mode: str = "article", n: int = 20) -> dict:
+        from .relative_frequency import compute_relative_freq, sort_relative_df
+
+        path = self.app.counts_path
+        # loaded (once) under its own lock, not while count-words requests wait for the counts
+        lang_ref = self.language_reference()
+        with self._counts_lock:
+            if self.counts.pending_pages:
+                self.counts.flush()
+            counts = load_top_counts(path, n)
+            if mode == "language":
+                counts = load_counts_for(path, lang_ref)
+        df = sort_relative_df(compute_relative_freq(counts, lang_ref, top_k=n, mode=mode).df, mode=mode)
+        rows = [{k: _json_safe(v) for k, v in row.items()} for row in df.to_dict("records")]
+        return {"mode": mode, "n": n, "words": rows}
+
+    def stats(self) -> dict:
+        return {
+            "requests": self.requests,
+            "pages_cached": len(self.pages),
+            "page_hits": self.pages.hits,
+            "page_misses": self.pages.misses,
+            "pending_pages": self.counts.pending_pages,
+        }
+
+
+class _Handler(BaseHTTPRequestHandler):
+    server: ServiceHTTPServer
+
+    def log_message(self, format: str, *args) -> None:
+        # no per-request access log
+        pass
+
+    def _send(self, status: int, body: dict) -> None:
+        data = json.dumps(body, ensure_ascii=False).encode("utf-8")
+        self.send_response(status)
+        self.send_header("Content-Type", "application/json; charset=utf-8")
+        self.send_header("Content-Length", str(len(data)))
+        self.end_headers()
+        self.wfile.write(data)
+
+    def _params(self) -> tuple[str, dict[str, str]]:
+        parts = urlsplit(self.path)
+        params = {k: v[-1] for k, v in parse_qs(parts.query).items()}
+        length = int(self.headers.get("Content-Length") or 0)
+        if length:
+            body = json.loads(self.rfile.read(length) or b"{}")
+            if not isinstance(body, dict):
+                raise ValueError("request body must be a JSON object")
+            params.update({k: str(v) for k, v in body.items()})
+        return parts.path.rstrip("/") or "/", params
+
+    def _handle(self, method: str) -> None:
+        service = self.server.service
+        try:
+            path, params = self._params()
+            route = _ROUTES.get((method, path))
+            if route is None:
+                self._send(HTTPStatus.NOT_FOUND, {"error": f"no route for {method} {path}"})
+                return
+            with self.server.stats_lock:
+                service.requests += 1
+            self._send(HTTPStatus.OK, route(service, params))
+        except FileNotFoundError as e:
+            self._send(HTTPStatus.NOT_FOUND, {"error": str(e)})
+        except (KeyError, ValueError) as e:
+            self._send(HTTPStatus.BAD_REQUEST, {"error": str(e)})
+        except Exception as e:
+            self._send(HTTPStatus.INTERNAL_SERVER_ERROR, {"error": str(e)})
+
+    def do_GET(self) -> None:
+        self._handle("GET")
+
+    def do_POST(self) -> None:
+        self._handle("POST")
+
+
+def _flag(value: str | None) -> bool:
+    return (value or "").lower() in {"1", "true", "yes"}
+
+
+def _phrase(params: dict[str, str]) -> str:
+    phrase = params.get("phrase", "").strip()
+    if not phrase:
+        raise ValueError("missing 'phrase'")
+    return phrase
+
+
+_ROUTES: dict[tuple[str, str], Callable[[ScraperService, dict[str, str]], dict]] = {
+    ("GET", "/summary"): lambda s, p: s.summary(_phrase(p)),
+    ("GET", "/table"): lambda s, p: s.table(_phrase(p), int(p.get("n", "1")), _flag(p.get("first_row_is_header"))),
+    ("POST", "/count-words"): lambda s, p: s.count_words(_phrase(p)),
+    ("GET", "/relative-frequency"): lambda s, p: s.relative_frequency(p.get("mode", "article"), int(p.get("n", "20"))),
+    ("GET", "/stats"): lambda s, p: s.stats(),
+}
+
+
+class ServiceHTTPServer(ThreadingHTTPServer):
+    daemon_threads = True
+
+    def __init__(self, address: tuple[str, int], service: ScraperService) -> None:
+        super().__init__(address, _Handler)
+        self.service = service
+        self.stats_lock = threading.Lock()
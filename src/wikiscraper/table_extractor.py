@@ -1,8 +1,13 @@
 from __future__ import annotations
 
 from dataclasses import dataclass
+from typing import Iterator
 
-from bs4 import BeautifulSoup
+from .parser import BACKENDS, Page, as_page
+
+# HTML caps on rowspan/colspan (rowspan=0 means "to the end of the table")
+_MAX_ROWSPAN = 65534
+_MAX_COLSPAN = 1000
 
 
 @dataclass(frozen=True)
@@ -10,28 +15,85 @@ class TableData:
     rows: list[list[str]]
 
 
+def _span(value: str | None, limit: int) -> int:
+    try:
+        n = int(value) if value is not None else 1
+    except ValueError:
+        return 1
+    if n == 0 and limit == _MAX_ROWSPAN:
+        return limit
+    return min(max(n, 1), limit)
+
+
+def expand_spans(cells: list[list[tuple[str, str | None, str | None]]]) -> list[list[str]]:
+    """
+    Rectangular-ish rows from (text, rowspan, colspan) cells: a spanning cell's text
+    is repeated in every grid slot it covers, so columns line up across rows.
+    """
+    rows: list[list[str]] = []
+    pending: dict[int, list] = {}  # column -> [rows left, text] carried down by rowspan
+    for tr in cells:
+        row: list[str] = []
+
+        def carry() -> None:
+            while len(row) in pending:
+                col = len(row)
+                left, text = pending[col]
+                row.append(text)
+                if left == 1:
+                    del pending[col]
+                else:
+                    pending[col][0] = left - 1
+
+        for text, rowspan, colspan in tr:
+            carry()
+            rs = _span(rowspan, _MAX_ROWSPAN)
+            for _ in range(_span(colspan, _MAX_COLSPAN)):
+                if rs > 1:
+                    pending[len(row)] = [rs - 1, text]
+                row.append(text)
+        carry()
+        # spans reaching past this row's own cells
+        for col in sorted(c for c in pending if c > len(row)):
+            row.extend([""] * (col - len(row)))
+            carry()
+        if row:
+            rows.append(row)
+    return rows
+
+
 class TableExtractor:
-    def extract_nth_table(self, html: str, n: int) -> TableData:
+    def __init__(self, backend: str = "bs4") -> None:
+        if backend not in BACKENDS:
+            raise ValueError(f"Unknown parser backend: {backend}")
+        self.backend = backend
+
+    def extract_nth_table(self, html: str | Page, n: int) -> TableData:
         if n < 1:
             raise ValueError("Table number must be >= 1")
 
-        soup = BeautifulSoup(html, "lxml")
-        tables = soup.select("#mw-content-text table")
+        page = as_page(html, self.backend)
+        tables = page.tables
 
         if len(tables) < n:
             raise ValueError(f"Requested table {n}, but only {len(tables)} tables found.")
 
-        table = tables[n - 1]
-
-        rows: list[list[str]] = []
-        for tr in table.find_all("tr"):
-            cells = tr.find_all(["th", "td"])
-            if not cells:
-                continue
-            row = [c.get_text(" ", strip=True) for c in cells]
-            rows.append(row)
+        rows = page.table_rows(tables[n - 1])
 
         if not rows:
             raise ValueError("Extracted table is empty.")
 
-        return TableData(rows=rows)
\ No newline at end of file
+        return TableData(rows=rows)
+
+    def iter_tables(self, html: str | Page) -> Iterator[tuple[int, TableData]]:
+        """
+        (n, table) for every non-empty table of one parse, numbered like
+        extract_nth_table. A table reads only the rows of its own sections, so each
+        row is visited once, by the table it belongs to (not by enclosing ones), and
+        rowspan/colspan are expanded.
+        """
+        page = as_page(html, self.backend)
+        for n, table in enumerate(page.tables, start=1):
+            rows = expand_spans(page.table_cells(table))
+            if rows:
+                yield n, TableData(rows=rows)
@@ -0,0 +1,58 @@
+from __future__ import annotations
+
+from .csv_writer import write_csv
+from .table_extractor import TableData
+
+TABLE_FORMATS = {"csv": ".csv", "parquet": ".parquet", "arrow": ".arrow"}
+
+
+def column_names(table: TableData, first_row_is_header: bool) -> list[str]:
+    """
+    Header row (made unique, blanks filled) or col_1..col_n, as wide as the widest row.
+    """
+    width = max((len(r) for r in table.rows), default=0)
+    header = table.rows[0] if first_row_is_header and table.rows else []
+    names: list[str] = []
+    seen: set[str] = set()
+    for i in range(width):
+        name = header[i] if i < len(header) and header[i] else f"col_{i+1}"
+        base, n = name, 2
+        while name in seen:
+            name, n = f"{base}_{n}", n + 1
+        seen.add(name)
+        names.append(name)
+    return names
+
+
+def _write_columnar(path: str, table: TableData, first_row_is_header: bool, fmt: str) -> None:
+    try:
+        import pyarrow as pa
+    except ImportError as e:
+        raise RuntimeError(f"{fmt} output needs pyarrow (pip install pyarrow)") from e
+
+    names = column_names(table, first_row_is_header)
+    body = table.rows[1:] if first_row_is_header else table.rows
+    # column-major straight from the row lists, all values as strings
+    columns = [pa.array([r[i] if i < len(r) else "" for r in body], type=pa.string()) for i in range(len(names))]
+    arrow_table = pa.table(columns, names=names)
+    if fmt == "parquet":
+        import pyarrow.parquet as pq
+
+        pq.write_table(arrow_table, path)
+    else:
+        import pyarrow.feather as feather
+
+        feather.write_feather(arrow_table, path)
+
+
+def write_table(path: str, table: TableData, fmt: str = "csv", first_row_is_header: bool = False) -> None:
+    """
+    CSV keeps the extracted rows as they are (header row included); parquet/arrow
+    files get one string column per table column.
+    """
+    if fmt == "csv":
+        write_csv(path, table.rows)
+    elif fmt in TABLE_FORMATS:
+        _write_columnar(path, table, first_row_is_header, fmt)
+    else:
+        raise ValueError(f"Unknown table format: {fmt}")
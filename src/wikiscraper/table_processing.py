@@ -1,9 +1,16 @@
 from __future__ import annotations
 
+import re
 from dataclasses import dataclass
+from itertools import chain
+from typing import Iterable
 
+import numpy as np
 import pandas as pd
 
+_AXIS_LABELS = frozenset({"attacking type", "defending type", "attack", "defense"})
+_MULTIPLIER = re.compile(r".*×")
+
 
 @dataclass(frozen=True)
 class ProcessedTable:
@@ -16,6 +23,43 @@ def _pad_rows(rows: list[list[str]], pad: str = "") -> list[list[str]]:
     return [r + [pad] * (width - len(r)) for r in rows]
 
 
+def encode_cells(cells: Iterable[str]) -> tuple[np.ndarray, np.ndarray]:
+    """
+    Dictionary encoding of stripped cell values: (codes, values) with values in
+    order of first appearance. Strings are stripped once per distinct raw value,
+    not once per cell.
+    """
+    raw_codes, raw_values = pd.factorize(np.fromiter(cells, dtype=object))
+    stripped = np.fromiter((str(v).strip() for v in raw_values), dtype=object, count=len(raw_values))
+    remap, values = pd.factorize(stripped)
+    return remap[raw_codes], np.asarray(values, dtype=object)
+
+
+def count_values(cells: Iterable[str]) -> pd.DataFrame:
+    """
+    value_counts() of the non-blank stripped cells (count desc, first appearance
+    among ties). If at least half of them look like multipliers ('1×', '½×', ...)
+    only those are counted; that check runs once per distinct value.
+    """
+    codes, values = encode_cells(cells)
+    counts = np.bincount(codes, minlength=len(values))
+    keep = values != ""
+    is_multiplier = np.fromiter((_MULTIPLIER.fullmatch(v) is not None for v in values), dtype=bool, count=len(values))
+
+    total = counts[keep].sum()
+    if total > 0 and counts[keep & is_multiplier].sum() / total >= 0.5:
+        keep &= is_multiplier
+
+    kept = np.flatnonzero(keep)
+    order = kept[np.argsort(-counts[kept], kind="stable")]
+    return pd.DataFrame(
+        {
+            "value": pd.Series(values[order], dtype="str"),
+            "count": pd.Series(counts[order], dtype="int64"),
+        }
+    )
+
+
 def process_table(rows: list[list[str]], first_row_is_header: bool) -> ProcessedTable:
     """
     Assumptions from spec:
@@ -39,10 +83,7 @@ def process_table(rows: list[list[str]], first_row_is_header: bool) -> Processed
         raise ValueError("Table has no data rows after removing header row.")
 
     def is_axis_label_row(r: list[str]) -> bool:
-        first = (r[0] or "").strip().lower()
-        if first in {"attacking type", "defending type", "attack", "defense"}:
-            return True
-        return False
+        return (r[0] or "").strip().lower() in _AXIS_LABELS
 
     body = [r for r in body if not is_axis_label_row(r)]
     if not body:
@@ -61,21 +102,18 @@ def process_table(rows: list[list[str]], first_row_is_header: bool) -> Processed
 
     df = pd.DataFrame(data, index=row_headers, columns=col_headers)
 
-    flat = pd.Series(df.to_numpy().ravel())
-    flat = flat[flat.notna()]
-    flat = flat.astype(str).str.strip()
-    flat = flat[flat != ""]
+    # counted from the row lists in row-major order, no flattened object copy of df
+    counts = count_values(chain.from_iterable(data))
 
-    # Auto-detect "multiplier chart" tables (like Type Chart):
-    # if most values look like e.g. '1×', '½×', '2×', '0×' -> count only those
-    is_multiplier = flat.str.fullmatch(r".*×")
-    if len(flat) > 0 and (is_multiplier.mean() >= 0.5):
-        flat = flat[is_multiplier]
+    return ProcessedTable(df=df, counts_df=counts)
 
-    counts = flat.value_counts().reset_index()
-    counts.columns = ["value", "count"]
 
-    return ProcessedTable(df=df, counts_df=counts)
+def write_table_csv(df: pd.DataFrame, path: str) -> None:
+    """
+    Same file as dataframe_to_csv_rows(df).to_csv(path, index=False), written
+    straight from df (the row headers become the "row" column).
+    """
+    df.to_csv(path, index_label="row")
 
 
 def dataframe_to_csv_rows(df: pd.DataFrame) -> pd.DataFrame:
@@ -85,4 +123,4 @@ def dataframe_to_csv_rows(df: pd.DataFrame) -> pd.DataFrame:
     out = df.copy()
     out.insert(0, "row", out.index)
     out.reset_index(drop=True, inplace=True)
-    return out
\ No newline at end of file
+    return out
@@ -1,9 +1,48 @@
 from __future__ import annotations
 
+import os
 import re
+import tempfile
+from pathlib import Path
 
 
 def sanitize_filename(name: str) -> str:
     name = name.strip().replace(" ", "_")
     name = re.sub(r"[^A-Za-z0-9_\-]+", "", name)
-    return name or "output"
\ No newline at end of file
+    return name or "output"
+
+
+def _read_umask() -> int:
+    # the umask can only be read by setting it; done once, at import
+    mask = os.umask(0)
+    os.umask(mask)
+    return mask
+
+
+_UMASK = _read_umask()
+
+
+def atomic_write_bytes(path: str | Path, data: bytes) -> None:
+    """
+    Writes to a temp file in the same directory and renames it over `path`,
+    so readers never see a half-written file. The data is fsynced before the
+    rename (a crash leaves the old or the new content, never an empty file), and
+    the file keeps the mode of the one it replaces, or gets the umask default
+    (mkstemp creates 0600).
+    """
+    p = Path(path)
+    try:
+        mode = p.stat().st_mode & 0o7777
+    except FileNotFoundError:
+        mode = 0o666 & ~_UMASK
+    fd, tmp = tempfile.mkstemp(dir=p.parent, prefix=f".{p.name}.", suffix=".tmp")
+    try:
+        with os.fdopen(fd, "wb") as f:
+            f.write(data)
+            f.flush()
+            os.fsync(f.fileno())
+        os.chmod(tmp, mode)
+        os.replace(tmp, p)
+    except BaseException:
+        Path(tmp).unlink(missing_ok=True)
+        raise
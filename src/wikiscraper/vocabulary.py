@@ -0,0 +1,80 @@
+from __future__ import annotations
+
+from itertools import filterfalse
+from typing import Dict, Iterable, Mapping
+
+import numpy as np
+
+
+class Vocabulary:
+    """
+    Interned token -> integer id map with one int64 count per id.
+
+    Each distinct word is stored once; counts live in a NumPy array and are merged
+    with np.add.at, so a large corpus costs 8 bytes per word instead of a Python
+    int per dict entry. New words are found and numbered with C-level iteration
+    (filterfalse / map over dict methods), not a per-token Python loop.
+    to_dict() gives the plain {word: count} view used everywhere else.
+    """
+
+    def __init__(self) -> None:
+        self._ids: Dict[str, int] = {}
+        self._words: list[str] = []
+        self._counts = np.zeros(1024, dtype=np.int64)
+
+    def __len__(self) -> int:
+        return len(self._words)
+
+    def __contains__(self, word: object) -> bool:
+        return word in self._ids
+
+    @property
+    def words(self) -> list[str]:
+        """Words by id."""
+        return self._words
+
+    @property
+    def counts(self) -> np.ndarray:
+        """Counts by id (a view; zero for words not counted since the last clear())."""
+        return self._counts[: len(self._words)]
+
+    def intern(self, words: Iterable[str]) -> np.ndarray:
+        """Ids of `words` (in order), adding words seen for the first time."""
+        if not isinstance(words, (list, tuple, dict)):
+            words = list(words)
+        ids = self._ids
+        new = list(dict.fromkeys(filterfalse(ids.__contains__, words)))
+        if new:
+            start = len(self._words)
+            ids.update(zip(new, range(start, start + len(new))))
+            self._words.extend(new)
+            if len(self._words) > len(self._counts):
+                grown = np.zeros(max(len(self._words), 2 * len(self._counts)), dtype=np.int64)
+                grown[: len(self._counts)] = self._counts
+                self._counts = grown
+        return np.fromiter(map(ids.__getitem__, words), dtype=np.intp, count=len(words))
+
+    def add(self, tokens: Iterable[str]) -> None:
+        """Counts one occurrence per token."""
+        self.add_ids(self.intern(tokens))
+
+    def add_ids(self, ids: np.ndarray, counts: np.ndarray | int = 1) -> None:
+        np.add.at(self._counts, ids, counts)
+
+    def add_counts(self, counts: Mapping[str, int]) -> None:
+        ids = self.intern(counts)
+        self.add_ids(ids, np.fromiter(counts.values(), dtype=np.int64, count=len(counts)))
+
+    def total(self) -> int:
+        return int(self.counts.sum())
+
+    def clear(self) -> None:
+        """Zeroes all counts; ids stay assigned."""
+        self._counts[:] = 0
+
+    def to_dict(self) -> Dict[str, int]:
+        """{word: count} for words with a non-zero count."""
+        counts = self.counts
+        nz = np.flatnonzero(counts)
+        words = self._words
+        return dict(zip(map(words.__getitem__, nz.tolist()), counts[nz].tolist()))
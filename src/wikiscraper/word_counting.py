@@ -1,50 +1,227 @@
 from __future__ import annotations
 
-import json
 import re
-from pathlib import Path
-from typing import Dict
+import time
+from collections import Counter
+from typing import TYPE_CHECKING, Callable, Dict, Iterable, Iterator, Mapping
 import unicodedata
 
+from .counts_store import Journal, open_counts_store
+
+if TYPE_CHECKING:
+    from .vocabulary import Vocabulary
+
 
 _word_re = re.compile(r"[^\W\d_]+(?:'[^\W\d_]+)?", re.UNICODE)
 
+# _word_re without the single-letter matches that tokenize() drops ("s", "a"):
+# a lone letter only matches when an apostrophe part follows
+_token_re = re.compile(r"[^\W\d_]{2,}(?:'[^\W\d_]+)?|[^\W\d_]'[^\W\d_]+", re.UNICODE)
+
+# "İ" is the only character whose lowercase is longer than itself ("i̇"), so a single
+# "İ" is still a 2-character token after lowercasing; "Σ" is the only one lowercased
+# by context (σ / final ς). Text without both can be lowercased as a whole, before matching.
+_DOTTED_CAPITAL_I = "\u0130"
+_CAPITAL_SIGMA = "\u03a3"
+
 
 def _normalize(text: str) -> str:
-    # Normalize unicode to reduce weird splits
+    # Normalize unicode to reduce weird splits (ASCII / already normalized text is kept as is)
+    if text.isascii() or unicodedata.is_normalized("NFKC", text):
+        return text
     return unicodedata.normalize("NFKC", text)
 
 
+def _lower_first(text: str) -> bool:
+    return text.isascii() or (_DOTTED_CAPITAL_I not in text and _CAPITAL_SIGMA not in text)
+
+
+def iter_tokens(text: str) -> Iterator[str]:
+    """
+    Lazily yields the tokens of tokenize(text), in the same order.
+    """
+    text = _normalize(text)
+    if _lower_first(text):
+        return map(re.Match.group, _token_re.finditer(text.lower()))
+    if _DOTTED_CAPITAL_I not in text:
+        return (m.group().lower() for m in _token_re.finditer(text))
+    return (t for t in (m.group().lower() for m in _word_re.finditer(text)) if len(t) >= 2)
+
+
 def tokenize(text: str) -> list[str]:
     text = _normalize(text)
+    if _lower_first(text):
+        return _token_re.findall(text.lower())
+    if _DOTTED_CAPITAL_I not in text:
+        return list(map(str.lower, _token_re.findall(text)))
     toks = [m.group(0).lower() for m in _word_re.finditer(text)]
     # drop 1-letter tokens like "s"
     toks = [t for t in toks if len(t) >= 2]
     return toks
 
 
+def count_tokens(text: str) -> Counter[str]:
+    """
+    Counter(tokenize(text)), counted straight from the match stream (iter_tokens),
+    so the token list of a large page is never built.
+    """
+    return Counter(iter_tokens(text))
+
+
+def count_tokens_batch(texts: Iterable[str]) -> Counter[str]:
+    """
+    Counts the tokens of many documents in one pass. Documents are joined with a
+    newline, which no token can span, so this equals summing count_tokens() per text.
+    """
+    return count_tokens("\n".join(texts))
+
+
 def load_counts(path: str) -> Dict[str, int]:
-    p = Path(path)
-    if not p.exists():
-        return {}
-    data = json.loads(p.read_text(encoding="utf-8"))
+    store = open_counts_store(path)
+    try:
+        return store.load()
+    finally:
+        store.close()
 
-    out: Dict[str, int] = {}
 
-    for k, v in data.items():
-        if isinstance(k, str) and isinstance(v, int):
-            out[k] = v
-    return out
+def load_top_counts(path: str, k: int) -> Dict[str, int]:
+    """The k most frequent words (count desc, word asc); SQLite reads only those rows."""
+    store = open_counts_store(path)
+    try:
+        return dict(store.top_k(k))
+    finally:
+        store.close()
+
+
+def load_counts_for(path: str, words: Iterable[str]) -> Dict[str, int]:
+    """Counts of the given words only (missing words are left out)."""
+    store = open_counts_store(path)
+    try:
+        return store.get_many(words)
+    finally:
+        store.close()
 
 
 def save_counts(path: str, counts: Dict[str, int]) -> None:
-    p = Path(path)
-    p.write_text(json.dumps(counts, ensure_ascii=False, indent=2, sort_keys=True), encoding="utf-8")
+    """
+    Writes counts atomically (temp file + rename, or one SQLite transaction),
+    so a crash never leaves a half-written file.
+    """
+    store = open_counts_store(path)
+    try:
+        store.replace(counts)
+    finally:
+        store.close()
+
+
+def counts_digest(path: str) -> str:
+    store = open_counts_store(path)
+    store.close()
+    return store.digest
+
+
+def add_counts_to_file(path: str, page_counts: Mapping[str, int]) -> None:
+    """
+    Adds one page's counts to the store (what a CountsAccumulator closed after a
+    single page writes, without building a Vocabulary, so NumPy is not imported).
+    """
+    store = open_counts_store(path)
+    try:
+        store.update(dict(page_counts))
+    finally:
+        store.close()
 
 
 def update_counts_file(path: str, tokens: list[str]) -> Dict[str, int]:
+    from .vocabulary import Vocabulary
+
     counts = load_counts(path)
-    for tok in tokens:
-        counts[tok] = counts.get(tok, 0) + 1
+    page = Vocabulary()
+    page.add(tokens)
+    for tok, n in page.to_dict().items():
+        counts[tok] = counts.get(tok, 0) + n
     save_counts(path, counts)
-    return counts
\ No newline at end of file
+    return counts
+
+
+class CountsAccumulator:
+    """
+    Keeps word counts in memory and writes them to `path` on a checkpoint policy:
+    every `flush_every_pages` pages, every `flush_every_s` seconds, or on close().
+
+    `pending` holds the counts added since the last flush (a Vocabulary, so words
+    repeated across pages are stored once) and `digest` identifies
+    the stored content, so a caller can journal a checkpoint before it is
+    committed (see flush()). The store format follows the file extension
+    (see counts_store); only the SQLite store avoids loading the whole vocabulary.
+    """
+
+    def __init__(
+        self,
+        path: str,
+        flush_every_pages: int = 50,
+        flush_every_s: float = 30.0,
+        clock: Callable[[], float] = time.monotonic,
+    ) -> None:
+        if flush_every_pages < 1:
+            raise ValueError("flush_every_pages must be >= 1")
+        self.path = path
+        self.flush_every_pages = flush_every_pages
+        self.flush_every_s = flush_every_s
+        self._clock = clock
+        from .vocabulary import Vocabulary
+
+        self.store = open_counts_store(path)
+        self.pending: Vocabulary = Vocabulary()
+        self.pending_pages = 0
+        self.flushes = 0
+        self._last_flush = clock()
+
+    @property
+    def digest(self) -> str:
+        return self.store.digest
+
+    def add(self, tokens: Iterable[str]) -> None:
+        self.pending.add(tokens)
+        self.pending_pages += 1
+
+    def add_counts(self, page_counts: Mapping[str, int]) -> None:
+        self.pending.add_counts(page_counts)
+        self.pending_pages += 1
+
+    def due(self) -> bool:
+        if self.pending_pages == 0:
+            return False
+        if self.pending_pages >= self.flush_every_pages:
+            return True
+        return self._clock() - self._last_flush >= self.flush_every_s
+
+    def maybe_flush(self, journal: Journal | None = None) -> bool:
+        if not self.due():
+            return False
+        self.flush(journal)
+        return True
+
+    def flush(self, journal: Journal | None = None) -> None:
+        """
+        Writes counts atomically. If given, journal(digest_before, digest_after, pending)
+        is called before the store is updated.
+        """
+        self.store.update(self.pending.to_dict(), journal)
+        self.pending.clear()
+        self.pending_pages = 0
+        self.flushes += 1
+        self._last_flush = self._clock()
+
+    def close(self, journal: Journal | None = None) -> None:
+        try:
+            if self.pending_pages:
+                self.flush(journal)
+        finally:
+            self.store.close()
+
+    def __enter__(self) -> CountsAccumulator:
+        return self
+
+    def __exit__(self, *exc) -> None:
+        self.close()
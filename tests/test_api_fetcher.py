@@ -0,0 +1,156 @@
+import json
+import threading
+import urllib.parse
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+import pytest
+
+from src.wikiscraper.api_fetcher import ApiFetcher
+from src.wikiscraper.crawler import WikiCrawler
+from src.wikiscraper.fetcher import PageFetcher
+from src.wikiscraper.parser import ArticleParser
+from src.wikiscraper.word_counting import load_counts
+from wiki_pages import article_body
+
+
+ARTICLES = {
+    "Start": article_body("start page", ["A", "B_redirect", "Missing", "c", "Mr._Mime_(Pok%C3%A9mon)"]),
+    "A": article_body("alpha words", ["B", "D", "Start"]),
+    "B": article_body("beta words", ["A"]),
+    "C": article_body("gamma words", ["D"]),
+    "D": article_body("delta", []),
+    "Mr. Mime (Pokémon)": article_body("mime & co", ["A"]),
+}
+REDIRECTS = {"B redirect": "B"}
+
+
+def _canonical(title: str) -> str:
+    name = title.replace("_", " ").strip()
+    name = name[:1].upper() + name[1:]
+    return REDIRECTS.get(name, name)
+
+
+class WikiHandler(BaseHTTPRequestHandler):
+    """Serves /wiki/<title> like the rendered site and api.php action=parse like MediaWiki (formatversion=2)."""
+
+    server: "WikiServer"
+
+    def do_GET(self):
+        url = urllib.parse.urlsplit(self.path)
+        with self.server.lock:
+            self.server.requests.append(self.path)
+            flaky = self.server.fail_next > 0
+            self.server.fail_next -= flaky
+        if flaky:
+            self._send(503, "text/plain", "busy")
+        elif url.path == "/w/api.php":
+            params = dict(urllib.parse.parse_qsl(url.query))
+            assert params["action"] == "parse" and params["format"] == "json"
+            name = _canonical(params["page"])
+            if name not in ARTICLES:
+                data = {"error": {"code": "missingtitle", "info": "The page you specified doesn't exist."}}
+            else:
+                data = {"parse": {"title": name, "text": ARTICLES[name]}}
+            self._send(200, "application/json", json.dumps(data))
+        else:
+            name = _canonical(urllib.parse.unquote(url.path[len("/wiki/") :]))
+            if name not in ARTICLES:
+                self._send(404, "text/html", "<p>no such page</p>")
+            else:
+                self._send(200, "text/html", f'<html><div id="mw-content-text">{ARTICLES[name]}</div></html>')
+
+    def _send(self, status: int, content_type: str, text: str) -> None:
+        body = text.encode("utf-8")
+        self.send_response(status)
+        self.send_header("Content-Type", f"{content_type}; charset=utf-8")
+        self.send_header("Content-Length", str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def log_message(self, *args):
+        pass
+
+
+class WikiServer(ThreadingHTTPServer):
+    def __init__(self):
+        super().__init__(("127.0.0.1", 0), WikiHandler)
+        self.lock = threading.Lock()
+        self.requests: list[str] = []
+        self.fail_next = 0
+
+    @property
+    def url(self) -> str:
+        return f"http://127.0.0.1:{self.server_address[1]}"
+
+
+@pytest.fixture
+def wiki():
+    server = WikiServer()
+    thread = threading.Thread(target=server.serve_forever, daemon=True)
+    thread.start()
+    yield server
+    server.shutdown()
+    server.server_close()
+
+
+def _api_fetcher(wiki: WikiServer) -> ApiFetcher:
+    return ApiFetcher(f"{wiki.url}/w/api.php", f"{wiki.url}/wiki/", sleep=lambda s: None)
+
+
+def test_api_fetch_follows_redirects_in_one_request_per_title(wiki):
+    fetcher = _api_fetcher(wiki)
+    results = []
+    for title in ["c", "B_redirect", "Mr._Mime_(Pokémon)", "Missing"]:
+        try:
+            results.append(fetcher.fetch_article_html(title))
+        except FileNotFoundError:
+            results.append(None)
+
+    assert [r.final_url if r else None for r in results] == [
+        f"{wiki.url}/wiki/C",
+        f"{wiki.url}/wiki/B",
+        f"{wiki.url}/wiki/Mr._Mime_(Pok%C3%A9mon)",
+        None,
+    ]
+    assert 'id="mw-content-text"' in results[0].html and "mime & co" in results[2].html
+    pages = [dict(urllib.parse.parse_qsl(urllib.parse.urlsplit(p).query))["page"] for p in wiki.requests]
+    assert pages == ["c", "B_redirect", "Mr._Mime_(Pokémon)", "Missing"]
+
+
+def test_api_fetch_retries_and_charges_the_limiter_per_request_sent(wiki):
+    class CountingLimiter:
+        acquired = 0
+
+        def acquire(self):
+            self.acquired += 1
+
+    fetcher = _api_fetcher(wiki)
+    fetcher.limiter = CountingLimiter()
+    wiki.fail_next = 2
+    assert "alpha words" in fetcher.fetch_article_html("A").html
+    assert len(wiki.requests) == 3
+    assert fetcher.limiter.acquired == 3
+    assert fetcher.connection_stats().retries == 2
+
+
+def test_api_crawl_matches_html_crawl_with_the_same_requests(wiki, tmp_path):
+    results = []
+    sent = []
+    for name in ("html", "api"):
+        if name == "html":
+            fetcher = PageFetcher(f"{wiki.url}/wiki/", sleep=lambda s: None)
+        else:
+            fetcher = _api_fetcher(wiki)
+        wiki.requests.clear()
+        path = tmp_path / f"{name}.json"
+        crawler = WikiCrawler(fetcher, ArticleParser())
+        stats = crawler.auto_count_words(
+            "Start", max_depth=2, wait_s=0.0, rate=1000.0, burst=100, max_pages=50, counts_path=str(path), workers=2
+        )
+        results.append(((stats.pages_visited, stats.tokens_added, stats.unique_pages), load_counts(str(path))))
+        sent.append(len(wiki.requests))
+        fetcher.close()
+
+    assert results[0] == results[1]
+    assert results[0][0][0] == 7  # B is visited under two titles
+    assert sent[0] == sent[1] == 8  # one request per title, the missing one included
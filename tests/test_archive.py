@@ -0,0 +1,88 @@
+import pytest
+
+from src.wikiscraper.archive import (
+    PackedArchive,
+    archive_key,
+    iter_archive_pages,
+    iter_cache_pages,
+    open_archive,
+    pack_archive,
+)
+from src.wikiscraper.archive_fetcher import ArchiveFetcher
+from src.wikiscraper.crawler import WikiCrawler
+from src.wikiscraper.page_cache import PageCache
+from src.wikiscraper.parser import ArticleParser
+from src.wikiscraper.word_counting import load_counts
+from wiki_pages import article_page
+
+BASE = "https://example.org/wiki/"
+
+
+def _snapshot(tmp_path):
+    root = tmp_path / "pages"
+    root.mkdir()
+    (root / "Start.html").write_text(article_page("start páge", ["Pok%C3%A9mon_(x)", "B", "Missing"]), encoding="utf-8")
+    (root / "Pok%C3%A9mon_(x).html").write_text(article_page("pokémon words", ["B"]), encoding="utf-8")
+    (root / "B.html").write_text(article_page("beta words", ["Start"]), encoding="utf-8")
+    (root / "b_copy.html").write_text(article_page("beta words", ["Start"]), encoding="utf-8")
+    (root / "notes.txt").write_text("not a page", encoding="utf-8")
+    return root
+
+
+def test_archive_key():
+    assert archive_key("pikachu (Pokémon)") == archive_key("Pikachu_%28Pok%C3%A9mon%29") == "Pikachu_(Pokémon)"
+    assert archive_key(" _ ") == ""
+
+
+def test_directory_and_packed_archives_agree(tmp_path):
+    directory = open_archive(_snapshot(tmp_path))
+    assert sorted(directory.keys()) == ["B", "B_copy", "Pokémon_(x)", "Start"]
+
+    count, size = pack_archive(iter_archive_pages(directory), tmp_path / "snap.wsarc")
+    packed = open_archive(tmp_path / "snap.wsarc")
+    assert isinstance(packed, PackedArchive) and count == len(packed) == 4
+    assert (tmp_path / "snap.wsarc").stat().st_size == size
+    for key in directory.keys():
+        assert packed.get(key) == directory.get(key)
+    assert packed.get("Missing") is None
+    # identical bodies are stored once
+    assert packed._pages["B"][:2] == packed._pages["B_copy"][:2]
+    packed.close()
+
+    (tmp_path / "bad.wsarc").write_bytes(b"<html></html>")
+    with pytest.raises(ValueError):
+        open_archive(tmp_path / "bad.wsarc")
+    with pytest.raises(FileNotFoundError):
+        open_archive(tmp_path / "nope")
+
+
+def test_crawl_from_archive(tmp_path):
+    root = _snapshot(tmp_path)
+    pack_archive(iter_archive_pages(open_archive(root)), tmp_path / "snap.wsarc")
+
+    results = []
+    for source in (root, tmp_path / "snap.wsarc"):
+        fetcher = ArchiveFetcher(open_archive(source), BASE)
+        counts_path = tmp_path / f"counts-{source.name}.json"
+        stats = WikiCrawler(fetcher, ArticleParser()).auto_count_words(
+            "Start", max_depth=3, wait_s=0.0, max_pages=50, counts_path=str(counts_path), workers=2
+        )
+        assert fetcher.connection_stats().requests == 4
+        assert fetcher.fetch_article_html("B").final_url == BASE + "B"
+        fetcher.close()
+        results.append((stats.pages_visited, load_counts(str(counts_path))))
+
+    assert results[0] == results[1]
+    assert results[0][0] == 3 and results[0][1]["words"] == 2
+
+
+def test_pack_from_page_cache(tmp_path):
+    cache = PageCache(str(tmp_path / "cache"))
+    cache.put(BASE + "Pikachu", final_url=BASE + "Pikachu_(Pok%C3%A9mon)", html="<p>pika</p>")
+    cache.put("https://example.org/w/api.php?action=parse&page=X", final_url="x", html="{}")
+
+    pack_archive(iter_cache_pages(cache, BASE), tmp_path / "cache.wsarc")
+    packed = open_archive(tmp_path / "cache.wsarc")
+    assert list(packed.keys()) == ["Pikachu"]
+    assert packed.get("Pikachu") == (BASE + "Pikachu_(Pok%C3%A9mon)", "<p>pika</p>")
+    packed.close()
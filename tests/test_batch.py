@@ -0,0 +1,69 @@
+import json
+
+from src.wikiscraper.app import WikiScraperApp
+from src.wikiscraper.cli import parse_args
+from src.wikiscraper.word_counting import load_counts
+
+PAGE = """
+<div id="mw-content-text"><p>Pikachu is an Electric-type Pokémon introduced in Generation I.</p>
+<table><tr><th>Type</th><th>Normal</th></tr><tr><td>Fire</td><td>2×</td></tr></table></div>
+"""
+
+
+def test_batch_runs_manifest_in_order_with_shared_counts(tmp_path, monkeypatch, capsys):
+    page = tmp_path / "page.html"
+    page.write_text(PAGE, encoding="utf-8")
+    manifest = tmp_path / "manifest.txt"
+    lines = [f'"Pikachu {i}" --count-words --html-file {page}' for i in range(6)]
+    lines += ["# comment", "", f"Pikachu --summary --html-file {page}", "Pikachu --table", f"Type --table 1 --html-file {page}"]
+    manifest.write_text("\n".join(lines) + "\n", encoding="utf-8")
+    monkeypatch.chdir(tmp_path)
+
+    args = parse_args(["--batch", str(manifest), "--workers", "3", "--no-cache", "--counts-file", "counts.json"])
+    assert WikiScraperApp().run(args) == 1
+
+    records = [json.loads(line) for line in capsys.readouterr().out.splitlines()]
+    assert [r["line"] for r in records] == [1, 2, 3, 4, 5, 6, 9, 10, 11]
+    assert [r["exit_code"] for r in records] == [0] * 7 + [2, 0]
+    assert records[6]["output"].startswith("Pikachu is an Electric-type")
+    assert "Saved table 1" in records[8]["output"]
+
+    assert load_counts("counts.json")["pikachu"] == 6
+
+
+def test_batch_flushes_sqlite_counts_from_workers(tmp_path, monkeypatch, capsys):
+    page = tmp_path / "page.html"
+    page.write_text(PAGE, encoding="utf-8")
+    manifest = tmp_path / "manifest.txt"
+    manifest.write_text("".join(f'"P{i}" --count-words --html-file {page}\n' for i in range(4)), encoding="utf-8")
+    monkeypatch.chdir(tmp_path)
+
+    args = parse_args(
+        ["--batch", str(manifest), "--workers", "2", "--no-cache", "--counts-file", "c.sqlite", "--checkpoint-pages", "1"]
+    )
+    assert WikiScraperApp().run(args) == 0
+
+    records = [json.loads(line) for line in capsys.readouterr().out.splitlines()]
+    assert [r["exit_code"] for r in records] == [0] * 4
+    assert load_counts("c.sqlite")["pikachu"] == 4
+
+
+def test_batch_rejects_items_with_process_wide_options(tmp_path, monkeypatch, capsys):
+    page = tmp_path / "page.html"
+    page.write_text(PAGE, encoding="utf-8")
+    manifest = tmp_path / "manifest.txt"
+    lines = [
+        f"Pikachu --count-words --html-file {page} --counts-file other.json",
+        f"Pikachu --summary --html-file {page} --parser-backend lxml --no-cache",
+        f"Type --table 1 --first-row-is-header --table-format csv --html-file {page}",
+    ]
+    manifest.write_text("\n".join(lines) + "\n", encoding="utf-8")
+    monkeypatch.chdir(tmp_path)
+
+    assert WikiScraperApp().run(parse_args(["--batch", str(manifest), "--counts-file", "counts.json"])) == 1
+
+    records = [json.loads(line) for line in capsys.readouterr().out.splitlines()]
+    assert [r["exit_code"] for r in records] == [2, 2, 0]
+    assert records[0]["output"].rstrip().endswith(": --counts-file")
+    assert records[1]["output"].rstrip().endswith(": --parser-backend, --no-cache")
+    assert not (tmp_path / "other.json").exists()
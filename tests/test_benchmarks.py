@@ -0,0 +1,29 @@
+import json
+
+from benchmarks import suite
+
+
+def test_suite_run_writes_json_and_compare_flags_regressions(tmp_path, monkeypatch, capsys):
+    monkeypatch.chdir(tmp_path)  # no data/ fixtures: the seeded synthetic page is used
+    assert suite.main(["run", "--quick", "--repeat", "1", "--out", "current.json"]) == 0
+
+    report = json.loads((tmp_path / "current.json").read_text(encoding="utf-8"))
+    assert report["format"] == suite.FORMAT_VERSION
+    results = report["results"]
+    assert {"tokenize/pikachu-synthetic", "counts/update_counts_file/1000", "relative_freq/language/10000"} <= results.keys()
+    assert all(r["runs"] == 1 and r["best_s"] > 0 for r in results.values())
+
+    assert suite.main(["compare", "current.json", "current.json"]) == 0
+
+    # a baseline 10x faster on one benchmark, and one benchmark the current run does not have
+    baseline = json.loads(json.dumps(report))
+    baseline["results"]["tokenize/pikachu-synthetic"]["best_s"] /= 10
+    baseline["results"]["retired/bench"] = {"best_s": 1.0, "median_s": 1.0, "runs": 1}
+    (tmp_path / "baseline.json").write_text(json.dumps(baseline), encoding="utf-8")
+    capsys.readouterr()
+    assert suite.main(["compare", "baseline.json", "current.json", "--min-ms", "0"]) == 1
+
+    out = capsys.readouterr().out
+    regressions = [line.split()[0] for line in out.splitlines() if line.endswith("REGRESSION")]
+    assert regressions == ["tokenize/pikachu-synthetic"]
+    assert "only in baseline" in out and "1 regression(s)" in out
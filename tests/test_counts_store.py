@@ -0,0 +1,85 @@
+import pytest
+
+from src.wikiscraper.counts_store import MISSING_DIGEST, convert_counts, open_counts_store
+from src.wikiscraper.word_counting import CountsAccumulator, load_counts, load_top_counts
+
+
+@pytest.mark.parametrize("name", ["counts.json", "counts.msgpack", "counts.sqlite"])
+def test_store_upserts_and_top_k(tmp_path, name):
+    path = str(tmp_path / name)
+    journal = []
+    with CountsAccumulator(path) as acc:
+        assert acc.digest == MISSING_DIGEST
+        acc.add(["b", "a", "b", "c"])
+        acc.flush(lambda *args: journal.append(args))
+        acc.add(["c", "d", "c"])
+
+    assert load_counts(path) == {"a": 1, "b": 2, "c": 3, "d": 1}
+    assert load_top_counts(path, 3) == {"c": 3, "b": 2, "a": 1}
+    assert list(load_top_counts(path, 3)) == ["c", "b", "a"]  # count desc, word asc
+    before, after, pending = journal[0]
+    assert before == MISSING_DIGEST
+    assert pending == {"a": 1, "b": 2, "c": 1}
+    assert open_counts_store(path).digest not in (before, after)  # changed again at close
+
+
+def test_convert_counts_roundtrip(tmp_path):
+    src = str(tmp_path / "word-counts.json")
+    with CountsAccumulator(src) as acc:
+        acc.add(["pikachu", "pikachu", "raichu"])
+
+    assert convert_counts(src, str(tmp_path / "w.sqlite")) == 2
+    assert convert_counts(str(tmp_path / "w.sqlite"), str(tmp_path / "w.msgpack")) == 2
+    convert_counts(str(tmp_path / "w.msgpack"), str(tmp_path / "back.json"))
+    assert (tmp_path / "back.json").read_bytes() == (tmp_path / "word-counts.json").read_bytes()
+
+
+def test_failed_journal_does_not_apply_counts_twice(tmp_path):
+    path = str(tmp_path / "counts.json")
+    acc = CountsAccumulator(path)
+    acc.add(["a"])
+
+    def failing(*args):
+        raise OSError("disk full")
+
+    with pytest.raises(OSError):
+        acc.flush(failing)
+    acc.close()
+    assert load_counts(path) == {"a": 1}
+
+
+def test_sqlite_store_flushed_from_worker_thread(tmp_path):
+    import threading
+
+    path = str(tmp_path / "counts.sqlite")
+    acc = CountsAccumulator(path, flush_every_pages=1)
+    acc.add(["a", "b"])
+    acc.flush()  # connection opened on this thread
+    errors = []
+    lock = threading.Lock()  # the accumulator itself is guarded by its owner, as in app.py
+
+    def worker() -> None:
+        try:
+            for _ in range(20):
+                with lock:
+                    acc.add(["a"])
+                    acc.maybe_flush()
+        except Exception as e:
+            errors.append(e)
+
+    threads = [threading.Thread(target=worker) for _ in range(4)]
+    for t in threads:
+        t.start()
+    for t in threads:
+        t.join()
+    acc.close()
+
+    assert errors == []
+    assert load_counts(path) == {"a": 81, "b": 1}
+
+
+def test_file_store_base_class_is_abstract(tmp_path):
+    from src.wikiscraper.counts_store import FileCountsStore
+
+    with pytest.raises(TypeError):
+        FileCountsStore(str(tmp_path / "counts.bin"))
@@ -0,0 +1,226 @@
+import pytest
+
+from src.wikiscraper.crawl_state import Checkpoint, CrawlJournal
+from src.wikiscraper.crawler import WikiCrawler
+from src.wikiscraper.fetcher import FetchResult
+from src.wikiscraper.parser import ArticleParser
+from src.wikiscraper.rate_limit import TokenBucket
+from src.wikiscraper.word_counting import CountsAccumulator, load_counts, save_counts
+from wiki_pages import article_page
+
+
+PAGES = {
+    "Start": article_page("start page", ["A", "B", "Missing", "C"]),
+    "A": article_page("alpha words", ["B", "D", "Start"]),
+    "B": article_page("beta words", ["E", "A"]),
+    "C": article_page("gamma words", ["F"]),
+    "D": article_page("delta", []),
+    "E": article_page("epsilon", []),
+    "F": article_page("zeta", []),
+}
+
+
+class FakeFetcher:
+    def fetch_article_html(self, title: str) -> FetchResult:
+        if title not in PAGES:
+            raise FileNotFoundError(title)
+        return FetchResult(final_url=title, html=PAGES[title])
+
+
+def _crawl(tmp_path, workers: int, max_pages: int, parse_workers: int = 0):
+    path = tmp_path / f"counts-{workers}-{max_pages}-{parse_workers}.json"
+    crawler = WikiCrawler(FakeFetcher(), ArticleParser())
+    stats = crawler.auto_count_words(
+        "Start",
+        max_depth=2,
+        wait_s=0.0,
+        max_pages=max_pages,
+        counts_path=str(path),
+        workers=workers,
+        parse_workers=parse_workers,
+    )
+    return _core(stats), load_counts(str(path))
+
+
+def _core(stats):
+    return stats.pages_visited, stats.tokens_added, stats.unique_pages
+
+
+def test_concurrent_crawl_matches_serial(tmp_path):
+    for max_pages in (1, 3, 50):
+        serial = _crawl(tmp_path, workers=1, max_pages=max_pages)
+        concurrent = _crawl(tmp_path, workers=4, max_pages=max_pages)
+        assert serial == concurrent
+
+    assert concurrent == _crawl(tmp_path, workers=3, max_pages=50, parse_workers=2)
+    (pages_visited, _, unique_pages), _ = concurrent
+    assert pages_visited == 7
+    assert unique_pages == 8  # includes the 404 title
+
+
+def test_token_bucket_waits_for_refill():
+    now = [0.0]
+    sleeps: list[float] = []
+
+    def sleep(s: float) -> None:
+        sleeps.append(s)
+        now[0] += s
+
+    bucket = TokenBucket(rate=2.0, burst=1, clock=lambda: now[0], sleep=sleep)
+    bucket.acquire()
+    bucket.acquire()
+    assert sleeps == [0.5]
+    assert not bucket.try_acquire()
+
+
+class FlakyFetcher(FakeFetcher):
+    def __init__(self, fail_on: str) -> None:
+        self.fail_on = fail_on
+
+    def fetch_article_html(self, title: str) -> FetchResult:
+        if title == self.fail_on:
+            raise ConnectionError("network lost")
+        return super().fetch_article_html(title)
+
+
+def test_interrupted_crawl_resumes_where_it_stopped(tmp_path):
+    expected = _crawl(tmp_path, workers=1, max_pages=50)
+
+    path = tmp_path / "counts.json"
+    state = tmp_path / "state.json"
+    kwargs = dict(max_depth=2, wait_s=0.0, max_pages=50, counts_path=str(path), state_path=str(state))
+
+    crawler = WikiCrawler(FlakyFetcher(fail_on="D"), ArticleParser())
+    with pytest.raises(ConnectionError):
+        crawler.auto_count_words("Start", checkpoint_pages=2, workers=2, **kwargs)
+    assert state.exists()
+
+    crawler = WikiCrawler(FakeFetcher(), ArticleParser())
+    stats = crawler.auto_count_words("ignored", resume=True, **kwargs)
+
+    assert (_core(stats), load_counts(str(path))) == expected
+    assert not state.exists()
+
+
+@pytest.mark.parametrize("name", ["counts.json", "counts.sqlite"])
+def test_resume_replays_checkpoint_interrupted_before_commit(tmp_path, name):
+    path = tmp_path / name
+    state_path = tmp_path / "state.json"
+    save_counts(str(path), {"a": 1})
+
+    acc = CountsAccumulator(str(path))
+    acc.add(["a", "b"])
+    journal = CrawlJournal.create(str(state_path), "Start", 1, acc.digest)
+
+    def journal_then_crash(before, after, pending):
+        journal.append([("Start", 0), ("X", 1)], Checkpoint(1, 1, 2, before, after, pending))
+        raise KeyboardInterrupt
+
+    with pytest.raises(KeyboardInterrupt):
+        acc.flush(journal_then_crash)
+    journal.close()
+    assert load_counts(str(path)) == {"a": 1}
+
+    journal, state = CrawlJournal.resume(str(state_path))
+    journal.close()
+    assert state.frontier().items() == [("X", 1)]
+    state.reconcile(CountsAccumulator(str(path)))
+    assert load_counts(str(path)) == {"a": 2, "b": 1}
+    state.reconcile(CountsAccumulator(str(path)))  # already applied -> no-op
+    assert load_counts(str(path)) == {"a": 2, "b": 1}
+
+
+def test_crawl_journal_appends_only_new_titles_and_drops_torn_record(tmp_path):
+    import json
+
+    path = tmp_path / "counts.json"
+    state_path = tmp_path / "state.jsonl"
+    kwargs = dict(max_depth=2, wait_s=0.0, max_pages=50, counts_path=str(path), state_path=str(state_path))
+
+    crawler = WikiCrawler(FlakyFetcher(fail_on="D"), ArticleParser())
+    with pytest.raises(ConnectionError):
+        crawler.auto_count_words("Start", checkpoint_pages=1, **kwargs)
+
+    header, *records = [json.loads(line) for line in state_path.read_text(encoding="utf-8").splitlines()]
+    assert header["start_title"] == "Start" and len(records) >= 2
+    pushed = [title for record in records for title, _ in record["pushed"]]
+    assert len(pushed) == len(set(pushed))  # each title is written once, not once per checkpoint
+
+    with open(state_path, "a", encoding="utf-8") as f:
+        f.write('{"pushed": [["Torn"')
+    journal, state = CrawlJournal.resume(str(state_path))
+    journal.close()
+    assert state.checkpoint.consumed == records[-1]["consumed"]
+    assert not state_path.read_text(encoding="utf-8").endswith('"Torn"')
+
+    expected = _crawl(tmp_path, workers=1, max_pages=50)
+    stats = WikiCrawler(FakeFetcher(), ArticleParser()).auto_count_words("Start", resume=True, **kwargs)
+    assert (_core(stats), load_counts(str(path))) == expected
+
+
+def test_crawl_metrics_events_and_prometheus(tmp_path):
+    import json
+
+    from src.wikiscraper.metrics import CrawlMetrics
+
+    events, prom = tmp_path / "metrics.jsonl", tmp_path / "metrics.prom"
+    metrics = CrawlMetrics(events_path=str(events), prometheus_path=str(prom))
+    crawler = WikiCrawler(FakeFetcher(), ArticleParser(), metrics=metrics)
+    stats = crawler.auto_count_words(
+        "Start", max_depth=2, wait_s=0.0, max_pages=50, counts_path=str(tmp_path / "c.json"), checkpoint_pages=3
+    )
+
+    lines = [json.loads(line) for line in events.read_text(encoding="utf-8").splitlines()]
+    pages = [e for e in lines if e["event"] == "page"]
+    assert [e["title"] for e in pages][:4] == ["Start", "A", "B", "C"]
+    assert sum(e["tokens"] for e in pages) == stats.tokens_added
+    assert [e["event"] for e in lines].count("progress") == stats.pages_visited // 3
+    done = lines[-1]
+    assert done["event"] == "done" and done["pages"] == stats.pages_visited and done["frontier"] == 0
+    assert done["flushes"] >= 2 and done["rss_bytes"] > 0
+
+    text = prom.read_text(encoding="utf-8")
+    assert f"wikiscraper_pages_total {stats.pages_visited}" in text
+    assert 'wikiscraper_stage_seconds_total{stage="parse"}' in text
+    assert 'wikiscraper_http_request_seconds_bucket{le="+Inf"} 0' in text
+
+
+def test_latency_histogram_buckets():
+    from src.wikiscraper.metrics import CrawlMetrics
+
+    metrics = CrawlMetrics()
+    for seconds in (0.005, 0.03, 0.03, 20.0):
+        metrics.observe_request(seconds, 100)
+    snap = metrics.close()
+    assert snap["requests"] == 4 and snap["bytes"] == 400
+    assert snap["latency_p50_s"] == 0.05 and snap["latency_p99_s"] is None
+
+
+def test_parse_workers_are_forked_before_fetch_threads(tmp_path, monkeypatch):
+    import threading
+    from multiprocessing.process import BaseProcess
+
+    forked_from = []
+    start = BaseProcess.start
+
+    def recording_start(self):
+        forked_from.append((threading.current_thread() is threading.main_thread(), threading.active_count()))
+        return start(self)
+
+    monkeypatch.setattr(BaseProcess, "start", recording_start)
+    before = threading.active_count()
+    _crawl(tmp_path, workers=3, max_pages=5, parse_workers=2)
+    assert len(forked_from) == 2
+    assert all(main and threads == before for main, threads in forked_from)
+
+
+def test_state_file_is_opt_in_and_required_for_resume(tmp_path, monkeypatch):
+    from src.wikiscraper.cli import parse_args
+
+    monkeypatch.chdir(tmp_path)
+    assert parse_args(["Start", "--auto-count-words", "1"]).state_file is None
+    with pytest.raises(SystemExit):
+        parse_args(["Start", "--auto-count-words", "1", "--resume"])
+
+    _crawl(tmp_path, workers=1, max_pages=5)
+    assert list(tmp_path.iterdir()) == [tmp_path / "counts-1-5-0.json"]
@@ -0,0 +1,71 @@
+import io
+
+import pytest
+import requests
+
+from src.wikiscraper.fetcher import PageFetcher, parse_retry_after
+
+
+def _response(status: int, body: str = "", headers: dict | None = None) -> requests.Response:
+    resp = requests.Response()
+    resp.status_code = status
+    resp._content = body.encode("utf-8")
+    resp.raw = io.BytesIO()
+    resp.encoding = "utf-8"
+    resp.headers.update(headers or {})
+    resp.url = "https://example.org/wiki/Pikachu"
+    return resp
+
+
+class FakeSession:
+    def __init__(self, responses):
+        self.responses = list(responses)
+        self.calls = 0
+        self.adapters = {}
+
+    def get(self, url, timeout=None, headers=None):
+        self.calls += 1
+        item = self.responses.pop(0)
+        if isinstance(item, Exception):
+            raise item
+        return item
+
+
+def _fetcher(responses, max_retries=3):
+    sleeps: list[float] = []
+    fetcher = PageFetcher("https://example.org/wiki/", max_retries=max_retries, sleep=sleeps.append)
+    fetcher.session = FakeSession(responses)
+    return fetcher, sleeps
+
+
+def test_fetch_retries_transient_errors_with_backoff():
+    fetcher, sleeps = _fetcher(
+        [
+            requests.ConnectionError("reset"),
+            _response(503, headers={"Retry-After": "7"}),
+            _response(200, "<p>ok</p>"),
+        ]
+    )
+    result = fetcher.fetch_article_html("Pikachu")
+    assert result.html == "<p>ok</p>"
+    assert sleeps == [0.5, 7.0]
+    assert fetcher.connection_stats().retries == 2
+
+
+def test_fetch_gives_up_after_max_retries():
+    fetcher, sleeps = _fetcher([_response(500)] * 3, max_retries=2)
+    with pytest.raises(requests.HTTPError):
+        fetcher.fetch_article_html("Pikachu")
+    assert sleeps == [0.5, 1.0]
+
+
+def test_fetch_404_is_not_retried():
+    fetcher, sleeps = _fetcher([_response(404)])
+    with pytest.raises(FileNotFoundError):
+        fetcher.fetch_article_html("Nope")
+    assert sleeps == []
+
+
+def test_parse_retry_after_http_date():
+    assert parse_retry_after("Wed, 21 Oct 2015 07:28:10 GMT", now=1445412480.0) == 10.0
+    assert parse_retry_after("garbage") is None
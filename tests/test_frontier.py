@@ -0,0 +1,41 @@
+from src.wikiscraper.frontier import BloomFilter, Frontier
+
+
+def test_frontier_dedups_at_enqueue_and_keeps_bfs_order():
+    f = Frontier()
+    assert f.push("A", 0)
+    assert f.push("B", 1)
+    assert not f.push("A", 1)
+    assert f.push("C", 1)
+    assert not f.push("B", 2)
+    assert f.push("D", 2)
+
+    assert [f.pop() for _ in range(len(f))] == [("A", 0), ("B", 1), ("C", 1), ("D", 2)]
+    assert f.peak_size == 4
+    assert not f.push("C", 3)  # already crawled titles are never queued again
+
+
+def test_frontier_restores_from_push_log():
+    f = Frontier()
+    f.log = []
+    for t, d in [("A", 0), ("B", 1), ("A", 1), ("C", 1)]:
+        f.push(t, d)
+    assert f.log == [("A", 0), ("B", 1), ("C", 1)]
+
+    g = Frontier.restore(f.log, consumed=1)
+    assert g.items() == [("B", 1), ("C", 1)]
+    assert not g.push("A", 2)
+
+
+def test_bloom_filter_has_no_false_negatives_and_bounded_error():
+    bloom = BloomFilter(capacity=2000, error_rate=0.01)
+    for i in range(2000):
+        bloom.add(f"title-{i}")
+    assert all(f"title-{i}" in bloom for i in range(2000))
+    false_positives = sum(f"other-{i}" in bloom for i in range(10000))
+    assert false_positives < 300
+
+    f = Frontier(bloom_capacity=100)
+    assert f.push("A", 0) and not f.push("A", 1)
+    g = Frontier.restore([("A", 0)], consumed=1, bloom_capacity=100)
+    assert g.seen.bits == f.seen.bits and not g
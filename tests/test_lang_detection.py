@@ -0,0 +1,64 @@
+import math
+
+from src.wikiscraper.lang_detection import build_weights, lang_confidence_score, lang_confidence_scores
+
+LANGS = {
+    "en": [("the", 7.7), ("of", 7.4), ("and", 7.4), ("to", 7.3)],
+    "de": [("der", 7.3), ("die", 7.3), ("und", 7.2), ("the", 5.0)],
+}
+
+
+def _reference(word_counts, language_words_with_frequency, k):
+    # per-word loop from notebooks/lang_detection.ipynb
+    total = sum(word_counts.values())
+    if total == 0:
+        return 0.0
+    topk = language_words_with_frequency[:k]
+    rank = {w: i for i, (w, f) in enumerate(topk)}
+    freq = {w: f for (w, f) in topk}
+    max_freq = max(freq.values())
+    return sum(c * (0.5 * (k - rank[w]) / k + 0.5 * freq[w] / max_freq) for w, c in word_counts.items() if w in rank) / total
+
+
+def test_batched_scores_match_per_document_loop():
+    docs = [
+        {"the": 5, "of": 2, "pikachu": 3},
+        {"der": 4, "und": 1, "the": 1},
+        {"pikachu": 2},
+        {},
+    ]
+    ks = [1, 3, 10]
+    scores = lang_confidence_scores(docs, build_weights(LANGS, ks), chunk_docs=3)
+
+    assert scores.shape == (4, 2, 3)
+    for d, doc in enumerate(docs):
+        for li, lang in enumerate(LANGS):
+            for ki, k in enumerate(ks):
+                assert math.isclose(scores[d, li, ki], _reference(doc, LANGS[lang], k))
+    assert scores[0, 0, 2] > scores[0, 1, 2] and scores[1, 1, 2] > scores[1, 0, 2]
+    assert math.isclose(lang_confidence_score(docs[0], LANGS["en"], 3), scores[0, 0, 1])
+
+
+def test_detect_language_reports_scoring_errors(tmp_path, monkeypatch, capsys):
+    from src.wikiscraper import app as app_module
+    from src.wikiscraper import lang_detection
+    from src.wikiscraper.word_counting import save_counts
+
+    save_counts(str(tmp_path / "doc.json"), {"the": 3})
+    monkeypatch.setattr(app_module, "load_language_reference", lambda lang, n, cache_dir=None: dict(LANGS["en"]))
+
+    def broken(docs, weights):
+        raise ValueError("vocabulary too large")
+
+    monkeypatch.setattr(lang_detection, "lang_confidence_scores", broken)
+    code = app_module.WikiScraperApp()._run_detect_language([str(tmp_path / "doc.json")], ["en"], [3])
+    assert code == 4
+    assert "Failed to score languages: vocabulary too large" in capsys.readouterr().out
+
+
+def test_detect_language_fails_without_counts_files(tmp_path, capsys):
+    from src.wikiscraper.app import WikiScraperApp
+
+    (tmp_path / "notes.txt").write_text("not counts")
+    assert WikiScraperApp()._run_detect_language([str(tmp_path)], ["en"], [3]) == 2
+    assert "No word counts files" in capsys.readouterr().out
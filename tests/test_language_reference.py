@@ -0,0 +1,37 @@
+import math
+
+import pytest
+
+from src.wikiscraper import language_reference
+from src.wikiscraper.language_reference import LanguageReference, load_language_reference, reference_cache_path
+from src.wikiscraper.relative_frequency import compute_relative_freq
+
+
+def test_reference_is_cached_per_wordfreq_version(tmp_path, monkeypatch):
+    from wordfreq import top_n_list, zipf_frequency
+
+    ref = load_language_reference("en", 50, cache_dir=str(tmp_path))
+    assert dict(ref) == {w: zipf_frequency(w, "en") for w in top_n_list("en", 50)}
+    assert reference_cache_path(str(tmp_path), "en", 50).exists()
+
+    def no_build(lang, n):
+        raise AssertionError("should load from cache")
+
+    monkeypatch.setattr(LanguageReference, "build", no_build)
+    assert dict(load_language_reference("en", 50, cache_dir=str(tmp_path))) == dict(ref)
+
+    monkeypatch.setattr(language_reference, "wordfreq_version", lambda: "0.0-other")
+    with pytest.raises(AssertionError):
+        load_language_reference("en", 50, cache_dir=str(tmp_path))
+
+
+def test_score_many_covers_long_tail_words():
+    ref = LanguageReference.build("en", 50)
+    scores = ref.score_many(["the", "pokemon", "qqxzzqq", "the"])
+    assert scores[0] == ref["the"] == scores[3]
+    assert "pokemon" not in ref and scores[1] > 0
+    assert math.isnan(scores[2])
+
+    df = compute_relative_freq({"the": 3, "pokemon": 5, "qqxzzqq": 1}, ref, top_k=3).df
+    assert df["word"].tolist() == ["pokemon", "the", "qqxzzqq"]
+    assert df["freq_language"].tolist()[:2] == scores[1::-1]
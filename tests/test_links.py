@@ -20,3 +20,21 @@ def test_extract_article_links_filters_namespaces_and_nonwiki():
     assert "Pikachu" in links
     assert "Type" in links
     assert all(":" not in x for x in links)
+
+
+def test_parsed_page_is_shared_and_not_mutated():
+    html = """
+    <div id="mw-content-text">
+      <p>Intro paragraph about <a href="/wiki/Pikachu">Pikachu</a>, long enough to be a summary.</p>
+      <table><tr><td>cell <a href="/wiki/Raichu">Raichu</a></td></tr></table>
+      <p>Outro</p>
+    </div>
+    """
+    p = ArticleParser()
+    page = p.parse(html)
+
+    assert p.extract_article_text(page) == "Intro paragraph about Pikachu , long enough to be a summary. Outro"
+    # tables are still there for links and table extraction after text extraction
+    assert p.extract_article_links(page) == ["Pikachu", "Raichu"]
+    assert len(page.tables) == 1
+    assert p.extract_article_text(page) == p.extract_article_text(html)
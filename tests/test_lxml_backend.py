@@ -0,0 +1,51 @@
+from pathlib import Path
+
+import pytest
+
+from src.wikiscraper.parser import ArticleParser
+from src.wikiscraper.table_extractor import TableExtractor
+
+EDGE_HTML = """
+<html><head><style>p{}</style></head><body>
+<div id="mw-navigation"><a href="/wiki/Main_Page">Main</a></div>
+<div id="mw-content-text"><div class="mw-parser-output">
+<p>Lead <ruby>X<rp>(</rp><rt>ex</rt><rp>)</rp></ruby> text&nbsp;with &amp; entities, long enough for a summary.
+<p>Implicit <b>bold <i>both</b> italic</i> tail<!-- comment --> after comment
+<template><p>hidden</p></template>after template
+<table><tr><td>a<table><tr><th>inner</th></tr></table></td><td><script>bad()</script>ok</td></tr>
+<tr></tr><tr><td>  </td></tr></table>
+after table <a href="/wiki/Pok%C3%A9mon_Ranger">r</a> <a href="/wiki/Type#Chart">t</a>
+<a href="/wiki/File:X.png">f</a> <a href="/wiki/List_of_x">l</a> <a href="/wiki/">e</a> <a name="x">n</a>
+</div></div></body></html>
+"""
+
+
+def _extract(html: str, backend: str) -> dict:
+    parser = ArticleParser(backend)
+    page = parser.parse(html)
+    return {
+        "summary": parser.extract_first_paragraph(page),
+        "text": parser.extract_article_text(page),
+        "links": parser.extract_article_links(page),
+        "tables": [TableExtractor(backend).extract_nth_table(page, i + 1).rows for i in range(len(page.tables))],
+    }
+
+
+def test_lxml_backend_matches_bs4_on_edge_cases():
+    bs4_result = _extract(EDGE_HTML, "bs4")
+    assert _extract(EDGE_HTML, "lxml") == bs4_result
+    assert bs4_result["links"] == ["Pokémon_Ranger", "Type"]
+    assert "bad()" not in bs4_result["text"] and "hidden" not in bs4_result["text"]
+
+
+@pytest.mark.parametrize("path", ["data/pikachu.html", "data/type.html"])
+def test_lxml_backend_matches_bs4_on_fixtures(path):
+    if not Path(path).exists():
+        pytest.skip(f"missing fixture {path}")
+    html = Path(path).read_text(encoding="utf-8")
+    assert _extract(html, "lxml") == _extract(html, "bs4")
+
+
+def test_unknown_backend_is_rejected():
+    with pytest.raises(ValueError):
+        ArticleParser("html5lib")
@@ -0,0 +1,119 @@
+import io
+import os
+
+import pytest
+import requests
+
+from src.wikiscraper.fetcher import PageFetcher
+from src.wikiscraper.page_cache import PageCache
+
+
+def _response(status: int, body: str = "", headers: dict | None = None) -> requests.Response:
+    resp = requests.Response()
+    resp.status_code = status
+    resp._content = body.encode("utf-8")
+    resp.raw = io.BytesIO()
+    resp.encoding = "utf-8"
+    resp.headers.update(headers or {})
+    resp.url = "https://example.org/wiki/Pikachu"
+    return resp
+
+
+class RecordingSession:
+    def __init__(self, responses):
+        self.responses = list(responses)
+        self.sent_headers: list[dict | None] = []
+        self.adapters = {}
+
+    def get(self, url, timeout=None, headers=None):
+        self.sent_headers.append(headers)
+        return self.responses.pop(0)
+
+
+def test_cache_roundtrip_and_content_dedup(tmp_path):
+    cache = PageCache(str(tmp_path))
+    a = cache.put("u1", "f1", "<p>same</p>", etag='"e1"')
+    b = cache.put("u2", "f2", "<p>same</p>")
+    assert a.body_sha256 == b.body_sha256
+    assert len(list((tmp_path / "objects").glob("*/*"))) == 1
+
+    hit = cache.get("u1")
+    assert hit is not None and hit.html == "<p>same</p>" and hit.entry.etag == '"e1"'
+    assert cache.get("missing") is None
+
+
+def test_cache_evicts_least_recently_used(tmp_path):
+    cache = PageCache(str(tmp_path), max_bytes=25)
+    cache.put("old", "old", "x" * 10)
+    cache.put("new", "new", "y" * 10)
+    entries = tmp_path / "entries"
+    for i, path in enumerate(sorted(entries.glob("*.json"), key=os.path.getmtime)):
+        os.utime(path, (1000 + i, 1000 + i))
+    cache.get("old")  # touch -> most recent
+
+    cache.put("third", "third", "z" * 10)
+    assert cache.get("new") is None
+    assert cache.get("old") is not None
+    assert cache.get("third") is not None
+
+
+def test_fetcher_revalidates_and_serves_304_from_cache(tmp_path):
+    fetcher = PageFetcher("https://example.org/wiki/", cache=PageCache(str(tmp_path)))
+    session = RecordingSession(
+        [
+            _response(200, "<p>v1</p>", headers={"ETag": '"abc"', "Last-Modified": "Mon, 01 Jan 2024 00:00:00 GMT"}),
+            _response(304),
+        ]
+    )
+    fetcher.session = session
+
+    assert fetcher.fetch_article_html("Pikachu").html == "<p>v1</p>"
+    assert fetcher.fetch_article_html("Pikachu").html == "<p>v1</p>"
+    assert session.sent_headers[0] is None
+    assert session.sent_headers[1] == {
+        "If-None-Match": '"abc"',
+        "If-Modified-Since": "Mon, 01 Jan 2024 00:00:00 GMT",
+    }
+
+
+def test_offline_policy_never_touches_network(tmp_path):
+    cache = PageCache(str(tmp_path))
+    fetcher = PageFetcher("https://example.org/wiki/", cache=cache, cache_policy="offline")
+    fetcher.session = RecordingSession([])
+    cache.put(fetcher.build_article_url("Pikachu"), "https://example.org/wiki/Pikachu", "<p>cached</p>")
+
+    assert fetcher.fetch_article_html("Pikachu").html == "<p>cached</p>"
+    with pytest.raises(FileNotFoundError):
+        fetcher.fetch_article_html("Raichu")
+    assert fetcher.session.sent_headers == []
+
+
+def test_cache_drops_stale_entries_on_first_write(tmp_path):
+    PageCache(str(tmp_path)).put("stale", "stale", "<p>old</p>")
+    for path in (tmp_path / "entries").glob("*.json"):
+        os.utime(path, (1000, 1000))
+
+    cache = PageCache(str(tmp_path), max_age_s=3600)  # far below max_bytes
+    cache.put("fresh", "fresh", "<p>new</p>")
+    assert cache.get("stale") is None
+    assert len(list((tmp_path / "objects").glob("*/*"))) == 1
+
+
+def test_cache_is_opt_in(tmp_path, monkeypatch):
+    from src.wikiscraper.app import WikiScraperApp
+    from src.wikiscraper.cli import parse_args
+
+    page = tmp_path / "page.html"
+    page.write_text('<div id="mw-content-text"><p>Pikachu is an Electric-type Pokémon introduced early.</p></div>')
+    monkeypatch.chdir(tmp_path)
+
+    app = WikiScraperApp()
+    assert app.run(parse_args(["Pikachu", "--summary", "--html-file", str(page)])) == 0
+    assert app.fetcher.cache is None and app.cache_dir is None
+    assert list(tmp_path.iterdir()) == [page]
+
+    with pytest.raises(SystemExit):
+        parse_args(["Pikachu", "--summary", "--offline"])
+    args = parse_args(["Pikachu", "--summary", "--cache-dir", "pages", "--offline"])
+    app.configure_cache(args.cache_dir, offline=args.offline)
+    assert app.fetcher.cache_policy == "offline"
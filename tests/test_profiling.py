@@ -0,0 +1,103 @@
+import io
+import pstats
+
+from src.wikiscraper.cli import action_name, parse_args
+from src.wikiscraper.profiling import RunProfiler, phase
+
+
+def _work(n: int) -> list[str]:
+    return [str(i) * 10 for i in range(n)]
+
+
+def test_phases_profiled_separately(tmp_path):
+    profiler = RunProfiler("count-words", str(tmp_path))
+    profiler.start()
+    try:
+        with phase("parse"):
+            kept = _work(20_000)
+        for _ in range(3):
+            with phase("write"):
+                _work(10)
+    finally:
+        paths = profiler.stop()
+
+    assert profiler.stats["parse"].calls == 1 and profiler.stats["write"].calls == 3
+    assert profiler.stats["parse"].peak_bytes > 20_000 * 10
+    assert profiler.top_allocations("parse")[0][0].endswith(f"test_profiling.py:{_work.__code__.co_firstlineno + 1}")
+    assert len(kept) == 20_000
+
+    assert sorted(p.name for p in tmp_path.iterdir()) == [
+        "count-words-memory.txt",
+        "count-words-parse.prof",
+        "count-words-write.prof",
+        "count-words.prof",
+    ]
+    funcs = {func for _, _, func in pstats.Stats(str(paths["parse"])).stats}  # type: ignore[attr-defined]
+    assert "_work" in funcs
+    assert "[parse] peak" in paths["memory"].read_text(encoding="utf-8")
+
+    out = io.StringIO()
+    profiler.print_summary(paths, out)
+    assert "Profile of count-words" in out.getvalue() and "test_profiling.py" in out.getvalue()
+
+
+def test_phase_is_noop_without_profiler():
+    with phase("fetch"):
+        _work(10)
+
+
+def test_action_name_of_profiled_run():
+    assert action_name(parse_args(["Pikachu", "--all-tables", "--profile"])) == "all-tables"
+
+
+def test_worker_thread_phases_are_profiled(tmp_path):
+    from concurrent.futures import ThreadPoolExecutor
+
+    def fetch(n: int) -> int:
+        with phase("fetch"):
+            with phase("parse"):
+                return len(_work(n))
+
+    profiler = RunProfiler("batch", str(tmp_path))
+    profiler.start()
+    try:
+        with ThreadPoolExecutor(max_workers=2) as pool:
+            assert sum(pool.map(fetch, [100, 200, 300])) == 600
+        with phase("write"):
+            _work(10)
+    finally:
+        paths = profiler.stop()
+
+    assert profiler.thread_stats["fetch"].calls == 3 and profiler.thread_stats["parse"].calls == 3
+    assert list(profiler.stats) == ["write"]
+    assert profiler.thread_stats["fetch"].wall_s >= profiler.thread_stats["parse"].wall_s
+    funcs = {func for _, _, func in pstats.Stats(str(paths["parse"])).stats}  # type: ignore[attr-defined]
+    assert "_work" in funcs
+
+    out = io.StringIO()
+    profiler.print_summary(paths, out)
+    assert "worker threads" in out.getvalue()
+
+
+def test_crawl_phases_are_tagged(tmp_path):
+    from src.wikiscraper.crawler import WikiCrawler
+    from src.wikiscraper.fetcher import FetchResult
+    from src.wikiscraper.parser import ArticleParser
+
+    class Fetcher:
+        def fetch_article_html(self, title: str) -> FetchResult:
+            links = "".join(f'<a href="/wiki/{title}{i}">x</a>' for i in range(3))
+            return FetchResult(final_url=title, html=f'<div id="mw-content-text"><p>words {links}</p></div>')
+
+    profiler = RunProfiler("auto-count-words", str(tmp_path))
+    profiler.start()
+    try:
+        WikiCrawler(Fetcher(), ArticleParser()).auto_count_words(
+            "Start", max_depth=1, wait_s=0.0, max_pages=4, counts_path=str(tmp_path / "c.json"), workers=2
+        )
+    finally:
+        profiler.stop()
+
+    assert profiler.thread_stats["fetch"].calls == 4
+    assert {"fetch", "parse", "process", "write"} <= set(profiler.stats)
+    assert profiler.stats["parse"].calls == 4
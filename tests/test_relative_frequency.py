@@ -0,0 +1,28 @@
+import math
+
+import numpy as np
+
+from src.wikiscraper.relative_frequency import compute_relative_freq, sort_relative_df, top_k_indices
+
+
+def test_top_k_breaks_ties_by_word():
+    words = np.array(["d", "b", "a", "c", "e"], dtype=object)
+    counts = np.array([5, 2, 2, 9, 2])
+    assert words[top_k_indices(counts, words, 3)].tolist() == ["c", "d", "a"]
+    assert words[top_k_indices(counts, words, 10)].tolist() == ["c", "d", "a", "b", "e"]
+    assert top_k_indices(counts, words, 0).tolist() == []
+
+
+def test_relative_freq_modes():
+    counts = {"pikachu": 9, "the": 4, "of": 4, "raichu": 1}
+    lang_ref = {"the": 7.7, "of": 7.4, "and": 7.4, "to": 7.4}
+
+    article = compute_relative_freq(counts, lang_ref, top_k=3).df
+    assert article["word"].tolist() == ["pikachu", "of", "the"]
+    assert article["freq_article"].tolist() == [9, 4, 4]
+    assert math.isnan(article["freq_language"][0]) and article["freq_language"][1] == 7.4
+
+    language = sort_relative_df(compute_relative_freq(counts, lang_ref, top_k=3, mode="language").df, "language")
+    assert language["word"].tolist() == ["the", "and", "of"]
+    assert language["freq_article"].tolist() == [4, 0, 4]
+    assert language["freq_article"].dtype == "int64"
@@ -0,0 +1,135 @@
+import json
+import threading
+import urllib.request
+from urllib.error import HTTPError
+
+import pytest
+
+from src.wikiscraper.app import WikiScraperApp
+from src.wikiscraper.fetcher import FetchResult
+from src.wikiscraper.service import ParsedPageLRU, ScraperService, ServiceHTTPServer
+from src.wikiscraper.word_counting import load_counts
+
+PAGE = """
+<div id="mw-content-text"><p>Pikachu is an Electric-type Pokémon introduced in Generation I.</p>
+<table><tr><th>Type</th><th>Normal</th><th>Fire</th></tr>
+<tr><td>Fire</td><td>1×</td><td>½×</td></tr><tr><td>Water</td><td>1×</td><td>2×</td></tr></table></div>
+"""
+
+
+@pytest.fixture
+def service(tmp_path, request):
+    app = WikiScraperApp()
+    app.counts_path = str(tmp_path / getattr(request, "param", "counts.json"))
+    fetched = []
+
+    def fetch(phrase):
+        if phrase == "Missing":
+            raise FileNotFoundError("Article not found: Missing")
+        fetched.append(phrase)
+        return FetchResult(final_url=app.fetcher.build_article_url(phrase), html=PAGE)
+
+    app.fetcher.fetch_article_html = fetch
+    service = ScraperService(app, max_pages=2)
+    server = ServiceHTTPServer(("127.0.0.1", 0), service)
+    thread = threading.Thread(target=server.serve_forever, daemon=True)
+    thread.start()
+    base = f"http://127.0.0.1:{server.server_address[1]}"
+
+    def call(path, data=None):
+        req = urllib.request.Request(base + path, data=json.dumps(data).encode() if data is not None else None)
+        try:
+            with urllib.request.urlopen(req) as resp:
+                return resp.status, json.loads(resp.read())
+        except HTTPError as e:
+            return e.code, json.loads(e.read())
+
+    yield call, fetched, service
+    server.shutdown()
+    server.server_close()
+    service.close()
+
+
+def test_service_answers_from_warm_parsed_pages(service):
+    call, fetched, svc = service
+
+    status, body = call("/summary?phrase=Pikachu")
+    assert status == 200 and body["summary"].startswith("Pikachu is an Electric-type")
+    status, body = call("/table?phrase=Pikachu&n=1&first_row_is_header=1")
+    assert body["columns"] == ["row", "Normal", "Fire"]
+    assert body["rows"][1] == ["Water", "1×", "2×"]
+    assert body["counts"][0] == ["1×", 2]
+    for _ in range(3):
+        assert call("/count-words", {"phrase": "Pikachu"})[1]["tokens"] > 0
+    assert fetched == ["Pikachu"]
+
+    assert call("/summary?phrase=Missing")[0] == 404
+    assert call("/summary")[0] == 400
+    assert call("/nope")[0] == 404
+    assert call("/stats")[1]["page_misses"] == 2
+
+    svc.close()
+    assert load_counts(svc.app.counts_path)["pikachu"] == 3
+
+
+@pytest.mark.parametrize("service", ["counts.sqlite"], indirect=True)
+def test_service_flushes_sqlite_counts_from_handler_threads(service):
+    call, _, svc = service
+    svc.counts.flush_every_pages = 1
+
+    for _ in range(3):
+        assert call("/count-words", {"phrase": "Pikachu"})[0] == 200
+    assert svc.counts.pending_pages == 0
+    assert load_counts(svc.app.counts_path)["pikachu"] == 3
+    status, body = call("/relative-frequency?n=1")
+    assert status == 200 and body["words"][0]["freq_article"] == 3
+
+
+def test_lru_evicts_oldest_and_expires_entries():
+    now = [0.0]
+    lru = ParsedPageLRU(max_pages=2, ttl_s=10, clock=lambda: now[0])
+    loads = []
+
+    def loader(key):
+        return lambda: loads.append(key) or (key, key)
+
+    for key in ["a", "b", "a", "c", "a", "b"]:
+        lru.get(key, loader(key))
+    assert loads == ["a", "b", "c", "b"]
+
+    now[0] = 11
+    lru.get("a", loader("a"))
+    assert loads[-1] == "a" and len(lru) == 2
+
+
+def test_lru_never_loads_one_key_concurrently():
+    lru = ParsedPageLRU(max_pages=1, ttl_s=-1)  # entries are never fresh: every get loads
+    started = [threading.Event() for _ in range(3)]
+    release = [threading.Event() for _ in range(3)]
+    active = []
+    overlaps = []
+
+    def load():
+        i = len(overlaps)
+        active.append(i)
+        overlaps.append(len(active))
+        started[i].set()
+        release[i].wait(5)
+        active.remove(i)
+        return "a", "a"
+
+    threads = [threading.Thread(target=lru.get, args=("a", load)) for _ in range(3)]
+    threads[0].start()
+    started[0].wait(5)
+    threads[1].start()  # waits for the first load
+    threading.Event().wait(0.05)
+    release[0].set()
+    started[1].wait(5)
+    threads[2].start()  # arrives after the first load stored its entry
+    threading.Event().wait(0.05)
+    release[1].set()
+    release[2].set()
+    for t in threads:
+        t.join()
+    assert overlaps == [1, 1, 1]
+    assert lru._loading == {}
@@ -0,0 +1,27 @@
+import os
+import subprocess
+import sys
+from pathlib import Path
+
+import pytest
+
+ROOT = Path(__file__).resolve().parent.parent
+
+CHECK = """
+import sys
+from wiki_scraper import main
+code = main(sys.argv[1:])
+heavy = [m for m in ("pandas", "numpy", "wordfreq", "requests") if m in sys.modules]
+print("HEAVY:" + ",".join(heavy))
+raise SystemExit(code)
+"""
+
+
+@pytest.mark.parametrize("mode", ["--summary", "--count-words", "--all-tables"])
+def test_offline_modes_do_not_import_heavy_modules(tmp_path, mode):
+    page = tmp_path / "page.html"
+    page.write_text('<div id="mw-content-text"><p>Pikachu is an Electric-type Pokémon.</p></div>', encoding="utf-8")
+    args = ["Pikachu", mode, "--html-file", str(page), "--no-cache", "--counts-file", str(tmp_path / "c.json")]
+    env = {**os.environ, "PYTHONPATH": str(ROOT)}
+    proc = subprocess.run([sys.executable, "-c", CHECK, *args], cwd=tmp_path, capture_output=True, text=True, env=env)
+    assert "HEAVY:\n" in proc.stdout, proc.stdout + proc.stderr
@@ -0,0 +1,58 @@
+import csv
+
+import pytest
+
+from src.wikiscraper.app import WikiScraperApp
+from src.wikiscraper.cli import build_parser
+from src.wikiscraper.table_extractor import TableExtractor
+
+SPAN_HTML = """
+<div id="mw-content-text">
+<table>
+<tr><th rowspan="2">Move</th><th colspan="2">Level</th></tr>
+<tr><td>RB</td><td rowspan="3">GS</td></tr>
+<tr><td>Tackle</td><td>1<table><tr><td>inner</td></tr></table></td></tr>
+<tr><td colspan="2">Growl</td></tr>
+</table>
+<table><tr></tr></table>
+</div>
+"""
+
+
+@pytest.mark.parametrize("backend", ["bs4", "lxml"])
+def test_iter_tables_expands_spans_once_per_table(backend):
+    tables = list(TableExtractor(backend).iter_tables(SPAN_HTML))
+    assert [n for n, _ in tables] == [1, 2]
+    assert tables[0][1].rows == [
+        ["Move", "Level", "Level"],
+        ["Move", "RB", "GS"],
+        ["Tackle", "1 inner", "GS"],
+        ["Growl", "Growl", "GS"],
+    ]
+    assert tables[1][1].rows == [["inner"]]
+
+
+@pytest.mark.parametrize("backend", ["bs4", "lxml"])
+def test_iter_tables_reads_own_sections_only(backend):
+    html = """<div id="mw-content-text"><table>
+    <thead><tr><th>Name</th><th>Stats</th></tr></thead>
+    <tbody><tr><td>Pikachu</td><td><table><tbody><tr><td>HP</td><td>35</td></tr></tbody></table></td></tr></tbody>
+    <tfoot><tr><td>Total</td><td>1</td></tr></tfoot>
+    </table></div>"""
+    (_, outer), (_, inner) = TableExtractor(backend).iter_tables(html)
+    assert outer.rows == [["Name", "Stats"], ["Pikachu", "HP 35"], ["Total", "1"]]
+    assert inner.rows == [["HP", "35"]]
+
+
+def test_all_tables_writes_one_csv_per_table(tmp_path, monkeypatch):
+    page = tmp_path / "page.html"
+    page.write_text(SPAN_HTML, encoding="utf-8")
+    monkeypatch.chdir(tmp_path)
+
+    args = build_parser().parse_args(["Learnset", "--all-tables", "--html-file", str(page), "--no-cache"])
+    assert WikiScraperApp().run(args) == 0
+
+    with open(tmp_path / "Learnset-table-1.csv", newline="", encoding="utf-8") as f:
+        assert list(csv.reader(f))[3] == ["Growl", "Growl", "GS"]
+    assert (tmp_path / "Learnset-table-2.csv").exists()
+    assert not (tmp_path / "Learnset-table-3.csv").exists()
@@ -1,5 +1,7 @@
+import pandas as pd
+
 from src.wikiscraper.table_extractor import TableExtractor
-from src.wikiscraper.table_processing import process_table
+from src.wikiscraper.table_processing import dataframe_to_csv_rows, process_table, write_table_csv
 
 
 def test_type_chart_counts_contains_multipliers_only_or_mostly():
@@ -14,3 +16,26 @@ def test_type_chart_counts_contains_multipliers_only_or_mostly():
     assert "2×" in counts
     assert "½×" in counts
     assert "0×" in counts
+
+
+def test_encoded_counts_match_value_counts(tmp_path):
+    rows = [
+        ["", "Normal", "Fire", "Water"],
+        ["Attacking type", "", "", ""],
+        ["Normal", "1×", "1×", "1×"],
+        ["Fire", " 1× ", "½×", "½×"],
+        ["Water", "2×", "½×"],
+        ["Note", "see text", "", ""],
+    ]
+    processed = process_table(rows, first_row_is_header=True)
+
+    flat = pd.Series(processed.df.to_numpy().ravel()).astype(str).str.strip()
+    flat = flat[(flat != "") & flat.str.fullmatch(r".*×")]
+    expected = flat.value_counts().reset_index()
+    expected.columns = ["value", "count"]
+    pd.testing.assert_frame_equal(processed.counts_df, expected)
+    assert processed.counts_df["value"].tolist() == ["1×", "½×", "2×"]
+
+    write_table_csv(processed.df, str(tmp_path / "out.csv"))
+    dataframe_to_csv_rows(processed.df).to_csv(tmp_path / "ref.csv", index=False)
+    assert (tmp_path / "out.csv").read_bytes() == (tmp_path / "ref.csv").read_bytes()
@@ -1,4 +1,16 @@
-from src.wikiscraper.word_counting import tokenize, update_counts_file, load_counts
+from collections import Counter
+
+from src.wikiscraper.vocabulary import Vocabulary
+from src.wikiscraper.word_counting import (
+    CountsAccumulator,
+    count_tokens,
+    count_tokens_batch,
+    iter_tokens,
+    load_counts,
+    save_counts,
+    tokenize,
+    update_counts_file,
+)
 
 
 def test_tokenize_basic():
@@ -10,6 +22,21 @@ def test_tokenize_basic():
     assert "type" in tokens
     assert "s" not in tokens
 
+def test_streaming_tokenizer_matches_tokenize():
+    texts = [
+        "Pikachu's tail, a b'c x'y'z 25 an_d",
+        "ＰＩＫＡＣＨＵ ﬁre Pokémon",  # NFKC
+        "İ İstanbul ΟΔΟΣ ΟΔΟΣ.Α",  # lowercase grows / depends on context
+        "",
+    ]
+    assert tokenize(texts[0]) == ["pikachu's", "tail", "b'c", "x'y", "an"]
+    assert tokenize(texts[2])[:2] == ["i̇", "i̇stanbul"]
+    for text in texts:
+        assert list(iter_tokens(text)) == tokenize(text)
+        assert count_tokens(text) == Counter(tokenize(text))
+    assert count_tokens_batch(texts) == sum((Counter(tokenize(t)) for t in texts), Counter())
+
+
 def test_update_counts_file_merges(tmp_path):
     path = tmp_path / "counts.json"
     update_counts_file(str(path), ["a", "b", "a"])
@@ -19,3 +46,62 @@ def test_update_counts_file_merges(tmp_path):
     assert counts["a"] == 2
     assert counts["b"] == 2
     assert counts["c"] == 1
+
+
+def test_accumulator_flushes_on_checkpoint_policy(tmp_path):
+    path = tmp_path / "counts.json"
+    update_counts_file(str(path), ["a"])
+    now = [0.0]
+
+    acc = CountsAccumulator(str(path), flush_every_pages=2, flush_every_s=10.0, clock=lambda: now[0])
+    acc.add(["a", "b"])
+    assert not acc.maybe_flush()
+    assert load_counts(str(path)) == {"a": 1}
+
+    acc.add(["b"])
+    assert acc.maybe_flush()  # K pages
+    assert load_counts(str(path)) == {"a": 2, "b": 2}
+
+    acc.add(["c"])
+    now[0] = 11.0
+    assert acc.maybe_flush()  # T seconds
+    acc.add(["c"])
+    acc.close()  # at exit
+    assert load_counts(str(path)) == {"a": 2, "b": 2, "c": 2}
+    assert [p.name for p in tmp_path.iterdir()] == ["counts.json"]
+
+
+def test_vocabulary_matches_counter():
+    pages = [tokenize("Pikachu is an Electric-type Pokémon. Pikachu's tail!"), ["tail", "new", "new"] * 500]
+    vocab = Vocabulary()
+    expected = Counter()
+    for tokens in pages:
+        vocab.add(tokens)
+        expected.update(tokens)
+    vocab.add_counts({"pikachu": 3, "zzz": 2})
+    expected.update({"pikachu": 3, "zzz": 2})
+
+    assert vocab.to_dict() == dict(expected)
+    assert vocab.total() == sum(expected.values())
+    assert len(vocab) == len(expected)
+
+    vocab.clear()
+    assert vocab.to_dict() == {}
+    vocab.add(["zzz"])
+    assert vocab.to_dict() == {"zzz": 1} and len(vocab) == len(expected)
+
+
+def test_counts_file_keeps_its_mode_across_atomic_saves(tmp_path):
+    import os
+    import stat
+
+    path = tmp_path / "counts.json"
+    umask = os.umask(0)
+    os.umask(umask)
+    save_counts(str(path), {"a": 1})
+    assert stat.S_IMODE(path.stat().st_mode) == 0o666 & ~umask  # not mkstemp's 0600
+
+    path.chmod(0o640)
+    save_counts(str(path), {"a": 2})
+    assert stat.S_IMODE(path.stat().st_mode) == 0o640
+    assert load_counts(str(path)) == {"a": 2}
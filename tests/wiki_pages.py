@@ -0,0 +1,12 @@
+"""Synthetic wiki pages shared by the crawler, archive and API fetcher tests."""
+
+
+def article_body(text: str, links: list[str]) -> str:
+    """Parser output of an article: `text` followed by /wiki/ links (titles used as given, e.g. percent-encoded)."""
+    anchors = " ".join(f'<a href="/wiki/{t}">{t}</a>' for t in links)
+    return f"<p>{text} {anchors}</p>"
+
+
+def article_page(text: str, links: list[str]) -> str:
+    """The article as ArticleParser finds it on a rendered page (inside #mw-content-text)."""
+    return f'<div id="mw-content-text">{article_body(text, links)}</div>'
@@ -3,12 +3,11 @@ from __future__ import annotations
 import sys
 
 from src.wikiscraper.app import WikiScraperApp
-from src.wikiscraper.cli import build_parser
+from src.wikiscraper.cli import parse_args
 
 
 def main(argv: list[str] | None = None) -> int:
-    parser = build_parser()
-    args = parser.parse_args(argv)
+    args = parse_args(argv)
 
     app = WikiScraperApp()
     return app.run(args)